@@ -1,3 +1,4 @@
+import math
 import uuid
 from uuid import UUID # Added for ConnectionComponent
 from dataclasses import dataclass, field
@@ -65,6 +66,36 @@ class TransformComponent(Component):
     angle: float = 0.0  # In radians
     scale: Vector2D = field(default_factory=lambda: Vector2D(1.0, 1.0))
 
+    # cos/sin cache for `angle`. Plain class attributes (no annotation), so they are not dataclass
+    # fields and stay out of serialization and __eq__.
+    _trig_angle = None
+    _cos = 1.0
+    _sin = 0.0
+
+    def rotation(self) -> Tuple[float, float]:
+        """Returns (cos(angle), sin(angle)), recomputed only when angle has changed."""
+        angle = self.angle
+        if angle != self._trig_angle:
+            self._cos = math.cos(angle)
+            self._sin = math.sin(angle)
+            self._trig_angle = angle
+        return self._cos, self._sin
+
+    def world_of(self, local_x: float, local_y: float) -> Tuple[float, float]:
+        """Maps a local-space point to world space, as (x, y) floats without allocating a Vector2D."""
+        cos_a, sin_a = self.rotation()
+        position = self.position
+        return (position.x + local_x * cos_a - local_y * sin_a,
+                position.y + local_x * sin_a + local_y * cos_a)
+
+    def local_of(self, world_x: float, world_y: float) -> Tuple[float, float]:
+        """Inverse of world_of: maps a world-space point into this transform's local space, as (x, y) floats."""
+        cos_a, sin_a = self.rotation()
+        offset_x = world_x - self.position.x
+        offset_y = world_y - self.position.y
+        return (offset_x * cos_a + offset_y * sin_a,
+                offset_y * cos_a - offset_x * sin_a)
+
 class ShapeType(Enum):
     RECTANGLE = auto()
     CIRCLE = auto()
@@ -167,6 +198,20 @@ class GeometryComponent(Component):
 
         return snap_points
 
+    def get_bounding_radius(self) -> float:
+        """
+        Radius of a circle centred on the entity's local origin that encloses the shape at any rotation.
+        Useful as a cheap broad-phase reject before exact hit or collision tests.
+        """
+        if self.shape_type == ShapeType.CIRCLE:
+            return self.parameters.get("radius", 0)
+        if self.shape_type == ShapeType.RECTANGLE:
+            return math.hypot(self.parameters.get("width", 0) / 2, self.parameters.get("height", 0) / 2)
+        if self.shape_type == ShapeType.POLYGON:
+            vertices = self.parameters.get("vertices", [])
+            return math.sqrt(max((v.x * v.x + v.y * v.y for v in vertices), default=0.0))
+        return 0.0
+
 @dataclass
 class RenderComponent(Component):
     """
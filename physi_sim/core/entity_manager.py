@@ -1,4 +1,4 @@
-from typing import Type, TypeVar, Optional, Dict, Set, List, Any, Tuple # Added Tuple
+from typing import Type, TypeVar, Optional, Dict, Set, List, Any, Tuple, Mapping # Added Tuple
 import uuid
 
 from .component import Component, ConnectionComponent, ConnectionType # Import the actual Component class, Added ConnectionComponent, ConnectionType
@@ -8,6 +8,63 @@ C = TypeVar('C', bound=Component) # Use the imported Component class
 # Define EntityID type
 EntityID = uuid.UUID
 
+class RevoluteLinkage:
+    """
+    Union-find (DSU) over entities joined by unbroken REVOLUTE_JOINT connections.
+    Each connected set is a rigid linkage that the editor moves as one group.
+    """
+
+    def __init__(self):
+        self.parent: Dict[EntityID, EntityID] = {}
+        self.rank: Dict[EntityID, int] = {}
+        self._members: Optional[Dict[EntityID, List[EntityID]]] = None # root -> members, grouped lazily
+
+    def clear(self) -> None:
+        """Empties the structure in place so its dicts are reused across rebuilds."""
+        self.parent.clear()
+        self.rank.clear()
+        self._members = None
+
+    def __contains__(self, entity_id: EntityID) -> bool:
+        """True if the entity takes part in at least one revolute joint."""
+        return entity_id in self.parent
+
+    def find(self, entity_id: EntityID) -> EntityID:
+        parent = self.parent
+        if entity_id not in parent:
+            return entity_id
+        while parent[entity_id] != entity_id:
+            parent[entity_id] = parent[parent[entity_id]] # Path halving
+            entity_id = parent[entity_id]
+        return entity_id
+
+    def union(self, entity_a: EntityID, entity_b: EntityID) -> None:
+        for entity_id in (entity_a, entity_b):
+            if entity_id not in self.parent:
+                self.parent[entity_id] = entity_id
+                self.rank[entity_id] = 0
+        root_a, root_b = self.find(entity_a), self.find(entity_b)
+        if root_a == root_b:
+            return
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.rank[root_a] == self.rank[root_b]:
+            self.rank[root_a] += 1
+        self._members = None
+
+    def members_of(self, entity_id: EntityID) -> List[EntityID]:
+        """All entities linked to entity_id (including itself)."""
+        if entity_id not in self.parent:
+            return [entity_id]
+        if self._members is None:
+            members: Dict[EntityID, List[EntityID]] = {}
+            for member_id in self.parent:
+                members.setdefault(self.find(member_id), []).append(member_id)
+            self._members = members
+        return list(self._members[self.find(entity_id)])
+
+
 class EntityManager:
     """
     Manages entities and their components in an ECS architecture.
@@ -25,6 +82,11 @@ class EntityManager:
         self._next_entity_id_int: int = 0 # If using simple integer IDs
         # Data structure for independent components
         self.independent_components: Dict[Type[Component], Dict[uuid.UUID, Component]] = {}
+        # Revolute-joint linkage DSU, rebuilt lazily in place when dirty; see get_revolute_linkage()
+        self._revolute_linkage: RevoluteLinkage = RevoluteLinkage()
+        self._revolute_linkage_dirty: bool = True
+        # Non-broken ConnectionComponents bucketed by ConnectionType; None means rebuild on next read
+        self._active_connections_by_type: Optional[Dict[ConnectionType, Tuple[ConnectionComponent, ...]]] = None
  
     def _generate_entity_id(self) -> EntityID:
         """Generates a unique entity ID."""
@@ -146,6 +208,16 @@ class EntityManager:
         return self.components_by_type.get(component_type, {}).get(entity_id)
 
 
+    def get_components(self, entity_id: EntityID, component_types: Tuple[Type[Component], ...]) -> Tuple[Optional[Component], ...]:
+        """
+        Retrieves several components of an entity with a single lookup of its component map.
+        Returns a tuple aligned with component_types; missing components (or a missing entity) yield None.
+        """
+        entity_components = self.components_by_entity.get(entity_id)
+        if entity_components is None:
+            return (None,) * len(component_types)
+        return tuple(entity_components.get(component_type) for component_type in component_types)
+
     def has_component(self, entity_id: EntityID, component_type: Type[Component]) -> bool:
         """
         Checks if an entity has a component of a specific type.
@@ -156,6 +228,17 @@ class EntityManager:
         # Or:
         # return entity_id in self.components_by_entity and component_type in self.components_by_entity[entity_id]
 
+    def has_components(self, entity_id: EntityID, component_types: Tuple[Type[Component], ...]) -> bool:
+        """
+        Checks if an entity has all of the specified component types.
+        Uses the components_by_type reverse index and stops at the first missing type.
+        """
+        for component_type in component_types:
+            entities_with_type = self.components_by_type.get(component_type)
+            if entities_with_type is None or entity_id not in entities_with_type:
+                return False
+        return True
+
     def get_entities_with_components(self, *component_types: Type[Component]) -> List[EntityID]:
         """
         Retrieves a list of entity IDs that have all the specified component types.
@@ -190,6 +273,14 @@ class EntityManager:
             return []
         return list(self.components_by_type[component_type].values()) # type: ignore
 
+    def get_component_map(self, component_type: Type[C]) -> Mapping[EntityID, C]:
+        """
+        Returns the entity_id -> component mapping for one component type (a "column").
+        This is the live internal dict, not a copy: use it for batched gathers in hot loops
+        (one dict lookup per entity instead of a get_component call) and do not mutate it.
+        """
+        return self.components_by_type.get(component_type, {}) # type: ignore
+
     def get_all_components_for_entity(self, entity_id: EntityID) -> Dict[Type[Component], Component]:
         """
         Retrieves all components associated with a specific entity.
@@ -281,6 +372,7 @@ class EntityManager:
 
 
         self.independent_components[component_type][component_id] = component_instance
+        self._on_independent_component_added(component_instance)
         return component_instance
 
     def add_independent_component(self, component_instance: C) -> None:
@@ -317,6 +409,7 @@ class EntityManager:
             )
         
         self.independent_components[component_type][component_id] = component_instance
+        self._on_independent_component_added(component_instance)
 
 
     def get_independent_component_by_id(self, component_id: uuid.UUID, component_type: Type[C]) -> Optional[C]:
@@ -344,6 +437,14 @@ class EntityManager:
         """
         return list(self.independent_components.get(component_type, {}).values()) # type: ignore
 
+    def get_independent_component_map(self, component_type: Type[C]) -> Mapping[uuid.UUID, C]:
+        """
+        Returns the component_id -> component mapping for one independent component type.
+        Like get_component_map, this is the live internal dict (no list copy): read-only by convention,
+        and callers must not add/remove components of this type while iterating it.
+        """
+        return self.independent_components.get(component_type, {}) # type: ignore
+
     def remove_independent_component_by_id(self, component_id: uuid.UUID, component_type: Type[Component]) -> bool:
         """
         Removes an independent component by its ID and type.
@@ -360,6 +461,8 @@ class EntityManager:
             del self.independent_components[component_type][component_id]
             if not self.independent_components[component_type]: # Clean up type dict if empty
                 del self.independent_components[component_type]
+            if component_type is ConnectionComponent:
+                self.invalidate_connection_index() # DSU cannot split; rebuild lazily
             return True
         return False
 
@@ -368,6 +471,53 @@ class EntityManager:
         Removes all independent components of all types.
         """
         self.independent_components.clear()
+        self.invalidate_connection_index()
+
+    # --- Revolute linkage ---
+    def _on_independent_component_added(self, component_instance: Component) -> None:
+        if not isinstance(component_instance, ConnectionComponent):
+            return
+        self._active_connections_by_type = None
+        if self._revolute_linkage_dirty:
+            return
+        if self._is_live_revolute_joint(component_instance):
+            self._revolute_linkage.union(component_instance.source_entity_id, component_instance.target_entity_id)
+
+    @staticmethod
+    def _is_live_revolute_joint(conn: ConnectionComponent) -> bool:
+        return (conn.connection_type is ConnectionType.REVOLUTE_JOINT and not conn.is_broken
+                and bool(conn.source_entity_id) and bool(conn.target_entity_id))
+
+    def invalidate_connection_index(self) -> None:
+        """
+        Drops every cached view of the connections (type buckets and revolute linkage). Adds and removals
+        handle this themselves; callers that mutate a ConnectionComponent in place (type, endpoints or
+        is_broken) must call it.
+        """
+        self._active_connections_by_type = None
+        self._revolute_linkage_dirty = True
+
+    def active_connections_by_type(self, connection_type: ConnectionType) -> Tuple[ConnectionComponent, ...]:
+        """Returns the non-broken ConnectionComponents of the given type, from a lazily rebuilt index."""
+        buckets = self._active_connections_by_type
+        if buckets is None:
+            grouped: Dict[ConnectionType, List[ConnectionComponent]] = {}
+            for conn in self.independent_components.get(ConnectionComponent, {}).values():
+                if not conn.is_broken:
+                    grouped.setdefault(conn.connection_type, []).append(conn)
+            buckets = self._active_connections_by_type = {ct: tuple(conns) for ct, conns in grouped.items()}
+        return buckets.get(connection_type, ())
+
+    def get_revolute_linkage(self) -> RevoluteLinkage:
+        """Returns the revolute-joint linkage DSU, rebuilding it from the connections if invalidated."""
+        linkage = self._revolute_linkage
+        if self._revolute_linkage_dirty:
+            linkage.clear()
+            for conn in self.active_connections_by_type(ConnectionType.REVOLUTE_JOINT):
+                if conn.source_entity_id and conn.target_entity_id:
+                    linkage.union(conn.source_entity_id, conn.target_entity_id)
+            self._revolute_linkage_dirty = False
+        return linkage
 
     # --- General Management ---
     def clear_all(self) -> None:
@@ -390,41 +540,12 @@ class EntityManager:
 
     def get_revolute_linked_entities(self, start_entity_id: EntityID) -> Set[EntityID]:
         """
-        Performs a BFS to find all entities connected to start_entity_id through a chain of
-        REVOLUTE_JOINT connections.
+        Finds all entities connected to start_entity_id through a chain of
+        REVOLUTE_JOINT connections, via the cached linkage DSU.
         """
         if start_entity_id not in self.entities:
             return set()
-
-        linked_entities: Set[EntityID] = set()
-        queue: List[EntityID] = [start_entity_id]
-        visited: Set[EntityID] = {start_entity_id}
-        
-        head = 0
-        while head < len(queue):
-            current_id = queue[head]
-            head += 1
-            linked_entities.add(current_id)
-
-            # Check all ConnectionComponents involving current_id
-            # This is less efficient than iterating all ConnectionComponents once,
-            # but more targeted for a single BFS traversal.
-            # For higher performance with many calls, pre-indexing connections might be better.
-            
-            all_connections = self.get_all_independent_components_of_type(ConnectionComponent)
-            for conn in all_connections:
-                if conn.connection_type == ConnectionType.REVOLUTE_JOINT and not conn.is_broken:
-                    partner_id: Optional[EntityID] = None
-                    if conn.source_entity_id == current_id:
-                        partner_id = conn.target_entity_id
-                    elif conn.target_entity_id == current_id:
-                        partner_id = conn.source_entity_id
-                    
-                    if partner_id and partner_id not in visited:
-                        visited.add(partner_id)
-                        queue.append(partner_id)
-                        
-        return linked_entities
+        return set(self.get_revolute_linkage().members_of(start_entity_id))
 
 
 # Example Usage (can be removed or moved to tests)
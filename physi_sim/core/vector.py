@@ -5,6 +5,9 @@ class Vector2D:
     """
     A two-dimensional vector with common vector operations.
     """
+    # Fixed attribute layout: no per-instance __dict__, smaller and faster to allocate.
+    __slots__ = ('x', 'y')
+
     def __init__(self, x: float, y: float):
         self.x: float = x
         self.y: float = y
@@ -0,0 +1,84 @@
+"""
+Vectorized hit-test and marquee kernels shared by the select tool.
+
+Segments are (N, 4) float arrays of [ax, ay, bx, by] rows and AABBs are (N, 4) arrays of
+[min_x, min_y, max_x, max_y] rows. Kernels return row indices, which callers map back to IDs.
+"""
+import numpy as np
+
+
+def segments_intersect_rect(ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray,
+                            x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+    """
+    Batched Liang–Barsky clip: returns a boolean mask of the segments a->b that touch the
+    closed rectangle [x0, x1] x [y0, y1] (endpoint inside, crossing an edge, or fully contained).
+    """
+    dx = bx - ax
+    dy = by - ay
+    u_enter = np.zeros(ax.shape)
+    u_exit = np.ones(ax.shape)
+    hit = np.ones(ax.shape, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, q in ((-dx, ax - x0), (dx, x1 - ax), (-dy, ay - y0), (dy, y1 - ay)):
+            parallel = p == 0
+            hit &= ~(parallel & (q < 0)) # Parallel to this edge and outside it
+            r = q / p
+            u_enter = np.where(p < 0, np.maximum(u_enter, r), u_enter)
+            u_exit = np.where(p > 0, np.minimum(u_exit, r), u_exit)
+    return hit & (u_enter <= u_exit)
+
+
+def point_segment_distance_sq(px: float, py: float, ax: np.ndarray, ay: np.ndarray,
+                              bx: np.ndarray, by: np.ndarray) -> np.ndarray:
+    """Vectorized DrawingWidget._point_segment_distance_sq: squared distance from (px, py) to each segment a->b."""
+    ab_x = bx - ax
+    ab_y = by - ay
+    ap_x = px - ax
+    ap_y = py - ay
+    len_sq_ab = ab_x * ab_x + ab_y * ab_y
+    # Degenerate segments (a == b) fall back to the distance to a
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(len_sq_ab > 0, (ap_x * ab_x + ap_y * ab_y) / len_sq_ab, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    d_x = ap_x - t * ab_x
+    d_y = ap_y - t * ab_y
+    return d_x * d_x + d_y * d_y
+
+
+def hit_segment(px: float, py: float, segments: np.ndarray, threshold: float) -> int:
+    """
+    Returns the index of the first segment within `threshold` (exclusive) of (px, py), or -1.
+    Segments whose bounding box, grown by the threshold, misses the point are rejected before
+    the distance pass.
+    """
+    ax, ay, bx, by = segments[:, 0], segments[:, 1], segments[:, 2], segments[:, 3]
+    candidates = np.flatnonzero((np.minimum(ax, bx) - threshold <= px) & (np.maximum(ax, bx) + threshold >= px) &
+                                (np.minimum(ay, by) - threshold <= py) & (np.maximum(ay, by) + threshold >= py))
+    if not candidates.size:
+        return -1
+    near = segments[candidates]
+    dist_sq = point_segment_distance_sq(px, py, near[:, 0], near[:, 1], near[:, 2], near[:, 3])
+    hits = candidates[dist_sq < threshold * threshold]
+    return int(hits[0]) if hits.size else -1
+
+
+def segments_in_rect(segments: np.ndarray, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+    """
+    Returns the indices of the segments touching the closed rectangle [x0, x1] x [y0, y1].
+    Only segments whose bounding box overlaps the rectangle are clipped.
+    """
+    ax, ay, bx, by = segments[:, 0], segments[:, 1], segments[:, 2], segments[:, 3]
+    candidates = np.flatnonzero((np.minimum(ax, bx) <= x1) & (np.maximum(ax, bx) >= x0) &
+                                (np.minimum(ay, by) <= y1) & (np.maximum(ay, by) >= y0))
+    if not candidates.size:
+        return candidates
+    near = segments[candidates]
+    return candidates[segments_intersect_rect(near[:, 0], near[:, 1], near[:, 2], near[:, 3], x0, y0, x1, y1)]
+
+
+def aabbs_overlapping_rect(aabbs: np.ndarray, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+    """
+    Returns the indices of the AABBs strictly overlapping the rectangle, mirroring QRectF.intersects:
+    touching edges do not count.
+    """
+    return np.flatnonzero((aabbs[:, 0] < x1) & (aabbs[:, 2] > x0) & (aabbs[:, 1] < y1) & (aabbs[:, 3] > y0))
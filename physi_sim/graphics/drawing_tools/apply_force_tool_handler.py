@@ -1,17 +1,36 @@
+import logging
+
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QMessageBox, QInputDialog
 from PySide6.QtGui import QCursor
 
-from physi_sim.graphics.drawing_tools.base_tool_handler import BaseToolHandler
+from physi_sim.graphics.drawing_tools.base_tool_handler import BaseToolHandler, discard_status_message
+from physi_sim.graphics.enums import ToolAttachmentMode
 from physi_sim.core.vector import Vector2D
 from physi_sim.core.component import PhysicsBodyComponent, ForceAccumulatorComponent, TransformComponent, IdentifierComponent
-from physi_sim.core.entity_manager import EntityManager
-
-import uuid
+from physi_sim.core.entity_manager import EntityManager, EntityID
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Callable, Tuple
 if TYPE_CHECKING:
-    from physi_sim.graphics.main_window import MainWindow, DrawingWidget, ToolMode, ToolAttachmentMode
+    from physi_sim.graphics.main_window import MainWindow, DrawingWidget, ToolMode
+
+logger = logging.getLogger(__name__)
+
+# Components an entity needs before a force can be applied to it (checked with has_components).
+_FORCE_REQUIRED_TYPES = (PhysicsBodyComponent, ForceAccumulatorComponent, TransformComponent)
+# Component sets fetched in one EntityManager.get_components call each.
+_FORCE_TARGET_TYPES = (TransformComponent, IdentifierComponent)
+_FORCE_APPLY_TYPES = (TransformComponent, ForceAccumulatorComponent)
+
+def _accumulate_force_at_point(px: float, py: float, cx: float, cy: float, fx: float, fy: float,
+                               net_fx: float, net_fy: float, net_torque: float) -> Tuple[float, float, float]:
+    """
+    Adds force (fx, fy) applied at world point (px, py) to a body centred at (cx, cy).
+    Works on plain floats and returns the new (net_fx, net_fy, net_torque).
+    """
+    r_x = px - cx
+    r_y = py - cy
+    return net_fx + fx, net_fy + fy, net_torque + (r_x * fy - r_y * fx)
 
 class ApplyForceToolHandler(BaseToolHandler):
     """
@@ -21,21 +40,29 @@ class ApplyForceToolHandler(BaseToolHandler):
     def __init__(self):
         super().__init__()
         self.force_apply_phase: int = 0 # 0: 未开始, 1: 已选实体 (自由定位模式下等待选择作用点), 2: (已废弃, 直接弹窗)
-        self.force_target_entity_id: Optional[uuid.UUID] = None
+        self.force_target_entity_id: Optional[EntityID] = None
         self.force_application_point_world: Optional[Vector2D] = None
+        # Cursors are built once here (after QApplication exists) and reused on every activation.
+        self._pointing_cursor = QCursor(Qt.CursorShape.PointingHandCursor)
+        self._arrow_cursor = QCursor(Qt.CursorShape.ArrowCursor)
+        # Bound once in activate() so event handlers don't probe main_window for a status bar each time.
+        self._show_status: Callable[..., None] = discard_status_message
+        # (entity_id, formatted name) for the entity targeted by the current workflow
+        self._cached_display_name: Optional[Tuple[EntityID, str]] = None
         # highlighted_force_entity_id is managed by DrawingWidget/MainWindow for rendering consistency
 
     def activate(self, drawing_widget: 'DrawingWidget'):
         main_window: 'MainWindow' = drawing_widget.window()
         self._reset_state(drawing_widget) # Reset state upon activation
-        if hasattr(main_window, 'status_bar'):
-            main_window.status_bar.showMessage("施加力工具已激活。请选择一个实体。", 3000)
-        drawing_widget.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._show_status = main_window.status_bar.showMessage if hasattr(main_window, 'status_bar') else discard_status_message
+        self._show_status("施加力工具已激活。请选择一个实体。", 3000)
+        drawing_widget.setCursor(self._pointing_cursor)
 
 
     def deactivate(self, drawing_widget: 'DrawingWidget'):
         self._reset_state(drawing_widget)
-        drawing_widget.setCursor(Qt.CursorShape.ArrowCursor)
+        drawing_widget.setCursor(self._arrow_cursor)
+        self._show_status = discard_status_message
         # Ensure MainWindow's highlight state is also cleared
         main_window: 'MainWindow' = drawing_widget.window()
         if hasattr(main_window, '_reset_force_application_state'): # Check if method exists
@@ -50,10 +77,27 @@ class ApplyForceToolHandler(BaseToolHandler):
         self.force_apply_phase = 0
         self.force_target_entity_id = None
         self.force_application_point_world = None
+        self._cached_display_name = None
         # Let MainWindow handle its own highlight state reset via _reset_force_application_state
         # drawing_widget.highlighted_force_entity_id = None # This might be redundant if MainWindow handles it
 
 
+    def _display_name(self, entity_manager: EntityManager, entity_id: EntityID,
+                      name_comp: Optional[IdentifierComponent] = None) -> str:
+        """
+        Returns the label used for entity_id in dialogs and status messages.
+        Cached until _reset_state, since one workflow shows it several times.
+        """
+        if self._cached_display_name is not None and self._cached_display_name[0] == entity_id:
+            return self._cached_display_name[1]
+        if name_comp is None:
+            name_comp = entity_manager.get_component(entity_id, IdentifierComponent)
+        entity_display_name = str(entity_id)[:8]
+        if name_comp and name_comp.name:
+            entity_display_name = f"'{name_comp.name}' ({str(entity_id)[:8]})"
+        self._cached_display_name = (entity_id, entity_display_name)
+        return entity_display_name
+
     def handle_mouse_press(self, event, drawing_widget: 'DrawingWidget'):
         main_window: 'MainWindow' = drawing_widget.window()
         entity_manager: EntityManager = main_window.entity_manager
@@ -63,68 +107,50 @@ class ApplyForceToolHandler(BaseToolHandler):
 
         if self.force_apply_phase == 0: # Phase 0: Select entity
             if hit_entity_id is not None:
-                physics_body = entity_manager.get_component(hit_entity_id, PhysicsBodyComponent)
-                force_accumulator = entity_manager.get_component(hit_entity_id, ForceAccumulatorComponent)
-                transform_comp = entity_manager.get_component(hit_entity_id, TransformComponent)
-
-                if physics_body and force_accumulator and transform_comp:
+                if entity_manager.has_components(hit_entity_id, _FORCE_REQUIRED_TYPES):
+                    transform_comp, entity_name_comp = entity_manager.get_components(hit_entity_id, _FORCE_TARGET_TYPES)
                     self.force_target_entity_id = hit_entity_id
                     drawing_widget.highlighted_force_entity_id = hit_entity_id # For visual feedback
 
-                    entity_name_comp = entity_manager.get_component(hit_entity_id, IdentifierComponent)
-                    entity_display_name = str(hit_entity_id)[:8]
-                    if entity_name_comp and entity_name_comp.name:
-                        entity_display_name = f"'{entity_name_comp.name}' ({str(hit_entity_id)[:8]})"
-
-                    # Import ToolAttachmentMode here or ensure it's available
-                    from physi_sim.graphics.main_window import ToolAttachmentMode
+                    entity_display_name = self._display_name(entity_manager, hit_entity_id, entity_name_comp)
 
                     if main_window.force_application_mode == ToolAttachmentMode.CENTER_OF_MASS:
                         self.force_application_point_world = transform_comp.position
-                        if hasattr(main_window, 'status_bar'):
-                            main_window.status_bar.showMessage(f"已选中实体 {entity_display_name} (质心模式)。准备输入力。")
+                        self._show_status(f"已选中实体 {entity_display_name} (质心模式)。准备输入力。")
                         self._prompt_for_force_vector(main_window, drawing_widget, self.force_target_entity_id, self.force_application_point_world)
                         # _reset_state will be called by _prompt_for_force_vector or its cancellation
                     else: # FREE_POSITION mode
                         self.force_apply_phase = 1
-                        if hasattr(main_window, 'status_bar'):
-                            main_window.status_bar.showMessage(f"已选中实体 {entity_display_name} (自由定位)。请点击力的作用点。")
+                        self._show_status(f"已选中实体 {entity_display_name} (自由定位)。请点击力的作用点。")
                     drawing_widget.update()
                 else:
                     QMessageBox.information(drawing_widget, "选择实体失败", "选中的对象缺少必要的物理或变换组件，无法施加力。")
-                    if hasattr(main_window, 'status_bar'):
-                        main_window.status_bar.showMessage("选中的对象缺少必要组件，无法施加力。")
+                    self._show_status("选中的对象缺少必要组件，无法施加力。")
                     main_window._reset_force_application_state() # Calls our _reset_state indirectly
             else: # Clicked on empty space in phase 0
                 if drawing_widget.highlighted_force_entity_id:
                      main_window._reset_force_application_state()
-                elif hasattr(main_window, 'status_bar'):
-                     main_window.status_bar.showMessage("请先点击一个实体以选择施力对象。")
+                else:
+                     self._show_status("请先点击一个实体以选择施力对象。")
         
         elif self.force_apply_phase == 1: # Phase 1: Select application point (only for FREE_POSITION mode)
             if self.force_target_entity_id is not None:
-                from physi_sim.graphics.main_window import ToolAttachmentMode # Re-import for safety
                 if main_window.force_application_mode == ToolAttachmentMode.FREE_POSITION:
                     self.force_application_point_world = click_pos_world
                     
-                    entity_name_comp = entity_manager.get_component(self.force_target_entity_id, IdentifierComponent)
-                    entity_display_name = str(self.force_target_entity_id)[:8]
-                    if entity_name_comp and entity_name_comp.name:
-                        entity_display_name = f"'{entity_name_comp.name}' ({str(self.force_target_entity_id)[:8]})"
+                    entity_display_name = self._display_name(entity_manager, self.force_target_entity_id)
 
-                    if hasattr(main_window, 'status_bar'):
-                        main_window.status_bar.showMessage(f"作用点选定于 {click_pos_world} (实体: {entity_display_name})。")
+                    self._show_status(f"作用点选定于 {click_pos_world} (实体: {entity_display_name})。")
                     self._prompt_for_force_vector(main_window, drawing_widget, self.force_target_entity_id, self.force_application_point_world)
             else: # Should not happen
                 self._reset_state(drawing_widget) # Call own reset
         else: # Target entity ID lost
-                if hasattr(main_window, 'status_bar'):
-                    main_window.status_bar.showMessage("目标实体丢失，请重新点击一个实体。")
+                self._show_status("目标实体丢失，请重新点击一个实体。")
                 self._reset_state(drawing_widget) # Call own reset
                 # Optionally re-process this click as a phase 0 click, but safer to just reset.
         drawing_widget.update()
 
-    def _prompt_for_force_vector(self, main_window: 'MainWindow', drawing_widget: 'DrawingWidget', entity_id: uuid.UUID, application_point_world: Vector2D):
+    def _prompt_for_force_vector(self, main_window: 'MainWindow', drawing_widget: 'DrawingWidget', entity_id: EntityID, application_point_world: Vector2D):
         """Prompts the user for force components and applies the force."""
         if entity_id is None:
             QMessageBox.warning(drawing_widget, "错误", "目标实体ID无效。")
@@ -132,52 +158,40 @@ class ApplyForceToolHandler(BaseToolHandler):
             return
 
         entity_manager = main_window.entity_manager
-        entity_name_comp = entity_manager.get_component(entity_id, IdentifierComponent)
-        entity_display_name = str(entity_id)[:8]
-        if entity_name_comp and entity_name_comp.name:
-            entity_display_name = f"'{entity_name_comp.name}' ({str(entity_id)[:8]})"
+        transform, accumulator = entity_manager.get_components(entity_id, _FORCE_APPLY_TYPES)
+        entity_display_name = self._display_name(entity_manager, entity_id)
         
         title = f"为实体 {entity_display_name} 施加力"
         
-        force_x_str, ok_x = QInputDialog.getText(drawing_widget, title, "输入力的 X 分量 (Fx):", text="10.0")
+        # getDouble validates the input in the dialog itself, so no string parsing is needed here.
+        force_x, ok_x = QInputDialog.getDouble(drawing_widget, title, "输入力的 X 分量 (Fx):", 10.0, -1e9, 1e9, 3)
         if not ok_x:
-            if hasattr(main_window, 'status_bar'):
-                main_window.status_bar.showMessage("施加力操作已取消。")
+            self._show_status("施加力操作已取消。")
             self._reset_state(drawing_widget) # Reset state on cancel
             return
         
-        force_y_str, ok_y = QInputDialog.getText(drawing_widget, title, "输入力的 Y 分量 (Fy):", text="0.0")
+        force_y, ok_y = QInputDialog.getDouble(drawing_widget, title, "输入力的 Y 分量 (Fy):", 0.0, -1e9, 1e9, 3)
         if not ok_y:
-            if hasattr(main_window, 'status_bar'):
-                main_window.status_bar.showMessage("施加力操作已取消。")
+            self._show_status("施加力操作已取消。")
             self._reset_state(drawing_widget) # Reset state on cancel
             return
-            
-        try:
-            force_x = float(force_x_str)
-            force_y = float(force_y_str)
-        except ValueError:
-            QMessageBox.warning(drawing_widget, "输入错误", "无效的力分量。请输入数字。")
-            self._reset_state(drawing_widget) # Reset state on error
-            return
 
         force_vector = Vector2D(force_x, force_y)
         
-        self._apply_external_force_at_point(main_window, entity_id, force_vector, application_point_world)
+        self._apply_external_force_at_point(main_window, entity_id, transform, accumulator, entity_display_name,
+                                            force_vector, application_point_world)
         
-        if hasattr(main_window, 'status_bar'):
-            main_window.status_bar.showMessage(f"已对实体 {entity_display_name} 在 {application_point_world} 施加力 {force_vector}。")
+        self._show_status(f"已对实体 {entity_display_name} 在 {application_point_world} 施加力 {force_vector}。")
         
         self._reset_state(drawing_widget) # Reset tool state after successful application
 
-    def _apply_external_force_at_point(self, main_window: 'MainWindow', entity_id: uuid.UUID, force_vector: Vector2D, application_point_world: Vector2D):
+    def _apply_external_force_at_point(self, main_window: 'MainWindow', entity_id: EntityID,
+                                       transform: Optional[TransformComponent], accumulator: Optional[ForceAccumulatorComponent],
+                                       entity_display_name: str, force_vector: Vector2D, application_point_world: Vector2D):
         """
         Applies an external force and the resulting torque to an entity.
+        The caller passes the entity's already-fetched components.
         """
-        entity_manager = main_window.entity_manager
-        transform = entity_manager.get_component(entity_id, TransformComponent)
-        accumulator = entity_manager.get_component(entity_id, ForceAccumulatorComponent)
-        
         if not transform:
             print(f"错误: 实体 {entity_id} 缺少 TransformComponent。无法施加力。")
             QMessageBox.warning(main_window, "施加力失败", f"实体 {str(entity_id)[:8]}... 缺少 TransformComponent。")
@@ -188,26 +202,20 @@ class ApplyForceToolHandler(BaseToolHandler):
             return
 
         center_world = transform.position
-        r_x = application_point_world.x - center_world.x
-        r_y = application_point_world.y - center_world.y
-        torque = r_x * force_vector.y - r_y * force_vector.x
-        
-        accumulator.net_force = accumulator.net_force + force_vector
-        accumulator.net_torque += torque
-        
-        entity_name_comp = entity_manager.get_component(entity_id, IdentifierComponent)
-        entity_display_name = str(entity_id)[:8]
-        if entity_name_comp and entity_name_comp.name:
-            entity_display_name = f"'{entity_name_comp.name}' ({str(entity_id)[:8]})"
-
-        print(f"已对实体 {entity_display_name} (ID: {entity_id}) 施加力:")
-        print(f"  力向量: {force_vector}")
-        print(f"  作用点 (世界): {application_point_world}")
-        print(f"  质心 (世界): {center_world}")
-        print(f"  力臂 (r): Vector2D({r_x:.3f}, {r_y:.3f})")
-        print(f"  计算出的力矩: {torque:.3f}")
-        print(f"  累积力: {accumulator.net_force}")
-        print(f"  累积力矩: {accumulator.net_torque:.3f}")
+        previous_torque = accumulator.net_torque
+
+        net_fx, net_fy, accumulator.net_torque = _accumulate_force_at_point(
+            application_point_world.x, application_point_world.y, center_world.x, center_world.y,
+            force_vector.x, force_vector.y, accumulator.net_force.x, accumulator.net_force.y, previous_torque)
+        accumulator.net_force = Vector2D(net_fx, net_fy)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "已对实体 %s (ID: %s) 施加力: 力向量=%s, 作用点 (世界)=%s, 质心 (世界)=%s, "
+                "力臂 (r)=Vector2D(%.3f, %.3f), 计算出的力矩=%.3f, 累积力=%s, 累积力矩=%.3f",
+                entity_display_name, entity_id, force_vector, application_point_world, center_world,
+                application_point_world.x - center_world.x, application_point_world.y - center_world.y,
+                accumulator.net_torque - previous_torque, accumulator.net_force, accumulator.net_torque)
 
 
     def handle_mouse_move(self, event, drawing_widget: 'DrawingWidget'):
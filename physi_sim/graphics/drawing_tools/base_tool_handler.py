@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
 
+def discard_status_message(*args, **kwargs) -> None:
+    """Stand-in for QStatusBar.showMessage when no status bar is available."""
+    pass
+
 class BaseToolHandler(ABC):
     """
     工具处理器基类/接口，定义了绘图工具处理鼠标事件和绘制行为的统一接口。
@@ -1,13 +1,16 @@
 from PySide6.QtCore import Qt, QPointF
 from PySide6.QtGui import QCursor
 
-from physi_sim.graphics.drawing_tools.base_tool_handler import BaseToolHandler
+from physi_sim.graphics.drawing_tools.base_tool_handler import BaseToolHandler, discard_status_message
 from physi_sim.core.vector import Vector2D # Not strictly needed for pan, but good for consistency
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Callable
 if TYPE_CHECKING:
     from physi_sim.graphics.main_window import MainWindow, DrawingWidget, ToolMode
 
+# Qt enum member bound once; compared against on every press/release
+_LEFT_BUTTON = Qt.MouseButton.LeftButton
+
 class PanViewToolHandler(BaseToolHandler):
     """
     处理平移视图工具的逻辑。
@@ -17,31 +20,41 @@ class PanViewToolHandler(BaseToolHandler):
         super().__init__()
         self.is_panning: bool = False
         self.last_pan_pos: Optional[QPointF] = None
+        # Cursors are built once here (after QApplication exists); panning swaps them on every drag.
+        self._open_hand_cursor = QCursor(Qt.CursorShape.OpenHandCursor)
+        self._closed_hand_cursor = QCursor(Qt.CursorShape.ClosedHandCursor)
+        self._arrow_cursor = QCursor(Qt.CursorShape.ArrowCursor)
+        self._show_status: Callable[..., None] = discard_status_message
 
     def activate(self, drawing_widget: 'DrawingWidget'):
         main_window: 'MainWindow' = drawing_widget.window()
-        if hasattr(main_window, 'status_bar'):
-            main_window.status_bar.showMessage("平移视图工具已激活。按住左键拖拽以平移视图。", 3000)
+        self._show_status = main_window.status_bar.showMessage if hasattr(main_window, 'status_bar') else discard_status_message
+        self._show_status("平移视图工具已激活。按住左键拖拽以平移视图。", 3000)
         self.is_panning = False
         self.last_pan_pos = None
-        drawing_widget.setCursor(Qt.CursorShape.OpenHandCursor)
+        drawing_widget.setCursor(self._open_hand_cursor)
 
     def deactivate(self, drawing_widget: 'DrawingWidget'):
         self.is_panning = False
         self.last_pan_pos = None
-        drawing_widget.setCursor(Qt.CursorShape.ArrowCursor)
+        drawing_widget.setCursor(self._arrow_cursor)
+        self._show_status = discard_status_message
         drawing_widget.update()
 
     def handle_mouse_press(self, event, drawing_widget: 'DrawingWidget'):
-        if event.button() == Qt.MouseButton.LeftButton:
+        if event.button() == _LEFT_BUTTON:
             self.is_panning = True
             self.last_pan_pos = event.position() # QPointF in widget coordinates
-            drawing_widget.setCursor(Qt.CursorShape.ClosedHandCursor)
+            drawing_widget.setCursor(self._closed_hand_cursor)
 
     def handle_mouse_move(self, event, drawing_widget: 'DrawingWidget'):
         if self.is_panning and self.last_pan_pos:
             current_pos_screen = event.position()
             delta_screen = current_pos_screen - self.last_pan_pos
+            # Ignore sub-pixel jitter. last_pan_pos is left untouched so the motion
+            # accumulates and is applied once it crosses a whole pixel.
+            if abs(delta_screen.x()) < 1 and abs(delta_screen.y()) < 1:
+                return
             
             # Update DrawingWidget's view_offset directly
             # Note: This assumes DrawingWidget has view_offset and pixels_per_world_unit
@@ -51,13 +64,13 @@ class PanViewToolHandler(BaseToolHandler):
                 drawing_widget.view_offset.y += delta_screen.y() / drawing_widget.pixels_per_world_unit
             
             self.last_pan_pos = current_pos_screen
-            drawing_widget.update()
+            drawing_widget.schedule_update()
 
     def handle_mouse_release(self, event, drawing_widget: 'DrawingWidget'):
-        if event.button() == Qt.MouseButton.LeftButton and self.is_panning:
+        if event.button() == _LEFT_BUTTON and self.is_panning:
             self.is_panning = False
             self.last_pan_pos = None
-            drawing_widget.setCursor(Qt.CursorShape.OpenHandCursor) # Back to open hand if tool still active
+            drawing_widget.setCursor(self._open_hand_cursor) # Back to open hand if tool still active
             drawing_widget.update()
 
     def paint_overlay(self, painter, drawing_widget: 'DrawingWidget'):
@@ -1,3 +1,4 @@
+import numpy as np
 from PySide6.QtCore import Qt, QPointF
 from PySide6.QtGui import QPainter, QPen, QPolygonF, QColor # Added QColor
 
@@ -10,18 +11,35 @@ from physi_sim.core.vector import Vector2D
 from physi_sim.graphics.drawing_tools.base_tool_handler import BaseToolHandler
 # from physi_sim.graphics.main_window import Tool # Assuming Tool enum is here - REMOVED TO FIX CIRCULAR IMPORT
 
+# Qt enum members bound once; compared against on every mouse/key event
+_LEFT_BUTTON = Qt.MouseButton.LeftButton
+_RIGHT_BUTTON = Qt.MouseButton.RightButton
+_KEY_RETURN = Qt.Key.Key_Return
+_KEY_ENTER = Qt.Key.Key_Enter
+_KEY_ESCAPE = Qt.Key.Key_Escape
+
 class PolygonToolHandler(BaseToolHandler):
     def __init__(self, entity_manager: EntityManager):
         self.entity_manager = entity_manager
         self.current_vertices_world = []  # Stores Vector2D in world coordinates
         self.is_drawing = False
         self.preview_edge_end = None # Stores Vector2D for preview line
+        # Qt-side mirrors of the vertices, appended incrementally so paint_overlay doesn't rebuild them
+        self._vertex_qpoints = [] # QPointF per vertex (vertex markers, first/last point)
+        self._qpoly = QPolygonF() # Open polyline through the vertices
+        self._preview_qpoint = None # QPointF mirror of preview_edge_end
+        # Overlay pens and sizes depend only on the zoom level; rebuilt when it changes.
+        self._last_ppwu = None
+        self._pixel_size_world = 0.01
+        self._pen_main = None
+        self._pen_dash = None
+        self._pen_vertex = None
+        self._vertex_radius = 0.0
 
     def activate(self, drawing_widget):
         self.drawing_widget = drawing_widget
-        self.current_vertices_world = []
+        self._clear_vertices()
         self.is_drawing = False
-        self.preview_edge_end = None
         # Connect key press events if needed, or handle in main_window
         # drawing_widget.setFocus() # Ensure widget can receive key events
 
@@ -30,47 +48,67 @@ class PolygonToolHandler(BaseToolHandler):
         # Disconnect key press events if connected
 
     def reset_drawing_state(self):
-        self.current_vertices_world = []
+        self._clear_vertices()
         self.is_drawing = False
-        self.preview_edge_end = None
         if hasattr(self, 'drawing_widget') and self.drawing_widget:
             self.drawing_widget.update() # Redraw to clear any overlays
 
+    def _clear_vertices(self):
+        self.current_vertices_world = []
+        # clear() keeps the QPolygonF's allocated capacity for the next polygon
+        self._vertex_qpoints.clear()
+        self._qpoly.clear()
+        self.preview_edge_end = None
+        self._preview_qpoint = None
+
+    def _append_vertex(self, world_pos_vec: Vector2D):
+        """Appends a world vertex and keeps its QPointF/QPolygonF mirrors in sync."""
+        qpoint = QPointF(world_pos_vec.x, world_pos_vec.y)
+        self.current_vertices_world.append(world_pos_vec)
+        self._vertex_qpoints.append(qpoint)
+        self._qpoly.append(qpoint)
+
+    def _set_preview(self, world_pos_vec: Vector2D):
+        self.preview_edge_end = world_pos_vec
+        self._preview_qpoint = QPointF(world_pos_vec.x, world_pos_vec.y)
+
     def handle_mouse_press(self, event, drawing_widget):
         # Use DrawingWidget's method to get world coordinates as Vector2D
         world_pos_vec = drawing_widget._get_world_coordinates(event.pos())
 
-        if event.button() == Qt.LeftButton:
+        if event.button() == _LEFT_BUTTON:
             if not self.is_drawing:
                 # First click: start drawing
                 self.is_drawing = True
-                self.current_vertices_world.append(world_pos_vec)
-                self.preview_edge_end = world_pos_vec # Initialize preview
+                self._append_vertex(world_pos_vec)
+                self._set_preview(world_pos_vec) # Initialize preview
             else:
                 # Subsequent clicks: add vertex
                 # Check if clicking near the first vertex to close
                 if len(self.current_vertices_world) >= 2: # Need at least 2 existing vertices to consider closing
                     first_vertex_vec = self.current_vertices_world[0]
-                    # Define a small tolerance for closing the polygon
-                    # get_pixel_size() equivalent: 1.0 / pixels_per_world_unit
-                    pixel_size_world = 1.0 / drawing_widget.pixels_per_world_unit if drawing_widget.pixels_per_world_unit > 0 else 0.01
-                    close_tolerance = pixel_size_world * 10 # 10 pixels tolerance in world units
-
-                    # Use Vector2D's distance_to or subtract and get magnitude
-                    if (world_pos_vec - first_vertex_vec).magnitude() < close_tolerance:
+                    # Define a small tolerance for closing the polygon (10 pixels in world units)
+                    if drawing_widget.pixels_per_world_unit != self._last_ppwu:
+                        self._update_overlay_style(drawing_widget.pixels_per_world_unit)
+                    close_tolerance = self._pixel_size_world * 10
+
+                    # Compare squared distances: no temporary Vector2D and no sqrt
+                    dx = world_pos_vec.x - first_vertex_vec.x
+                    dy = world_pos_vec.y - first_vertex_vec.y
+                    if dx * dx + dy * dy < close_tolerance * close_tolerance:
                         if len(self.current_vertices_world) >= 3: # Must have at least 3 vertices to form a polygon
                             # Don't add the point here, finalize_polygon will handle closing.
                             self.finalize_polygon() # Finalize directly
                         else:
                             # Not enough vertices to close, treat as a regular point by adding it
-                            self.current_vertices_world.append(world_pos_vec)
+                            self._append_vertex(world_pos_vec)
                         return # Stop further processing for this click
 
-                self.current_vertices_world.append(world_pos_vec)
+                self._append_vertex(world_pos_vec)
 
             drawing_widget.update()
 
-        elif event.button() == Qt.RightButton and self.is_drawing:
+        elif event.button() == _RIGHT_BUTTON and self.is_drawing:
             # Right click to finalize (if more than 2 vertices)
             if len(self.current_vertices_world) >= 3:
                 self.finalize_polygon()
@@ -81,8 +119,8 @@ class PolygonToolHandler(BaseToolHandler):
 
     def handle_mouse_move(self, event, drawing_widget):
         if self.is_drawing and self.current_vertices_world:
-            self.preview_edge_end = drawing_widget._get_world_coordinates(event.pos()) # Use Vector2D
-            drawing_widget.update()
+            self._set_preview(drawing_widget._get_world_coordinates(event.pos()))
+            drawing_widget.schedule_update()
 
     def handle_mouse_release(self, event, drawing_widget):
         # For polygon drawing, most logic is in press.
@@ -90,7 +128,7 @@ class PolygonToolHandler(BaseToolHandler):
         pass
 
     def handle_mouse_double_click(self, event, drawing_widget):
-        if self.is_drawing and event.button() == Qt.LeftButton:
+        if self.is_drawing and event.button() == _LEFT_BUTTON:
             if len(self.current_vertices_world) >= 3:
                  # Do not add current mouse position, just finalize with existing points.
                 self.finalize_polygon()
@@ -103,14 +141,15 @@ class PolygonToolHandler(BaseToolHandler):
         if not self.is_drawing:
             return False
 
-        if event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:
+        key = event.key()
+        if key == _KEY_RETURN or key == _KEY_ENTER:
             if len(self.current_vertices_world) >= 3:
                 self.finalize_polygon()
                 return True # Event handled
             else: # Not enough vertices, cancel
                 self.reset_drawing_state()
                 return True
-        elif event.key() == Qt.Key_Escape:
+        elif key == _KEY_ESCAPE:
             self.reset_drawing_state()
             return True # Event handled
         return False
@@ -120,52 +159,58 @@ class PolygonToolHandler(BaseToolHandler):
         if not self.is_drawing or not self.current_vertices_world:
             return
 
+        if drawing_widget.pixels_per_world_unit != self._last_ppwu:
+            self._update_overlay_style(drawing_widget.pixels_per_world_unit)
+
         painter.save()
-        pen = QPen(QColor(Qt.GlobalColor.blue)) # Changed color to blue
-        pixel_size_world = 1.0 / drawing_widget.pixels_per_world_unit if drawing_widget.pixels_per_world_unit > 0 else 0.01
-        pen.setWidthF(pixel_size_world * 1.0) # 1.0 pixel equivalent width for main lines
+        pen = self._pen_main
         painter.setPen(pen)
 
         # Painter received by paint_overlay is already transformed to world coordinates.
         # All drawing operations should use world coordinates and world unit dimensions.
 
         # Draw existing edges
-        poly_qpoints_world = [QPointF(v.x, v.y) for v in self.current_vertices_world]
-        if len(poly_qpoints_world) > 1:
-            poly = QPolygonF(poly_qpoints_world)
-            painter.drawPolyline(poly)
+        if len(self._vertex_qpoints) > 1:
+            painter.drawPolyline(self._qpoly)
 
         # Draw preview edge from last vertex to current mouse position
-        if self.preview_edge_end and self.current_vertices_world: # preview_edge_end is Vector2D
-            last_world_qpoint = QPointF(self.current_vertices_world[-1].x, self.current_vertices_world[-1].y)
-            preview_world_qpoint = QPointF(self.preview_edge_end.x, self.preview_edge_end.y)
-            painter.drawLine(last_world_qpoint, preview_world_qpoint)
+        if self._preview_qpoint is not None and self._vertex_qpoints:
+            preview_world_qpoint = self._preview_qpoint
+            painter.drawLine(self._vertex_qpoints[-1], preview_world_qpoint)
 
             # Optional: Draw a preview line back to the first point
-            if len(self.current_vertices_world) >= 2:
-                first_world_qpoint = QPointF(self.current_vertices_world[0].x, self.current_vertices_world[0].y)
-                # Make dashed line thinner
-                pen_preview_close = QPen(Qt.magenta, pixel_size_world * 0.5, Qt.DashLine) # 0.5 pixel equivalent width
-                painter.setPen(pen_preview_close)
+            if len(self._vertex_qpoints) >= 2:
+                first_world_qpoint = self._vertex_qpoints[0]
+                painter.setPen(self._pen_dash)
                 painter.drawLine(preview_world_qpoint, first_world_qpoint)
                 painter.setPen(pen) # Restore original pen for vertices (or rather, the main line pen)
 
 
         # Draw vertices
-        pen_vertex = QPen(Qt.red)
-        # Vertex outline can also be 1 pixel equivalent
-        pen_vertex.setWidthF(pixel_size_world * 0.5) # Thinner outline for vertices
-        painter.setPen(pen_vertex)
+        painter.setPen(self._pen_vertex)
         brush_vertex = Qt.red
         painter.setBrush(brush_vertex)
-        # Vertex radius: 2.5 pixels equivalent
-        radius_world = pixel_size_world * 2.5
+        radius_world = self._vertex_radius
         
-        for world_vertex_vec in self.current_vertices_world:
-            painter.drawEllipse(QPointF(world_vertex_vec.x, world_vertex_vec.y), radius_world, radius_world)
+        for vertex_qpoint in self._vertex_qpoints:
+            painter.drawEllipse(vertex_qpoint, radius_world, radius_world)
 
         painter.restore()
 
+    def _update_overlay_style(self, pixels_per_world_unit: float):
+        """Rebuilds the cached overlay pens and sizes for the given zoom level."""
+        pixel_size_world = 1.0 / pixels_per_world_unit if pixels_per_world_unit > 0 else 0.01
+        self._pixel_size_world = pixel_size_world
+
+        self._pen_main = QPen(QColor(Qt.GlobalColor.blue))
+        self._pen_main.setWidthF(pixel_size_world * 1.0) # 1.0 pixel equivalent width for main lines
+        # Dashed closing-preview line is thinner: 0.5 pixel equivalent width
+        self._pen_dash = QPen(Qt.magenta, pixel_size_world * 0.5, Qt.DashLine)
+        self._pen_vertex = QPen(Qt.red)
+        self._pen_vertex.setWidthF(pixel_size_world * 0.5) # Thinner outline for vertices
+        self._vertex_radius = pixel_size_world * 2.5 # Vertex radius: 2.5 pixels equivalent
+        self._last_ppwu = pixels_per_world_unit
+
     def finalize_polygon(self):
         if not self.is_drawing or len(self.current_vertices_world) < 3:
             self.reset_drawing_state()
@@ -174,12 +219,16 @@ class PolygonToolHandler(BaseToolHandler):
         # current_vertices_world now stores Vector2D objects
         world_vertices_vec = list(self.current_vertices_world) # Make a copy
 
-        # Ensure the polygon is closed if the last point isn't the first
-        if world_vertices_vec[0] != world_vertices_vec[-1]:
+        # Ensure the polygon is closed if the last point isn't the first.
+        # Vector2D defines no __eq__, so closing is tracked by identity: the snap/append below reuse the first vertex object.
+        if world_vertices_vec[0] is not world_vertices_vec[-1]:
             # Check if the last point is very close to the first. If so, snap it.
-            pixel_size_world = 1.0 / self.drawing_widget.pixels_per_world_unit if self.drawing_widget.pixels_per_world_unit > 0 else 0.01
-            close_tolerance_snap = pixel_size_world * 2 # 2 pixels tolerance for snapping
-            if (world_vertices_vec[-1] - world_vertices_vec[0]).magnitude() < close_tolerance_snap:
+            if self.drawing_widget.pixels_per_world_unit != self._last_ppwu:
+                self._update_overlay_style(self.drawing_widget.pixels_per_world_unit)
+            close_tolerance_snap = self._pixel_size_world * 2 # 2 pixels tolerance for snapping
+            dx = world_vertices_vec[-1].x - world_vertices_vec[0].x
+            dy = world_vertices_vec[-1].y - world_vertices_vec[0].y
+            if dx * dx + dy * dy < close_tolerance_snap * close_tolerance_snap:
                  world_vertices_vec[-1] = world_vertices_vec[0] # Snap
             else: # Otherwise, explicitly close it by adding the first point.
                  world_vertices_vec.append(world_vertices_vec[0])
@@ -191,7 +240,7 @@ class PolygonToolHandler(BaseToolHandler):
         # If closed by adding first point above, it's definitely a duplicate.
         
         unique_world_vertices_for_centroid = world_vertices_vec
-        if len(world_vertices_vec) > 1 and world_vertices_vec[0] == world_vertices_vec[-1]:
+        if len(world_vertices_vec) > 1 and world_vertices_vec[0] is world_vertices_vec[-1]:
             unique_world_vertices_for_centroid = world_vertices_vec[:-1]
 
 
@@ -202,15 +251,15 @@ class PolygonToolHandler(BaseToolHandler):
 
         # 1. Calculate Centroid (Geometric Center) to be the local origin (0,0)
         # This will also be the TransformComponent's position.
-        centroid_x = sum(v.x for v in unique_world_vertices_for_centroid) / len(unique_world_vertices_for_centroid)
-        centroid_y = sum(v.y for v in unique_world_vertices_for_centroid) / len(unique_world_vertices_for_centroid)
-        polygon_world_origin = Vector2D(centroid_x, centroid_y)
+        # Stack the vertices into an (N, 2) array so the mean is a single vectorized reduction.
+        world_coords = np.array([(v.x, v.y) for v in unique_world_vertices_for_centroid], dtype=np.float64)
+        centroid = world_coords.mean(axis=0)
+        polygon_world_origin = Vector2D(float(centroid[0]), float(centroid[1]))
 
         # 2. Convert world vertices to local vertices (relative to centroid)
-        # Use unique_world_vertices_for_centroid for this.
-        local_vertices_vector2d = []
-        for v_world in unique_world_vertices_for_centroid:
-            local_vertices_vector2d.append(v_world - polygon_world_origin)
+        # The GeometryComponent payload stays a list of Vector2D for compatibility.
+        local_coords = world_coords - centroid
+        local_vertices_vector2d = [Vector2D(x, y) for x, y in local_coords.tolist()]
 
         if not local_vertices_vector2d or len(local_vertices_vector2d) < 3:
             print("PolygonTool: Not enough unique vertices to form a polygon after processing.")
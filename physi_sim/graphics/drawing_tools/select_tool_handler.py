@@ -1,18 +1,120 @@
-from PySide6.QtCore import Qt, QPointF, QRectF, QLineF
+import logging
+
+from PySide6.QtCore import Qt, QPointF, QRectF, QTimer
 from PySide6.QtGui import QPainter, QColor, QPen, QCursor
 
 from physi_sim.graphics.drawing_tools.base_tool_handler import BaseToolHandler
 from physi_sim.core.vector import Vector2D
-from physi_sim.core.component import SpringComponent, ConnectionComponent, TransformComponent, GeometryComponent, ShapeType, ConnectionType, IdentifierComponent # Use ConnectionType Enum, Added IdentifierComponent
+from physi_sim.core.component import SpringComponent, TransformComponent, GeometryComponent, ShapeType, ConnectionType, IdentifierComponent # Use ConnectionType Enum, Added IdentifierComponent
 from physi_sim.core.entity_manager import EntityManager, EntityID # For type hinting if needed, Added EntityID
 # Use a forward reference for MainWindow and DrawingWidget to avoid circular imports at runtime
 # and satisfy type hinting.
-from typing import TYPE_CHECKING, List, Optional, Set # Added List, Optional, Set
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple # Added List, Optional, Set
 if TYPE_CHECKING:
     from physi_sim.graphics.main_window import MainWindow, DrawingWidget, ToolMode
 
+import functools
 import uuid # For type hinting entity IDs
 
+import numpy as np
+
+from physi_sim.graphics._select_kernels import hit_segment, segments_in_rect, aabbs_overlapping_rect
+
+logger = logging.getLogger(__name__)
+
+# Marquee releases closer than this to the press point (squared screen pixels) are treated as plain clicks
+MARQUEE_MIN_DRAG_PIXELS_SQ = 2 * 2
+
+
+def _squared_distance(p: QPointF, q: QPointF) -> float:
+    dx = q.x() - p.x()
+    dy = q.y() - p.y()
+    return dx * dx + dy * dy
+
+
+def _entity_world_aabbs(entity_manager: EntityManager) -> Tuple[List[EntityID], np.ndarray]:
+    """
+    Gathers the marquee AABB of every rectangle/circle entity into an (N, 4) array of
+    [min_x, min_y, max_x, max_y] rows, aligned with the returned id list.
+    Rectangles use their unrotated extents, as the marquee always has.
+    """
+    get_transform = entity_manager.get_component_map(TransformComponent).get
+    geometries = entity_manager.get_component_map(GeometryComponent)
+    rectangle_type, circle_type = ShapeType.RECTANGLE, ShapeType.CIRCLE
+    ids: List[EntityID] = []
+    centers_and_half_extents: List[Tuple[float, float, float, float]] = []
+    # Bound once: these run per entity
+    add_id, add_row = ids.append, centers_and_half_extents.append
+    for entity_id, geometry in geometries.items():
+        transform = get_transform(entity_id)
+        if transform is None:
+            continue
+        shape_type = geometry.shape_type
+        if shape_type is rectangle_type:
+            parameters = geometry.parameters
+            half_w = parameters["width"] / 2
+            half_h = parameters["height"] / 2
+        elif shape_type is circle_type:
+            half_w = half_h = geometry.parameters["radius"]
+        else:
+            continue
+        position = transform.position
+        add_id(entity_id)
+        add_row((position.x, position.y, half_w, half_h))
+
+    if not ids:
+        return ids, np.empty((0, 4))
+    data = np.array(centers_and_half_extents, dtype=float)
+    centers, half_extents = data[:, :2], data[:, 2:]
+    return ids, np.hstack((centers - half_extents, centers + half_extents))
+
+
+def _connection_screen_segments(entity_manager: EntityManager,
+                                drawing_widget: 'DrawingWidget') -> Tuple[List[uuid.UUID], List[str], np.ndarray]:
+    """
+    Resolves the screen-space endpoints of every spring and live rod/rope, mapping them to the
+    screen in one vectorized pass. Returns (ids, selection type strings, (N, 4) array of
+    [ax, ay, bx, by]); springs come first, matching the click-priority order.
+    """
+    get_transform = entity_manager.get_component_map(TransformComponent).get
+    ids: List[uuid.UUID] = []
+    kinds: List[str] = []
+    world_endpoints: List[Tuple[float, float, float, float]] = []
+    # Bound once: these run per connection
+    add_id, add_kind, add_endpoints = ids.append, kinds.append, world_endpoints.append
+
+    for spring in entity_manager.get_independent_component_map(SpringComponent).values():
+        if not spring.entity_a_id or not spring.entity_b_id:
+            continue
+        transform_a = get_transform(spring.entity_a_id)
+        transform_b = get_transform(spring.entity_b_id)
+        if transform_a and transform_b:
+            add_id(spring.id)
+            add_kind("SPRING_CONNECTION")
+            add_endpoints(transform_a.world_of(spring.anchor_a.x, spring.anchor_a.y) +
+                                   transform_b.world_of(spring.anchor_b.x, spring.anchor_b.y))
+
+    # Rods, then ropes: the index already excludes broken connections, so there is no per-connection type/liveness test
+    for connection_type, kind in ((ConnectionType.ROD, "CONNECTION_ROD"), (ConnectionType.ROPE, "CONNECTION_ROPE")):
+        for conn_comp in entity_manager.active_connections_by_type(connection_type):
+            transform_a = get_transform(conn_comp.source_entity_id)
+            transform_b = get_transform(conn_comp.target_entity_id)
+            if transform_a and transform_b:
+                add_id(conn_comp.id)
+                add_kind(kind)
+                point_a, point_b = conn_comp.connection_point_a, conn_comp.connection_point_b
+                add_endpoints(transform_a.world_of(point_a.x, point_a.y) +
+                              transform_b.world_of(point_b.x, point_b.y))
+
+    if not ids:
+        return ids, kinds, np.empty((0, 4))
+
+    world = np.array(world_endpoints, dtype=float)
+    screen_ax, screen_ay = drawing_widget.world_to_screen_xy(world[:, 0], world[:, 1])
+    screen_bx, screen_by = drawing_widget.world_to_screen_xy(world[:, 2], world[:, 3])
+    return ids, kinds, np.column_stack((screen_ax, screen_ay, screen_bx, screen_by))
+
+
 class SelectToolHandler(BaseToolHandler):
     """
     处理选择工具的逻辑，包括实体选择、框选和实体拖拽。
@@ -24,12 +126,19 @@ class SelectToolHandler(BaseToolHandler):
         self.is_marqueeing: bool = False
         self.marquee_start_point: QPointF | None = None
         self.marquee_end_point: QPointF | None = None
+        # World-space marquee rect, refreshed on mouse move; shared by paint_overlay and release
+        self._world_marquee_rect: QRectF | None = None
 
         self.is_dragging_entity: bool = False
         self.drag_offset_from_entity_anchor: Vector2D = Vector2D(0, 0)
         self.drag_target_world_position: Vector2D | None = None
         self.current_linkage_group_members: Optional[List[EntityID]] = None # RE-ADD for new linkage logic
         self.primary_dragged_entity_id: Optional[EntityID] = None # To store the entity the user initially clicked
+        # Transforms of the linkage group members, resolved once at press time for the drag loop
+        self._linkage_transforms: List[TransformComponent] = []
+        # Latest drag target from mouse moves; written to the transforms at most once per event-loop pass
+        self._pending_drag_target: Optional[Vector2D] = None
+        self._drag_flush_scheduled: bool = False
 
 
     def activate(self, drawing_widget: 'DrawingWidget'):
@@ -41,22 +150,27 @@ class SelectToolHandler(BaseToolHandler):
         self.is_marqueeing = False
         self.marquee_start_point = None
         self.marquee_end_point = None
+        self._world_marquee_rect = None
         self.is_dragging_entity = False
         self.drag_offset_from_entity_anchor = Vector2D(0, 0)
         self.drag_target_world_position = None
         self.current_linkage_group_members = None # RE-ADD
         self.primary_dragged_entity_id = None
+        self._linkage_transforms = []
         drawing_widget.setCursor(Qt.CursorShape.ArrowCursor)
 
 
     def deactivate(self, drawing_widget: 'DrawingWidget'):
         """工具失活时调用"""
+        self._flush_pending_drag(drawing_widget)
         self.is_marqueeing = False
         self.marquee_start_point = None
         self.marquee_end_point = None
+        self._world_marquee_rect = None
         self.is_dragging_entity = False
         self.current_linkage_group_members = None # RE-ADD
         self.primary_dragged_entity_id = None
+        self._linkage_transforms = []
         drawing_widget.setCursor(Qt.CursorShape.ArrowCursor)
         # Clear any visual remnants if necessary, e.g., if marquee was active
         drawing_widget.update()
@@ -66,60 +180,24 @@ class SelectToolHandler(BaseToolHandler):
         entity_manager: EntityManager = main_window.entity_manager
         self.current_linkage_group_members = None # Reset at the start of any press
         self.primary_dragged_entity_id = None
+        self._linkage_transforms = []
 
         click_pos_screen = event.position()
         click_pos_world = drawing_widget._get_world_coordinates(click_pos_screen)
 
         clicked_on_something = False
 
-        # --- 1. Prioritize Spring Click Detection ---
-        CLICK_THRESHOLD_PIXELS_SQ = 5 * 5
-        all_springs = entity_manager.get_all_independent_components_of_type(SpringComponent)
-        for spring in all_springs:
-            if not spring.entity_a_id or not spring.entity_b_id:
-                continue
-            transform_a = entity_manager.get_component(spring.entity_a_id, TransformComponent)
-            transform_b = entity_manager.get_component(spring.entity_b_id, TransformComponent)
-            if transform_a and transform_b:
-                rotated_anchor_a = spring.anchor_a.rotate(transform_a.angle)
-                rotated_anchor_b = spring.anchor_b.rotate(transform_b.angle)
-                world_anchor_a = transform_a.position + rotated_anchor_a
-                world_anchor_b = transform_b.position + rotated_anchor_b
-                screen_anchor_a = drawing_widget.world_to_screen(world_anchor_a)
-                screen_anchor_b = drawing_widget.world_to_screen(world_anchor_b)
-                dist_sq = drawing_widget._point_segment_distance_sq(click_pos_screen, screen_anchor_a, screen_anchor_b)
-                if dist_sq < CLICK_THRESHOLD_PIXELS_SQ:
-                    main_window.set_single_selected_object("SPRING_CONNECTION", spring.id)
-                    clicked_on_something = True
-                    drawing_widget.update()
-                    return
-
-        # --- 2. Connection (Rod/Rope) Click Detection ---
-        if not clicked_on_something:
-            all_connections = entity_manager.get_all_independent_components_of_type(ConnectionComponent)
-            for conn_comp in all_connections:
-                if conn_comp.is_broken: continue
-                if conn_comp.connection_type == ConnectionType.ROD or conn_comp.connection_type == ConnectionType.ROPE: # Use Enum
-                    entity_a_id = conn_comp.source_entity_id
-                    entity_b_id = conn_comp.target_entity_id
-                    transform_a = entity_manager.get_component(entity_a_id, TransformComponent)
-                    transform_b = entity_manager.get_component(entity_b_id, TransformComponent)
-                    if transform_a and transform_b:
-                        angle_a_rad = transform_a.angle
-                        angle_b_rad = transform_b.angle
-                        rotated_anchor_a = conn_comp.connection_point_a.rotate(angle_a_rad)
-                        rotated_anchor_b = conn_comp.connection_point_b.rotate(angle_b_rad)
-                        world_anchor_a = transform_a.position + rotated_anchor_a
-                        world_anchor_b = transform_b.position + rotated_anchor_b
-                        screen_anchor_a = drawing_widget.world_to_screen(world_anchor_a)
-                        screen_anchor_b = drawing_widget.world_to_screen(world_anchor_b)
-                        dist_sq = drawing_widget._point_segment_distance_sq(click_pos_screen, screen_anchor_a, screen_anchor_b)
-                        if dist_sq < CLICK_THRESHOLD_PIXELS_SQ:
-                            selected_type_str = "CONNECTION_ROD" if conn_comp.connection_type == ConnectionType.ROD else "CONNECTION_ROPE" # Use Enum
-                            main_window.set_single_selected_object(selected_type_str, conn_comp.id)
-                            clicked_on_something = True
-                            drawing_widget.update()
-                            return
+        # --- 1./2. Spring, then Connection (Rod/Rope) Click Detection ---
+        # Screen endpoints are resolved in one batch; springs come first so they keep click priority.
+        CLICK_THRESHOLD_PIXELS = 5
+        connection_ids, connection_kinds, segments = _connection_screen_segments(entity_manager, drawing_widget)
+        if connection_ids:
+            i = hit_segment(click_pos_screen.x(), click_pos_screen.y(), segments, CLICK_THRESHOLD_PIXELS)
+            if i >= 0: # First hit in priority order (springs before rods/ropes)
+                main_window.set_single_selected_object(connection_kinds[i], connection_ids[i])
+                clicked_on_something = True
+                drawing_widget.update()
+                return
         
         # --- 3. Entity Click Detection ---
         if not clicked_on_something:
@@ -129,49 +207,28 @@ class SelectToolHandler(BaseToolHandler):
                 clicked_on_something = True # Record that something was interacted with
 
                 # Start dragging this newly selected (or re-selected) entity
-                selected_transform = entity_manager.get_component(hit_entity_id, TransformComponent)
+                transforms = entity_manager.get_component_map(TransformComponent)
+                selected_transform = transforms.get(hit_entity_id)
                 if selected_transform:
                     self.is_dragging_entity = True
                     self.primary_dragged_entity_id = hit_entity_id
                     self.drag_offset_from_entity_anchor = selected_transform.position - click_pos_world
                     self.drag_target_world_position = selected_transform.position
 
-                    # Build linkage group using BFS to find all connected entities via REVOLUTE_JOINT
-                    # This will find the entire connected component of the rigid body structure.
-                    if hit_entity_id: # Ensure hit_entity_id is not None
-                        linkage_members_set: Set[EntityID] = set()
-                        queue: List[EntityID] = [hit_entity_id]
-                        visited_for_linkage: Set[EntityID] = {hit_entity_id}
-                        
-                        all_connections = entity_manager.get_all_independent_components_of_type(ConnectionComponent)
-                        
-                        head = 0
-                        while head < len(queue):
-                            current_entity_in_bfs = queue[head]
-                            head += 1
-                            linkage_members_set.add(current_entity_in_bfs)
-
-                            for conn in all_connections:
-                                if conn.connection_type == ConnectionType.REVOLUTE_JOINT and not conn.is_broken:
-                                    partner_entity_id: Optional[EntityID] = None
-                                    if conn.source_entity_id == current_entity_in_bfs:
-                                        partner_entity_id = conn.target_entity_id
-                                    elif conn.target_entity_id == current_entity_in_bfs:
-                                        partner_entity_id = conn.source_entity_id
-                                    
-                                    if partner_entity_id and partner_entity_id not in visited_for_linkage:
-                                        visited_for_linkage.add(partner_entity_id)
-                                        queue.append(partner_entity_id)
-                        
-                        if len(linkage_members_set) > 0: # Check if any members were found (should include at least hit_entity_id)
-                            self.current_linkage_group_members = list(linkage_members_set)
-                            if len(self.current_linkage_group_members) > 1:
-                                print(f"Editor drag: Full revolute joint linkage group: {self.current_linkage_group_members}")
-                        else:
-                            self.current_linkage_group_members = None
+                    # Linkage group: every entity connected to the hit entity via REVOLUTE_JOINTs,
+                    # i.e. the entire connected component of the rigid body structure (from the cached DSU).
+                    linkage = entity_manager.get_revolute_linkage()
+                    if hit_entity_id not in linkage:
+                        # Common case: a free body with no revolute joints drags alone
+                        self.current_linkage_group_members = [hit_entity_id]
+                        self._linkage_transforms = [selected_transform]
                     else:
-                        self.current_linkage_group_members = None
-
+                        self.current_linkage_group_members = linkage.members_of(hit_entity_id)
+                        logger.debug("Editor drag: linkage group size=%d", len(self.current_linkage_group_members))
+                        get_transform = transforms.get
+                        self._linkage_transforms = [member_transform for member_transform in
+                                                    map(get_transform, self.current_linkage_group_members)
+                                                    if member_transform]
 
                     drawing_widget.setCursor(Qt.CursorShape.SizeAllCursor)
             else:
@@ -179,14 +236,13 @@ class SelectToolHandler(BaseToolHandler):
                 self.is_marqueeing = True
                 self.marquee_start_point = click_pos_screen
                 self.marquee_end_point = click_pos_screen # Initialize end point
+                self._world_marquee_rect = None
                 main_window.clear_selection() # Clear previous selection when starting marquee
                 # clicked_on_something remains False
         drawing_widget.update() # Update view for selection change or marquee start
 
 
     def handle_mouse_move(self, event, drawing_widget: 'DrawingWidget'):
-        main_window: 'MainWindow' = drawing_widget.window()
-        entity_manager: EntityManager = main_window.entity_manager
         current_pos_screen = event.position()
         # It's important that current_mouse_world_pos is updated in DrawingWidget itself
         # This handler can read it if needed, but should not be solely responsible for setting it globally.
@@ -195,168 +251,110 @@ class SelectToolHandler(BaseToolHandler):
 
         if self.is_marqueeing:
             self.marquee_end_point = current_pos_screen
-            drawing_widget.update()
+            self._update_world_marquee_rect(drawing_widget)
+            drawing_widget.schedule_update()
         elif self.is_dragging_entity and self.primary_dragged_entity_id:
-            # Calculate the primary dragged entity's new potential position
-            primary_entity_current_transform = entity_manager.get_component(self.primary_dragged_entity_id, TransformComponent)
-            if not primary_entity_current_transform:
-                self.is_dragging_entity = False # Should not happen if drag started
-                return
-
-            new_primary_target_pos = current_pos_world + self.drag_offset_from_entity_anchor
-            delta_drag_world = new_primary_target_pos - primary_entity_current_transform.position
+            # Only record the target here; mouse moves can arrive much faster than frames,
+            # so the transform writes and the repaint are coalesced into _flush_pending_drag.
+            self._pending_drag_target = current_pos_world + self.drag_offset_from_entity_anchor
+            if not self._drag_flush_scheduled:
+                self._drag_flush_scheduled = True
+                QTimer.singleShot(0, functools.partial(self._flush_pending_drag, drawing_widget))
+
+
+    def _flush_pending_drag(self, drawing_widget: 'DrawingWidget'):
+        """Applies the latest pending drag target to the dragged entity (and its linkage group)."""
+        self._drag_flush_scheduled = False
+        new_primary_target_pos = self._pending_drag_target
+        self._pending_drag_target = None
+        if new_primary_target_pos is None or not self.is_dragging_entity or not self.primary_dragged_entity_id:
+            return
 
-            if self.current_linkage_group_members and len(self.current_linkage_group_members) > 0 : # Ensure primary is in it or it's not None
-                # Move all members of the linkage group by the same delta
-                for member_id in self.current_linkage_group_members:
-                    member_transform = entity_manager.get_component(member_id, TransformComponent)
-                    if member_transform:
-                        member_transform.position += delta_drag_world
-                
-                # Update the drag_target_world_position to reflect the primary entity's NEW position
-                updated_primary_transform = entity_manager.get_component(self.primary_dragged_entity_id, TransformComponent)
-                if updated_primary_transform:
-                    self.drag_target_world_position = updated_primary_transform.position
-                else:
-                    self.drag_target_world_position = new_primary_target_pos
-            else:
-                # Single entity drag
-                primary_entity_current_transform.position = new_primary_target_pos
-                self.drag_target_world_position = new_primary_target_pos
-            
-            drawing_widget.update()
-        # No explicit update here, relies on DrawingWidget's general update for mouse move if needed for other things like snap points.
-        # However, for marquee and drag, direct updates are better.
+        main_window: 'MainWindow' = drawing_widget.window()
+        primary_entity_current_transform = main_window.entity_manager.get_component(self.primary_dragged_entity_id, TransformComponent)
+        if not primary_entity_current_transform:
+            self.is_dragging_entity = False # Should not happen if drag started
+            return
 
+        if len(self._linkage_transforms) > 1:
+            # Move all members of the linkage group by the same delta, using the transforms resolved on press.
+            # Positions are replaced (not mutated in place) as before, since other code may hold the old vectors.
+            primary_position = primary_entity_current_transform.position
+            delta_x = new_primary_target_pos.x - primary_position.x
+            delta_y = new_primary_target_pos.y - primary_position.y
+            vec = Vector2D
+            for member_transform in self._linkage_transforms:
+                member_position = member_transform.position
+                member_transform.position = vec(member_position.x + delta_x, member_position.y + delta_y)
+
+            # Update the drag_target_world_position to reflect the primary entity's NEW position
+            self.drag_target_world_position = primary_entity_current_transform.position
+        else:
+            # Single entity drag
+            primary_entity_current_transform.position = new_primary_target_pos
+            self.drag_target_world_position = new_primary_target_pos
+
+        drawing_widget.schedule_update()
+
+    def _update_world_marquee_rect(self, drawing_widget: 'DrawingWidget') -> QRectF:
+        """Converts the screen marquee corners to a normalized world-space rect and caches it."""
+        world_start = drawing_widget._get_world_coordinates(self.marquee_start_point)
+        world_end = drawing_widget._get_world_coordinates(self.marquee_end_point)
+        self._world_marquee_rect = QRectF(QPointF(world_start.x, world_start.y),
+                                          QPointF(world_end.x, world_end.y)).normalized()
+        return self._world_marquee_rect
 
     def handle_mouse_release(self, event, drawing_widget: 'DrawingWidget'):
         main_window: 'MainWindow' = drawing_widget.window()
 
         if self.is_marqueeing:
             self.is_marqueeing = False
-            if self.marquee_start_point and self.marquee_end_point:
-                # Convert screen marquee points to world for selection logic
-                world_marquee_start_vec = drawing_widget._get_world_coordinates(self.marquee_start_point)
-                world_marquee_end_vec = drawing_widget._get_world_coordinates(self.marquee_end_point)
-                
-                # Convert Vector2D to QPointF for QRectF constructor
-                world_marquee_start_qpoint = QPointF(world_marquee_start_vec.x, world_marquee_start_vec.y)
-                world_marquee_end_qpoint = QPointF(world_marquee_end_vec.x, world_marquee_end_vec.y)
-                
-                marquee_rect_world = QRectF(world_marquee_start_qpoint, world_marquee_end_qpoint).normalized()
-                # Create marquee_rect_screen from the original screen points for line intersection checks
-                marquee_rect_screen = QRectF(self.marquee_start_point, self.marquee_end_point).normalized()
-                marquee_edges = [
-                    QLineF(marquee_rect_screen.topLeft(), marquee_rect_screen.topRight()),
-                    QLineF(marquee_rect_screen.topRight(), marquee_rect_screen.bottomRight()),
-                    QLineF(marquee_rect_screen.bottomRight(), marquee_rect_screen.bottomLeft()),
-                    QLineF(marquee_rect_screen.bottomLeft(), marquee_rect_screen.topLeft())
-                ]
+            # A release within a couple of pixels of the press is a click on empty space, not a marquee:
+            # skip the selection passes entirely (the selection was already cleared on press).
+            if self.marquee_start_point and self.marquee_end_point and \
+               _squared_distance(self.marquee_start_point, self.marquee_end_point) >= MARQUEE_MIN_DRAG_PIXELS_SQ:
+                # Marquee bounds as plain floats, computed once: screen rect from the raw points,
+                # world rect from their world-space conversion (no QRectF/QPointF round trips).
+                s_x0, s_x1 = sorted((self.marquee_start_point.x(), self.marquee_end_point.x()))
+                s_y0, s_y1 = sorted((self.marquee_start_point.y(), self.marquee_end_point.y()))
+                marquee_rect_world = self._world_marquee_rect or self._update_world_marquee_rect(drawing_widget)
+                m_x0, m_x1 = marquee_rect_world.left(), marquee_rect_world.right()
+                m_y0, m_y1 = marquee_rect_world.top(), marquee_rect_world.bottom()
 
                 selected_entities_in_marquee = set()
                 selected_connections_in_marquee = set()
 
-                # Entity Selection Logic (Simplified AABB check in world coordinates)
-                for entity_id in main_window.entity_manager.entities:
-                    transform = main_window.entity_manager.get_component(entity_id, TransformComponent)
-                    geometry = main_window.entity_manager.get_component(entity_id, GeometryComponent)
-                    if transform and geometry:
-                        # Simple bounding box check for now
-                        entity_rect_world = QRectF() # This will be AABB in world space
-                        if geometry.shape_type == ShapeType.RECTANGLE:
-                            params = geometry.parameters
-                            # For AABB of a potentially rotated rect, we need to find min/max x/y of its corners
-                            # This is more complex. For simplicity, using AABB of non-rotated shape at its position.
-                            # This is what the original code did.
-                            half_width = params["width"] / 2
-                            half_height = params["height"] / 2
-                            entity_world_pos = transform.position
-                            entity_rect_world.setRect(entity_world_pos.x - half_width, entity_world_pos.y - half_height, params["width"], params["height"])
-                        elif geometry.shape_type == ShapeType.CIRCLE:
-                            params = geometry.parameters
-                            radius = params["radius"]
-                            entity_world_pos = transform.position
-                            entity_rect_world.setRect(entity_world_pos.x - radius, entity_world_pos.y - radius, 2 * radius, 2 * radius)
-                        
-                        if marquee_rect_world.intersects(entity_rect_world) or marquee_rect_world.contains(entity_rect_world):
-                            selected_entities_in_marquee.add(entity_id)
-
-                # Connection Selection Logic (Springs, Rods, Ropes) - uses screen coordinates for intersection
-                # Springs
-                all_springs = main_window.entity_manager.get_all_independent_components_of_type(SpringComponent)
-                for spring in all_springs:
-                    if not spring.entity_a_id or not spring.entity_b_id: continue
-                    transform_a = main_window.entity_manager.get_component(spring.entity_a_id, TransformComponent)
-                    transform_b = main_window.entity_manager.get_component(spring.entity_b_id, TransformComponent)
-                    if transform_a and transform_b:
-                        rotated_anchor_a = spring.anchor_a.rotate(transform_a.angle)
-                        world_anchor_a = transform_a.position + rotated_anchor_a
-                        screen_anchor_a = drawing_widget.world_to_screen(world_anchor_a)
-                        
-                        rotated_anchor_b = spring.anchor_b.rotate(transform_b.angle)
-                        world_anchor_b = transform_b.position + rotated_anchor_b
-                        screen_anchor_b = drawing_widget.world_to_screen(world_anchor_b)
-                        
-                        connection_line = QLineF(screen_anchor_a, screen_anchor_b)
-                        endpoints_in_marquee = marquee_rect_screen.contains(screen_anchor_a) and marquee_rect_screen.contains(screen_anchor_b)
-                        intersects_marquee = False
-                        # marquee_edges is now defined above
-                        for edge in marquee_edges:
-                            # intersection_type, _ = connection_line.intersects(edge) # Qt6
-                            intersection_result = connection_line.intersects(edge) # Qt6 returns QLineF.IntersectionType or similar enum
-                            if intersection_result == QLineF.IntersectionType.BoundedIntersection: # Check specific enum member
-                                intersects_marquee = True
-                                break
-                        connection_bounding_rect = QRectF(screen_anchor_a, screen_anchor_b).normalized()
-                        marquee_contains_connection_bbox = marquee_rect_screen.contains(connection_bounding_rect)
-                        # Simplified condition from original code for brevity
-                        if endpoints_in_marquee or intersects_marquee or marquee_contains_connection_bbox or marquee_rect_screen.intersects(connection_bounding_rect):
-                            selected_connections_in_marquee.add(spring.id)
-
-                # Rods and Ropes
-                all_connections = main_window.entity_manager.get_all_independent_components_of_type(ConnectionComponent)
-                for conn_comp in all_connections:
-                    if conn_comp.is_broken: continue
-                    if conn_comp.connection_type == ConnectionType.ROD or conn_comp.connection_type == ConnectionType.ROPE: # Use Enum
-                        entity_a_id = conn_comp.source_entity_id
-                        entity_b_id = conn_comp.target_entity_id
-                        transform_a = main_window.entity_manager.get_component(entity_a_id, TransformComponent)
-                        transform_b = main_window.entity_manager.get_component(entity_b_id, TransformComponent)
-                        if transform_a and transform_b:
-                            rotated_anchor_a = conn_comp.connection_point_a.rotate(transform_a.angle)
-                            world_anchor_a = transform_a.position + rotated_anchor_a
-                            screen_anchor_a = drawing_widget.world_to_screen(world_anchor_a)
-
-                            rotated_anchor_b = conn_comp.connection_point_b.rotate(transform_b.angle)
-                            world_anchor_b = transform_b.position + rotated_anchor_b
-                            screen_anchor_b = drawing_widget.world_to_screen(world_anchor_b)
-                            
-                            connection_line = QLineF(screen_anchor_a, screen_anchor_b)
-                            endpoints_in_marquee = marquee_rect_screen.contains(screen_anchor_a) and marquee_rect_screen.contains(screen_anchor_b)
-                            intersects_marquee = False
-                            # (Re-use marquee_edges from above)
-                            for edge in marquee_edges:
-                                intersection_result = connection_line.intersects(edge)
-                                if intersection_result == QLineF.IntersectionType.BoundedIntersection:
-                                    intersects_marquee = True
-                                    break
-                            connection_bounding_rect = QRectF(screen_anchor_a, screen_anchor_b).normalized()
-                            marquee_contains_connection_bbox = marquee_rect_screen.contains(connection_bounding_rect)
-                            
-                            if endpoints_in_marquee or intersects_marquee or marquee_contains_connection_bbox or marquee_rect_screen.intersects(connection_bounding_rect):
-                                selected_connections_in_marquee.add(conn_comp.id)
+                # Entity Selection Logic (Simplified AABB check in world coordinates), vectorized over all entities
+                # Mirrors QRectF.intersects: a zero-width/height marquee hits nothing, and touching edges do not count.
+                if m_x0 < m_x1 and m_y0 < m_y1:
+                    entity_ids, entity_aabbs = _entity_world_aabbs(main_window.entity_manager)
+                    if entity_ids:
+                        hit_indices = aabbs_overlapping_rect(entity_aabbs, m_x0, m_y0, m_x1, m_y1)
+                        selected_entities_in_marquee.update(entity_ids[i] for i in hit_indices.tolist())
+
+                # Connection Selection Logic (Springs, Rods, Ropes) - uses screen coordinates for intersection.
+                # Endpoints are resolved and clipped against the marquee in batched passes.
+                connection_ids, _, segments = _connection_screen_segments(main_window.entity_manager, drawing_widget)
+
+                if connection_ids and s_x0 < s_x1 and s_y0 < s_y1:
+                    hit_indices = segments_in_rect(segments, s_x0, s_y0, s_x1, s_y1)
+                    selected_connections_in_marquee.update(connection_ids[i] for i in hit_indices.tolist())
                 
                 main_window.set_marquee_selection(selected_entities_in_marquee, selected_connections_in_marquee)
 
             self.marquee_start_point = None
             self.marquee_end_point = None
+            self._world_marquee_rect = None
             drawing_widget.update()
 
         elif self.is_dragging_entity:
+            # Apply the last move before ending the drag so the entity lands exactly under the cursor
+            self._flush_pending_drag(drawing_widget)
             self.is_dragging_entity = False
             self.drag_target_world_position = None
             self.current_linkage_group_members = None # Clear linkage group on release
             self.primary_dragged_entity_id = None
+            self._linkage_transforms = []
             drawing_widget.setCursor(Qt.CursorShape.ArrowCursor)
             # The actual position of the entity should have been updated during mouse_move.
             # MainWindow's simulation_step will handle pinning if necessary.
@@ -366,16 +364,9 @@ class SelectToolHandler(BaseToolHandler):
     def paint_overlay(self, painter: QPainter, drawing_widget: 'DrawingWidget'):
         # This method is called by DrawingWidget.paintEvent *after* the painter has been transformed
         # to world coordinates with Y-up. So, drawing should use world coordinates.
-        if self.is_marqueeing and self.marquee_start_point and self.marquee_end_point:
-            # Convert screen marquee points to world for drawing with transformed painter
-            world_marquee_start_vec = drawing_widget._get_world_coordinates(self.marquee_start_point)
-            world_marquee_end_vec = drawing_widget._get_world_coordinates(self.marquee_end_point)
-            
-            world_marquee_start_qpoint = QPointF(world_marquee_start_vec.x, world_marquee_start_vec.y)
-            world_marquee_end_qpoint = QPointF(world_marquee_end_vec.x, world_marquee_end_vec.y)
-            
-            marquee_rect_world = QRectF(world_marquee_start_qpoint, world_marquee_end_qpoint).normalized()
-            
+        marquee_rect_world = self._world_marquee_rect
+        if self.is_marqueeing and marquee_rect_world is not None:
+            # World-space rect was converted once in handle_mouse_move; the painter is already in world coordinates
             painter.setPen(QPen(QColor(0, 100, 255, 150), 1.0 / drawing_widget.pixels_per_world_unit, Qt.PenStyle.SolidLine))
             painter.setBrush(QColor(0, 100, 255, 50)) # Light blue, very transparent fill
             painter.drawRect(marquee_rect_world)
\ No newline at end of file
@@ -26,6 +26,7 @@ import os # For path manipulation in window title
 import uuid # Added for UUID generation and comparison
 import math # Added for scale bar calculations
 import json # Added for JSONDecodeError
+import logging
 from physi_sim.core.utils import is_point_inside_polygon # Added for polygon point checking
 
 # Tool Handlers
@@ -51,6 +52,8 @@ from physi_sim.graphics.ui_handlers.scene_file_handler import SceneFileHandler
 from physi_sim.graphics.ui_handlers.simulation_control_handler import SimulationControlHandler
 from physi_sim.graphics.ui_handlers.view_control_handler import ViewControlHandler
 
+logger = logging.getLogger(__name__)
+
 
 class ToolMode(Enum):
     SELECT = auto()
@@ -86,6 +89,10 @@ class DrawingWidget(QWidget):
         self.DEFAULT_PIXELS_PER_WORLD_UNIT: float = 75.0
         self.pixels_per_world_unit: float = self.DEFAULT_PIXELS_PER_WORLD_UNIT
         self.view_offset: Vector2D = Vector2D(0, 0)
+        # Inverse scale used by _get_world_coordinates, recomputed only when the zoom changes.
+        # view_offset is mutated in place in several places, so it is read live rather than cached.
+        self._inverse_scale_ppwu: float = self.pixels_per_world_unit
+        self._world_units_per_pixel: float = 1.0 / self.pixels_per_world_unit
 
         # Keyboard pan speed
         self.PAN_SPEED_PIXELS: float = 20.0
@@ -94,6 +101,10 @@ class DrawingWidget(QWidget):
         self.ZOOM_FACTOR_STEP: float = 1.1
         self._MIN_SCALE_EPSILON = 1e-9
 
+        # Coalesced repaint scheduling for high-rate input (see schedule_update)
+        self.UPDATE_COALESCE_INTERVAL_MS: int = 8 # ~120 Hz upper bound on mouse-move driven repaints
+        self._update_pending: bool = False
+
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.setMouseTracking(True)
 
@@ -144,14 +155,34 @@ class DrawingWidget(QWidget):
         super().resizeEvent(event)
         self.update()
 
+    def schedule_update(self):
+        """
+        Requests a repaint, coalescing bursts of requests (e.g. 1000 Hz mouse moves) into
+        at most one repaint per UPDATE_COALESCE_INTERVAL_MS.
+        """
+        if self._update_pending:
+            return
+        self._update_pending = True
+        QTimer.singleShot(self.UPDATE_COALESCE_INTERVAL_MS, self._flush_scheduled_update)
+
+    def _flush_scheduled_update(self):
+        self._update_pending = False
+        self.update()
+
     def _get_world_coordinates(self, screen_pos: QPointF) -> Vector2D:
         """Converts screen QPointF coordinates to world Vector2D coordinates."""
         # screen_x = (world_x - view_offset.x) * scale_x + widget_center_x
         # screen_y = (world_y - view_offset.y) * scale_y + widget_center_y  (where scale_y is negative)
         
-        world_x = (screen_pos.x() - self._widget_center_x) / self.pixels_per_world_unit + self.view_offset.x
+        if self.pixels_per_world_unit != self._inverse_scale_ppwu:
+            self._inverse_scale_ppwu = self.pixels_per_world_unit
+            self._world_units_per_pixel = 1.0 / self.pixels_per_world_unit
+        inv_scale = self._world_units_per_pixel
+        view_offset = self.view_offset
+
+        world_x = (screen_pos.x() - self._widget_center_x) * inv_scale + view_offset.x
         # Invert Y calculation for Y-up world coordinates
-        world_y = (screen_pos.y() - self._widget_center_y) / (-self.pixels_per_world_unit) + self.view_offset.y
+        world_y = (self._widget_center_y - screen_pos.y()) * inv_scale + view_offset.y
         return Vector2D(world_x, world_y)
 
     def world_to_screen(self, world_pos: Vector2D) -> QPointF:
@@ -161,6 +192,16 @@ class DrawingWidget(QWidget):
         screen_y = (world_pos.y - self.view_offset.y) * (-self.pixels_per_world_unit) + self._widget_center_y
         return QPointF(screen_x, screen_y)
 
+    def world_to_screen_xy(self, world_x, world_y):
+        """
+        Same mapping as world_to_screen, on raw coordinates. Works element-wise on floats or NumPy
+        arrays and returns (screen_x, screen_y) without building QPointF objects.
+        """
+        ppwu = self.pixels_per_world_unit
+        screen_x = (world_x - self.view_offset.x) * ppwu + self._widget_center_x
+        screen_y = (world_y - self.view_offset.y) * (-ppwu) + self._widget_center_y
+        return screen_x, screen_y
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing) # Enable Antialiasing
@@ -543,7 +584,7 @@ class DrawingWidget(QWidget):
             super().mouseMoveEvent(event)
         
         # General update for things like snap points that are not tool-specific overlays
-        self.update()
+        self.schedule_update()
 
     def leaveEvent(self, event: QEvent): # QEvent, not QMouseEvent
         """Called when the mouse cursor leaves the widget."""
@@ -873,12 +914,7 @@ class MainWindow(QMainWindow):
         self.spring_first_entity_click_pos_world: Optional[Vector2D] = None # For FREE_POSITION mode
         self.spring_second_entity_click_pos_world: Optional[Vector2D] = None # For FREE_POSITION mode
 
-        # Rod creation state
-        self.rod_creation_phase: int = 0
-        self.rod_first_entity_id: Optional[uuid.UUID] = None
-        self.rod_second_entity_id: Optional[uuid.UUID] = None
-        self.rod_first_entity_click_pos_world: Optional[Vector2D] = None
-        self.rod_second_entity_click_pos_world: Optional[Vector2D] = None
+        # Rod creation state lives on RodToolHandler; see the rod_* properties below
 
         # Rope creation state
         self.rope_creation_phase: int = 0
@@ -886,9 +922,7 @@ class MainWindow(QMainWindow):
         self.rope_second_entity_id: Optional[uuid.UUID] = None
         self.rope_first_entity_click_pos_world: Optional[Vector2D] = None
         self.rope_second_entity_click_pos_world: Optional[Vector2D] = None
-        self.rod_pending_selection_id: Optional[uuid.UUID] = None # For highlighting entity A during rod draw
         self.rope_pending_selection_id: Optional[uuid.UUID] = None # For highlighting entity A during rope draw
-        self.rod_second_pending_selection_id: Optional[uuid.UUID] = None # For highlighting entity B during rod draw
         self.rope_second_pending_selection_id: Optional[uuid.UUID] = None # For highlighting entity B during rope draw
 
         # Snap threshold for connection points (in screen pixels squared for distance comparison)
@@ -1530,6 +1564,55 @@ class MainWindow(QMainWindow):
         self.pause_resume_action.triggered.connect(self.simulation_control_handler.toggle_pause_resume) # Connect to handler
         toolbar.addAction(self.pause_resume_action)
 
+    def _active_tool_handler(self) -> Optional[BaseToolHandler]:
+        drawing_widget = getattr(self, 'drawing_widget', None)
+        if drawing_widget is None:
+            return None
+        return drawing_widget.tool_handlers.get(self.current_tool_mode)
+
+    # --- Rod creation state, read through from the active tool handler (single source of truth) ---
+    @property
+    def rod_creation_phase(self) -> int:
+        return getattr(self._active_tool_handler(), 'rod_creation_phase', 0)
+
+    @property
+    def rod_first_entity_id(self) -> Optional[uuid.UUID]:
+        return getattr(self._active_tool_handler(), 'rod_first_entity_id', None)
+
+    @property
+    def rod_second_entity_id(self) -> Optional[uuid.UUID]:
+        return getattr(self._active_tool_handler(), 'rod_second_entity_id', None)
+
+    @property
+    def rod_first_entity_click_pos_world(self) -> Optional[Vector2D]:
+        return getattr(self._active_tool_handler(), 'rod_first_entity_click_pos_world', None)
+
+    @property
+    def rod_second_entity_click_pos_world(self) -> Optional[Vector2D]:
+        return getattr(self._active_tool_handler(), 'rod_second_entity_click_pos_world', None)
+
+    # Other tools (connect-to-axis, revolute joint) also write these as highlight slots, but the renderer only
+    # reads them in DRAW_ROD, so writes are forwarded to the rod handler only and dropped otherwise.
+    @property
+    def rod_pending_selection_id(self) -> Optional[uuid.UUID]:
+        return getattr(self._active_tool_handler(), 'rod_pending_selection_id', None)
+
+    @rod_pending_selection_id.setter
+    def rod_pending_selection_id(self, value: Optional[uuid.UUID]):
+        handler = self._active_tool_handler()
+        if isinstance(handler, RodToolHandler):
+            handler.rod_pending_selection_id = value
+
+    @property
+    def rod_second_pending_selection_id(self) -> Optional[uuid.UUID]:
+        return getattr(self._active_tool_handler(), 'rod_second_pending_selection_id', None)
+
+    @rod_second_pending_selection_id.setter
+    def rod_second_pending_selection_id(self, value: Optional[uuid.UUID]):
+        handler = self._active_tool_handler()
+        if isinstance(handler, RodToolHandler):
+            handler.rod_second_pending_selection_id = value
+
     def _set_tool_mode(self, mode: ToolMode):
         if self.current_tool_mode == mode: # No change if clicking the active tool again
             return
@@ -1670,6 +1753,12 @@ class MainWindow(QMainWindow):
             geometry = self.entity_manager.get_component(entity_id_candidate, GeometryComponent)
             if transform and geometry:
                 # print(f"    Entity {str(entity_id_candidate)[:8]} has Transform and Geometry.")
+                # Broad phase: reject entities whose bounding circle does not contain the point before the exact test
+                bounding_radius = geometry.get_bounding_radius()
+                dx = world_pos.x - transform.position.x
+                dy = world_pos.y - transform.position.y
+                if dx * dx + dy * dy > bounding_radius * bounding_radius:
+                    continue
                 if geometry.shape_type == ShapeType.RECTANGLE:
                     rect_params = geometry.parameters
                     half_width = rect_params["width"] / 2.0
@@ -1680,9 +1769,10 @@ class MainWindow(QMainWindow):
                     vec_to_click_world = world_pos - transform.position
                     
                     # 2. Rotate this vector by the negative of the rectangle's angle
-                    # transform.angle is in radians
-                    click_local_x = vec_to_click_world.x * math.cos(-transform.angle) - vec_to_click_world.y * math.sin(-transform.angle)
-                    click_local_y = vec_to_click_world.x * math.sin(-transform.angle) + vec_to_click_world.y * math.cos(-transform.angle)
+                    # (cos(-a) = cos(a), sin(-a) = -sin(a); trig is cached on the transform)
+                    cos_a, sin_a = transform.rotation()
+                    click_local_x = vec_to_click_world.x * cos_a + vec_to_click_world.y * sin_a
+                    click_local_y = -vec_to_click_world.x * sin_a + vec_to_click_world.y * cos_a
                     
                     # 3. Check if the local click point is within the rectangle's half-dimensions
                     if -half_width <= click_local_x <= half_width and \
@@ -1703,7 +1793,7 @@ class MainWindow(QMainWindow):
                         continue # Not a valid polygon for hit-testing
 
                     # Transform local vertices to world coordinates
-                    world_vertices = [transform.position + lv.rotate(transform.angle) for lv in local_vertices]
+                    world_vertices = [Vector2D(*transform.world_of(lv.x, lv.y)) for lv in local_vertices]
                     
                     if is_point_inside_polygon(world_pos, world_vertices):
                         # print(f"    HIT on POLYGON: {str(entity_id_candidate)[:8]}")
@@ -1759,41 +1849,74 @@ class MainWindow(QMainWindow):
             return world_click_pos 
 
         if is_snap_active:
-            local_snap_points = entity_geom.get_local_snap_points()
-            if not local_snap_points:
-                return world_click_pos # No snap points defined
-
-            closest_world_snap_point = None
-            min_dist_sq = float('inf')
-            print(f"Determining anchor for entity {entity_id}, click_world: {world_click_pos}, snap_active: {is_snap_active}")
-            print(f"  Snap threshold sq: {self.SNAP_THRESHOLD_PIXELS_SQ}")
-
-            for i, local_sp in enumerate(local_snap_points):
-                world_sp = entity_transform.position + local_sp.rotate(entity_transform.angle)
-                
-                screen_click_pos = self.drawing_widget.world_to_screen(world_click_pos)
-                screen_sp_vis = self.drawing_widget.world_to_screen(world_sp) # For visualization/debug
-                
-                dist_sq = (screen_click_pos.x() - screen_sp_vis.x())**2 + (screen_click_pos.y() - screen_sp_vis.y())**2
-                print(f"  Snap point {i}: local={local_sp}, world={world_sp}, screen={screen_sp_vis}, dist_sq_pixels={dist_sq:.2f}")
-                
-                if dist_sq < min_dist_sq:
-                    min_dist_sq = dist_sq
-                    closest_world_snap_point = world_sp
-            
-            print(f"  Closest snap point: {closest_world_snap_point}, min_dist_sq_pixels: {min_dist_sq:.2f}")
-            if closest_world_snap_point and min_dist_sq < self.SNAP_THRESHOLD_PIXELS_SQ:
-                print(f"  Snapped to point: {closest_world_snap_point}")
-                return closest_world_snap_point # Return the world coordinates of the snapped point
-            else:
-                # No snap point close enough, or no snap points
-                print(f"No snap, using click pos: {world_click_pos} (min_dist_sq_pixels: {min_dist_sq:.2f})")
-                return world_click_pos
+            snapped = self._find_snap_point(entity_id, entity_transform, entity_geom, world_click_pos)
+            if snapped is not None:
+                return snapped[0] # Return the world coordinates of the snapped point
+            return world_click_pos
         else:
             # Snap is not active, use the precise click position
-            print(f"Snap inactive, using click pos: {world_click_pos}")
+            logger.debug("Snap inactive, using click pos: %s", world_click_pos)
             return world_click_pos
 
+    def _determine_anchor_point_with_local(self, entity_id: uuid.UUID, world_click_pos: Vector2D,
+                                           is_snap_active: bool) -> Tuple[Vector2D, Optional[Vector2D]]:
+        """
+        Same as _determine_anchor_point, but also returns the anchor in the entity's local frame.
+        A snapped anchor reuses the snap point's local coordinates directly; otherwise the click is
+        converted with the transform already fetched here. Local is None if the entity has no transform.
+        """
+        entity_transform = self.entity_manager.get_component(entity_id, TransformComponent)
+        if not entity_transform:
+            return world_click_pos, None
+
+        if is_snap_active:
+            entity_geom = self.entity_manager.get_component(entity_id, GeometryComponent)
+            if entity_geom:
+                snapped = self._find_snap_point(entity_id, entity_transform, entity_geom, world_click_pos)
+                if snapped is not None:
+                    return snapped
+
+        local_offset = (world_click_pos - entity_transform.position).rotate(-entity_transform.angle)
+        return world_click_pos, local_offset
+
+    def _find_snap_point(self, entity_id: uuid.UUID, entity_transform: TransformComponent,
+                         entity_geom: GeometryComponent, world_click_pos: Vector2D) -> Optional[Tuple[Vector2D, Vector2D]]:
+        """
+        Returns (world, local) of the entity's snap point closest to world_click_pos, or None if
+        the entity has no snap points or none lies within SNAP_THRESHOLD_PIXELS_SQ on screen.
+        """
+        local_snap_points = entity_geom.get_local_snap_points()
+        if not local_snap_points:
+            return None # No snap points defined
+
+        closest_world_snap_point = None
+        closest_local_snap_point = None
+        min_dist_sq = float('inf')
+        logger.debug("Determining anchor for entity %s, click_world: %s, snap threshold sq: %s",
+                     entity_id, world_click_pos, self.SNAP_THRESHOLD_PIXELS_SQ)
+
+        screen_click_pos = self.drawing_widget.world_to_screen(world_click_pos)
+        for i, local_sp in enumerate(local_snap_points):
+            world_sp = entity_transform.position + local_sp.rotate(entity_transform.angle)
+            
+            screen_sp_vis = self.drawing_widget.world_to_screen(world_sp) # For visualization/debug
+            
+            dist_sq = (screen_click_pos.x() - screen_sp_vis.x())**2 + (screen_click_pos.y() - screen_sp_vis.y())**2
+            logger.debug("  Snap point %d: local=%s, world=%s, screen=%s, dist_sq_pixels=%.2f",
+                         i, local_sp, world_sp, screen_sp_vis, dist_sq)
+            
+            if dist_sq < min_dist_sq:
+                min_dist_sq = dist_sq
+                closest_world_snap_point = world_sp
+                closest_local_snap_point = local_sp
+        
+        if closest_world_snap_point and min_dist_sq < self.SNAP_THRESHOLD_PIXELS_SQ:
+            logger.debug("  Snapped to point: %s (min_dist_sq_pixels: %.2f)", closest_world_snap_point, min_dist_sq)
+            return closest_world_snap_point, closest_local_snap_point
+        # No snap point close enough
+        logger.debug("No snap, using click pos: %s (min_dist_sq_pixels: %.2f)", world_click_pos, min_dist_sq)
+        return None
+
     def _jump_to_time(self):
         target_time_str, ok = QInputDialog.getText(self, "跳转到时间", "请输入目标模拟时间 (秒):", text=f"{self.current_simulation_time:.2f}")
         if not ok or not target_time_str:
@@ -2302,6 +2425,28 @@ class MainWindow(QMainWindow):
                 print(f"错误: 找不到ID为 '{object_id}' 的弹簧组件")
             return # SpringComponent 处理完毕
 
+        # ConnectionComponent (轻杆/轻绳/铰链) 是独立组件，object_id 为连接ID
+        if component_type_name == ConnectionComponent.__name__:
+            conn_component = self.entity_manager.get_independent_component_by_id(object_id, ConnectionComponent)
+            if not conn_component:
+                print(f"错误: 找不到ID为 '{object_id}' 的连接组件")
+                return
+            try:
+                if attribute_name.startswith("parameters."): # e.g. "parameters.target_length"
+                    conn_component.parameters[attribute_name.split(".", 1)[1]] = new_value
+                elif hasattr(conn_component, attribute_name):
+                    setattr(conn_component, attribute_name, new_value)
+                else:
+                    print(f"错误: 连接组件 (ID: {object_id}) 没有属性 '{attribute_name}'")
+                    return
+                # Edited in place (e.g. is_broken), so the cached connection views must be rebuilt
+                self.entity_manager.invalidate_connection_index()
+                print(f"连接属性已更新: ConnectionID={object_id}.{attribute_name} = {new_value}")
+                self.drawing_widget.update()
+            except Exception as e:
+                print(f"错误: 更新连接属性时出错 {attribute_name} for ConnectionID {object_id}: {e}")
+            return
+
         # 如果不是 SpringComponent，则按实体组件处理
         entity_uuid = object_id # 在这种情况下，object_id 是 entity_id
 
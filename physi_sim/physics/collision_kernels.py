@@ -0,0 +1,313 @@
+"""
+Array kernels for the SAT narrow phase.
+
+Shapes are plain SAT_DTYPE arrays: vertices are (N, 2) rows of world-space points and axes are
+(M, 2) rows of unit normals. Nothing here touches entities or Vector2D; CollisionSystem wraps
+results back into Vector2D only when it builds the contact manifold.
+"""
+from math import isqrt
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Element type of every SAT buffer. Kept at float64: tolerances are EPSILON (1e-6) in scene units, which is
+# below float32 resolution for coordinates past ~8 (ulp 1e-6), so float32 would change hit/miss decisions.
+SAT_DTYPE = np.float64
+
+# Grid used to match parallel axes: components are compared after rounding to 1e-6
+AXIS_KEY_SCALE = 1e6
+
+# Row count from which convex_support_index samples instead of scanning every row
+SUPPORT_SEARCH_MIN_ROWS = 32
+
+
+def transform_vertices(local_vertices: np.ndarray, cos_a: float, sin_a: float,
+                       pos_x: float, pos_y: float) -> np.ndarray:
+    """Rotates and translates (N, 2) local vertices (same arithmetic as Vector2D.rotate(angle) + pos)."""
+    local_x, local_y = local_vertices[:, 0], local_vertices[:, 1]
+    return np.column_stack((local_x * cos_a - local_y * sin_a + pos_x,
+                            local_x * sin_a + local_y * cos_a + pos_y))
+
+
+def rotate_vectors(vectors: np.ndarray, cos_a: float, sin_a: float) -> np.ndarray:
+    """Rotates (N, 2) direction vectors (no translation), e.g. local-frame axes into world space."""
+    vec_x, vec_y = vectors[:, 0], vectors[:, 1]
+    return np.column_stack((vec_x * cos_a - vec_y * sin_a, vec_x * sin_a + vec_y * cos_a))
+
+
+def sat_axes(vertices: np.ndarray) -> np.ndarray:
+    """
+    Unit edge normals of a closed polygon as an (M, 2) array, with parallel/anti-parallel
+    duplicates and zero-length edges dropped (the first of each parallel group is kept).
+    Parallel normals are matched on a sign-canonical 1e-6 grid key in one np.unique pass.
+    """
+    edges = np.roll(vertices, -1, axis=0) - vertices
+    normals = np.column_stack((-edges[:, 1], edges[:, 0])) # Vector2D.perpendicular()
+    lengths = np.sqrt(normals[:, 0] ** 2 + normals[:, 1] ** 2)
+    keep = lengths > 0
+    normals = normals[keep] / lengths[keep, None]
+    keys = np.rint(normals * AXIS_KEY_SCALE).astype(np.int64)
+    # Anti-parallel normals share a key: flip so the first non-zero component is positive
+    flip = (keys[:, 0] < 0) | ((keys[:, 0] == 0) & (keys[:, 1] < 0))
+    keys[flip] = -keys[flip]
+    _unique_keys, first_index = np.unique(keys, axis=0, return_index=True)
+    return normals[np.sort(first_index)]
+
+
+def outward_edge_normals(vertices: np.ndarray) -> np.ndarray:
+    """
+    Unit outward normals of each edge i -> i+1 of a closed CCW (Y-down) polygon as an (N, 2) array,
+    i.e. (dy, -dx) normalized; zero-length edges give (0, 0), like Vector2D.normalize().
+    """
+    edges = np.roll(vertices, -1, axis=0) - vertices
+    normals = np.column_stack((edges[:, 1], -edges[:, 0]))
+    lengths = np.sqrt(normals[:, 0] ** 2 + normals[:, 1] ** 2)
+    nonzero = lengths > 0
+    normals[nonzero] /= lengths[nonzero, None]
+    normals[~nonzero] = 0.0
+    return normals
+
+
+def is_strictly_convex(vertices: np.ndarray) -> bool:
+    """
+    True if the closed polygon is strictly convex in either winding: no zero-length edges, every turn in the
+    same direction (no collinear runs) and one full turn in total (rules out self-intersecting stars).
+    This is the precondition of convex_support_index's sampled search.
+    """
+    if len(vertices) < 3:
+        return False
+    edges = np.roll(vertices, -1, axis=0) - vertices
+    next_edges = np.roll(edges, -1, axis=0)
+    cross = edges[:, 0] * next_edges[:, 1] - edges[:, 1] * next_edges[:, 0]
+    if not ((cross > 0).all() or (cross < 0).all()):
+        return False
+    dot = edges[:, 0] * next_edges[:, 0] + edges[:, 1] * next_edges[:, 1]
+    return bool(abs(np.arctan2(cross, dot).sum()) < 3 * np.pi)
+
+
+def convex_support_index(rows: np.ndarray, dir_x: float, dir_y: float) -> int:
+    """
+    Index of the row with the largest dot product with (dir_x, dir_y), first on ties, for rows in cyclic
+    angular order (vertices or outward edge normals of a convex polygon, see is_strictly_convex), whose dot
+    products are unimodal around the cycle; other inputs must use a plain argmax. Below SUPPORT_SEARCH_MIN_ROWS rows this is a plain argmax; above, every s-th row
+    (s = isqrt(N)) is sampled and only the 2s + 1 rows around the best sample are scanned, O(sqrt(N)).
+    """
+    count = len(rows)
+    if count < SUPPORT_SEARCH_MIN_ROWS:
+        return int((rows[:, 0] * dir_x + rows[:, 1] * dir_y).argmax())
+    step = isqrt(count)
+    samples = rows[::step]
+    best_sample = int((samples[:, 0] * dir_x + samples[:, 1] * dir_y).argmax()) * step
+    # Samples are at most `step` apart around the cycle, so the maximum lies within `step` of the best one
+    window = np.arange(best_sample - step, best_sample + step + 1) % count
+    near = rows[window]
+    dots = near[:, 0] * dir_x + near[:, 1] * dir_y
+    at_max = dots == dots.max()
+    if at_max[0] or at_max[-1] or not at_max.any(): # (NaN dot products leave no maximum)
+        # The plateau of maxima (collinear vertices / parallel edges) may run past the window: scan all rows
+        return int((rows[:, 0] * dir_x + rows[:, 1] * dir_y).argmax())
+    # Plateau lies inside the window; its lowest row index is the one a full argmax would return
+    return int(window[at_max].min())
+
+
+def sat_project(vertices: np.ndarray, axes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Projects (N, 2) vertices onto each of (M, 2) axes; returns (mins, maxs), each of shape (M,)."""
+    projections = vertices[:, 0, None] * axes[:, 0] + vertices[:, 1, None] * axes[:, 1] # (N, M)
+    return projections.min(axis=0), projections.max(axis=0)
+
+
+def rect_project(rect: Tuple[float, float, float, float, float, float],
+                 axes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Closed-form projection of an oriented rectangle onto each of (M, 2) axes, without touching its vertices.
+    `rect` is (center_x, center_y, cos, sin, half_width, half_height); the interval on axis n is
+    center.n -/+ (half_width * |u.n| + half_height * |v.n|), with body axes u = (cos, sin), v = (-sin, cos).
+    """
+    center_x, center_y, cos_a, sin_a, half_width, half_height = rect
+    axis_x, axis_y = axes[:, 0], axes[:, 1]
+    centers = center_x * axis_x + center_y * axis_y
+    radii = (half_width * np.abs(cos_a * axis_x + sin_a * axis_y) +
+             half_height * np.abs(cos_a * axis_y - sin_a * axis_x))
+    return centers - radii, centers + radii
+
+
+def sat_polygon_polygon(vertices_a: np.ndarray, axes_a: np.ndarray,
+                        vertices_b: np.ndarray, axes_b: np.ndarray,
+                        center_b_to_a_x: float, center_b_to_a_y: float,
+                        tolerance: float = 0.0,
+                        rect_a: Optional[Tuple[float, float, float, float, float, float]] = None,
+                        rect_b: Optional[Tuple[float, float, float, float, float, float]] = None
+                        ) -> Tuple[bool, float, float, float]:
+    """
+    Separating-axis test between two convex polygons.
+    Rectangles may pass their oriented-box description (see rect_project) as rect_a/rect_b; they are then
+    projected in closed form (one fused pass per axis set) instead of reducing over their four vertices.
+    Returns (hit, normal_x, normal_y, depth): the normal is the axis of minimum overlap (first one on
+    ties), oriented along the B->A center vector. Intervals closer than `tolerance` to touching still
+    count as separated only once they are more than `tolerance` apart.
+    """
+    if not len(axes_a) and not len(axes_b):
+        return False, 0.0, 0.0, 0.0
+
+    # A's axes first, then B's: a separating axis (or a negative overlap) in the first pass
+    # ends the test before B's axes are projected at all.
+    overlaps = []
+    for axes in (axes_a, axes_b):
+        if not len(axes):
+            continue
+        min_a, max_a = rect_project(rect_a, axes) if rect_a is not None else sat_project(vertices_a, axes)
+        min_b, max_b = rect_project(rect_b, axes) if rect_b is not None else sat_project(vertices_b, axes)
+        if np.any((max_a < min_b - tolerance) | (max_b < min_a - tolerance)):
+            return False, 0.0, 0.0, 0.0 # Separating axis found
+        axis_overlaps = np.minimum(max_a, max_b) - np.maximum(min_a, min_b)
+        if axis_overlaps.min() < 0:
+            return False, 0.0, 0.0, 0.0
+        overlaps.append(axis_overlaps)
+
+    overlaps = np.concatenate(overlaps) if len(overlaps) > 1 else overlaps[0]
+    best_axis = int(overlaps.argmin())
+    depth = float(overlaps[best_axis])
+    if best_axis < len(axes_a):
+        normal_x, normal_y = axes_a[best_axis].tolist()
+    else:
+        normal_x, normal_y = axes_b[best_axis - len(axes_a)].tolist()
+    if center_b_to_a_x * normal_x + center_b_to_a_y * normal_y < 0:
+        normal_x, normal_y = -normal_x, -normal_y
+    return True, normal_x, normal_y, depth
+
+
+def obb_obb_sat(rect_a: Tuple[float, float, float, float, float, float],
+                rect_b: Tuple[float, float, float, float, float, float],
+                tolerance: float = 0.0) -> Tuple[bool, float, float, float]:
+    """
+    sat_polygon_polygon specialized to two oriented rectangles with non-zero extents, in plain float math.
+    The axes are the two body normals of A then of B, (-sin, cos) and (-cos, -sin), in the same order and
+    with the same values as the rotated sat_axes of a rectangle; intervals are rect_project's closed form.
+    The B->A center vector is taken from the rectangle centers. Same return value as sat_polygon_polygon.
+    """
+    center_ax, center_ay, cos_a, sin_a, half_width_a, half_height_a = rect_a
+    center_bx, center_by, cos_b, sin_b, half_width_b, half_height_b = rect_b
+    best_overlap = float('inf')
+    normal_x = normal_y = 0.0
+    for axis_x, axis_y in ((-sin_a, cos_a), (-cos_a, -sin_a), (-sin_b, cos_b), (-cos_b, -sin_b)):
+        center_proj_a = center_ax * axis_x + center_ay * axis_y
+        radius_a = (half_width_a * abs(cos_a * axis_x + sin_a * axis_y) +
+                    half_height_a * abs(cos_a * axis_y - sin_a * axis_x))
+        center_proj_b = center_bx * axis_x + center_by * axis_y
+        radius_b = (half_width_b * abs(cos_b * axis_x + sin_b * axis_y) +
+                    half_height_b * abs(cos_b * axis_y - sin_b * axis_x))
+        min_a, max_a = center_proj_a - radius_a, center_proj_a + radius_a
+        min_b, max_b = center_proj_b - radius_b, center_proj_b + radius_b
+        if max_a < min_b - tolerance or max_b < min_a - tolerance:
+            return False, 0.0, 0.0, 0.0 # Separating axis found
+        overlap = min(max_a, max_b) - max(min_a, min_b)
+        if overlap < 0:
+            return False, 0.0, 0.0, 0.0
+        if overlap < best_overlap:
+            best_overlap, normal_x, normal_y = overlap, axis_x, axis_y
+    if (center_ax - center_bx) * normal_x + (center_ay - center_by) * normal_y < 0:
+        normal_x, normal_y = -normal_x, -normal_y
+    return True, normal_x, normal_y, best_overlap
+
+
+def clip_segment_to_support_region(incident_v1_x: float, incident_v1_y: float,
+                                   incident_v2_x: float, incident_v2_y: float,
+                                   ref_v1_x: float, ref_v1_y: float, ref_v2_x: float, ref_v2_y: float,
+                                   epsilon: float) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Liang-Barsky clip of the incident segment against the support region of the reference segment (the strip
+    between the lines through ref_v1 and ref_v2 perpendicular to it), in plain float math.
+    Returns the clipped segment as (x1, y1, x2, y2), or None if nothing of it lies in the region.
+    """
+    ref_x = ref_v2_x - ref_v1_x
+    ref_y = ref_v2_y - ref_v1_y
+    dir_x = incident_v2_x - incident_v1_x
+    dir_y = incident_v2_y - incident_v1_y
+    ref_len_sq = ref_x * ref_x + ref_y * ref_y
+    epsilon_sq = epsilon * epsilon
+
+    if ref_len_sq < epsilon_sq:
+        # Reference edge is a point: only a (near-)coincident point-like incident segment touches it
+        offset_x = incident_v1_x - ref_v1_x
+        offset_y = incident_v1_y - ref_v1_y
+        if dir_x * dir_x + dir_y * dir_y < epsilon_sq and offset_x * offset_x + offset_y * offset_y < epsilon_sq:
+            return ref_v1_x, ref_v1_y, ref_v1_x, ref_v1_y
+        return None
+
+    # Both clip lines share the direction term u = D . n with n the raw reference edge; its length cancels
+    # in the t ratios, and unit-normal EPSILON tests are compared as squares against epsilon^2 * |n|^2.
+    u = dir_x * ref_x + dir_y * ref_y
+    dist_from_ref_v1 = (ref_v1_x - incident_v1_x) * ref_x + (ref_v1_y - incident_v1_y) * ref_y
+    dist_from_ref_v2 = (ref_v2_x - incident_v1_x) * ref_x + (ref_v2_y - incident_v1_y) * ref_y
+    tolerance_sq = epsilon_sq * ref_len_sq
+
+    if u * u < tolerance_sq: # Parallel to both clip lines
+        # Outside test for both lines in one: the larger of -dist_from_ref_v1 and dist_from_ref_v2 exceeds the
+        # tolerance exactly when either one does (squaring is monotonic for non-negative values)
+        outside = max(-dist_from_ref_v1, dist_from_ref_v2)
+        if outside > 0 and outside * outside > tolerance_sq:
+            return None
+        t_enter, t_leave = 0.0, 1.0
+    else:
+        # Entry/exit line by the sign of u. Whether t = dist / u falls outside [0, 1] is decided exactly by
+        # comparing dist against 0 and u (division is monotonic), so the clamped ends skip the division.
+        if u > 0:
+            dist_enter, dist_leave = dist_from_ref_v1, dist_from_ref_v2
+            t_enter = 0.0 if dist_enter <= 0 else max(0.0, dist_enter / u)
+            t_leave = 1.0 if dist_leave >= u else min(1.0, dist_leave / u)
+        else:
+            dist_enter, dist_leave = dist_from_ref_v2, dist_from_ref_v1
+            t_enter = 0.0 if dist_enter >= 0 else max(0.0, dist_enter / u)
+            t_leave = 1.0 if dist_leave <= u else min(1.0, dist_leave / u)
+
+    if t_enter > t_leave + epsilon:
+        return None
+    if abs(t_enter - t_leave) < epsilon: # Effectively a point
+        t_leave = t_enter
+    return (incident_v1_x + dir_x * t_enter, incident_v1_y + dir_y * t_enter,
+            incident_v1_x + dir_x * t_leave, incident_v1_y + dir_y * t_leave)
+
+
+def pad_rows(rows: np.ndarray, length: int) -> np.ndarray:
+    """Pads (N, 2) rows to (length, 2) by repeating the first row; repeats change no SAT min/max or argmin."""
+    if len(rows) == length:
+        return rows
+    return np.concatenate((rows, np.repeat(rows[:1], length - len(rows), axis=0)))
+
+
+def sat_polygon_polygon_batch(vertices_a: np.ndarray, vertices_b: np.ndarray, axes: np.ndarray,
+                              center_b_to_a: np.ndarray, tolerance: float = 0.0
+                              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    sat_polygon_polygon over K pairs at once. vertices_a (K, N, 2) and vertices_b (K, N', 2) are the
+    pairs' world vertices and axes (K, M, 2) the concatenated axes of A then B, all padded with pad_rows;
+    center_b_to_a is (K, 2). Returns (hits (K,), normals (K, 2), depths (K,)) with the per-pair semantics.
+    """
+    pair_index = np.arange(len(axes))
+    proj_a = np.einsum('kni,kmi->knm', vertices_a, axes)
+    proj_b = np.einsum('kni,kmi->knm', vertices_b, axes)
+    min_a, max_a = proj_a.min(axis=1), proj_a.max(axis=1) # (K, M)
+    min_b, max_b = proj_b.min(axis=1), proj_b.max(axis=1)
+    separated = ((max_a < min_b - tolerance) | (max_b < min_a - tolerance)).any(axis=1)
+
+    overlaps = np.minimum(max_a, max_b) - np.maximum(min_a, min_b)
+    best_axis = overlaps.argmin(axis=1)
+    depths = overlaps[pair_index, best_axis]
+    normals = axes[pair_index, best_axis]
+    flip = (normals * center_b_to_a).sum(axis=1) < 0
+    normals[flip] = -normals[flip]
+    return ~separated & (depths >= 0), normals, depths
+
+
+def sat_polygon_polygon_pairs(vertex_table: np.ndarray, axes_table: np.ndarray, centers: np.ndarray,
+                              pairs: np.ndarray, tolerance: float = 0.0
+                              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    sat_polygon_polygon_batch driven by per-entity tables: vertex_table (E, N, 2) and axes_table (E, M, 2)
+    hold each entity's rows padded with pad_rows, centers is (E, 2) and pairs an (K, 2) integer array of
+    table rows (A, B). Every pair is gathered and evaluated in the same vectorized pass.
+    """
+    rows_a, rows_b = pairs[:, 0], pairs[:, 1]
+    axes = np.concatenate((axes_table[rows_a], axes_table[rows_b]), axis=1)
+    return sat_polygon_polygon_batch(vertex_table[rows_a], vertex_table[rows_b], axes,
+                                     centers[rows_a] - centers[rows_b], tolerance)
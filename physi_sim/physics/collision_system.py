@@ -1,15 +1,26 @@
 import math # Added for SAT
-from typing import TYPE_CHECKING, List, Tuple, Optional, TypedDict, Union, Set # Add TypedDict, Union and Set
+from math import fabs, hypot
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional, Union, Set # Add Union and Set
+
+import numpy as np
+
 from physi_sim.core.system import System
 from physi_sim.core.component import TransformComponent, GeometryComponent, PhysicsBodyComponent, ShapeType # Import ShapeType
 from physi_sim.core.vector import Vector2D # For distance calculation
 from physi_sim.core.utils import GRAVITY_ACCELERATION, EPSILON # Import the constant and EPSILON
 from physi_sim.core.component import SurfaceComponent # Added for ForceCalculator integration
 from .force_calculator import ForceCalculator
-class ContactPointInfo(TypedDict):
-    point: Vector2D  # World-space contact point position
-    normal: Vector2D  # From second object to first object
-    penetration_depth: float
+from .collision_kernels import (AXIS_KEY_SCALE, SAT_DTYPE, transform_vertices, rotate_vectors, sat_axes, sat_polygon_polygon,
+                                clip_segment_to_support_region, obb_obb_sat, outward_edge_normals, pad_rows, sat_polygon_polygon_pairs,
+                                convex_support_index, is_strictly_convex)
+class ContactPointInfo:
+    """One contact of a manifold. A __slots__ class: no per-contact dict, attribute reads instead of key lookups."""
+    __slots__ = ("point", "normal", "penetration_depth")
+
+    def __init__(self, point: Vector2D, normal: Vector2D, penetration_depth: float):
+        self.point = point  # World-space contact point position
+        self.normal = normal  # From second object to first object
+        self.penetration_depth = penetration_depth
 
 if TYPE_CHECKING:
     from physi_sim.core.entity_manager import EntityManager, EntityID
@@ -18,26 +29,84 @@ class CollisionSystem(System):
     def __init__(self, entity_manager: 'EntityManager'):
         super().__init__(entity_manager)
         self.force_calculator = ForceCalculator(gravity_vector=GRAVITY_ACCELERATION) # Pass gravity
-        self.disabled_collision_pairs: Set[Tuple['EntityID', 'EntityID']] = set()
+        # Disabled pairs as packed integer keys (see _pair_key); entities get dense indices on first use,
+        # destroyed ones are dropped again in update() (_prune_entity_index)
+        self.disabled_collision_pairs: Set[int] = set()
+        self._entity_index: Dict['EntityID', int] = {}
+        # Per-frame cache of world-space SAT data: entity -> ((x, y, angle), vertices (N, 2), axes (M, 2)).
+        # Entries are validated against the pose, so positional corrections within a frame are picked up.
+        self._frame_id: int = 0
+        self._world_shape_cache: Dict['EntityID', Tuple[Tuple[float, float, float], np.ndarray, np.ndarray]] = {}
+        # Outward edge normals of those world vertices, for contact generation: entity -> (vertices, normals (N, 2))
+        self._world_edge_normal_cache: Dict['EntityID', Tuple[np.ndarray, np.ndarray]] = {}
+        # Best-matching edge per target normal for those normals: entity -> (normals, {(target_x, target_y): index})
+        self._best_edge_cache: Dict['EntityID', Tuple[np.ndarray, Dict[Tuple[float, float], int]]] = {}
+        # Local-frame SAT data per entity: entity -> (local vertex bytes, local vertices (N, 2), local axes (M, 2),
+        # strictly convex flag). Only rotation changes world-space axes, so edge normals, their dedup and the
+        # convexity pass are redone only when the shape's parameters (width/height/vertices) change.
+        self._local_shape_cache: Dict['EntityID', Tuple[bytes, np.ndarray, np.ndarray, bool]] = {}
+        # Entity order along X from the previous frame's sweep-and-prune pass
+        self._sap_order: List['EntityID'] = []
+
+    def begin_frame(self) -> None:
+        """Starts a new collision frame: drops cached world-space vertices/axes from the previous one."""
+        self._frame_id += 1
+        self._world_shape_cache.clear()
+        self._world_edge_normal_cache.clear()
+        self._best_edge_cache.clear()
+
+    def _dense_index(self, entity_id: 'EntityID') -> int:
+        """Returns the entity's dense integer index, assigning the next free one on first use."""
+        index = self._entity_index.get(entity_id)
+        if index is None:
+            index = self._entity_index[entity_id] = len(self._entity_index)
+        return index
+
+    def _pair_key(self, entity_id_a: 'EntityID', entity_id_b: 'EntityID') -> int:
+        """Order-independent integer key for a pair: (min_index << 32) | max_index over dense entity indices."""
+        index_a = self._dense_index(entity_id_a)
+        index_b = self._dense_index(entity_id_b)
+        return (index_a << 32) | index_b if index_a < index_b else (index_b << 32) | index_a
+
+    def _prune_entity_index(self) -> None:
+        """
+        Drops the dense indices of destroyed entities and the disabled-pair keys that name them. Survivors are
+        renumbered in their original order, so packed keys of the remaining disabled pairs keep (min, max) order.
+        """
+        live_entities = self.entity_manager.entities
+        entity_index: Dict['EntityID', int] = {}
+        remap: Dict[int, int] = {}
+        for entity_id, old_index in self._entity_index.items():
+            if entity_id in live_entities:
+                remap[old_index] = entity_index[entity_id] = len(entity_index)
+        disabled_pairs: Set[int] = set()
+        for key in self.disabled_collision_pairs:
+            index_low = remap.get(key >> 32)
+            index_high = remap.get(key & 0xFFFFFFFF)
+            if index_low is not None and index_high is not None:
+                disabled_pairs.add((index_low << 32) | index_high)
+        self._entity_index = entity_index
+        self.disabled_collision_pairs = disabled_pairs
 
     def disable_collision_pair(self, entity_id_a: 'EntityID', entity_id_b: 'EntityID') -> None:
         """Disables collision detection between two entities."""
-        # Ensure consistent ordering of entity IDs in the tuple
-        pair = tuple(sorted((entity_id_a, entity_id_b)))
-        self.disabled_collision_pairs.add(pair)
+        self.disabled_collision_pairs.add(self._pair_key(entity_id_a, entity_id_b))
         # print(f"Collision disabled between {entity_id_a} and {entity_id_b}")
 
     def enable_collision_pair(self, entity_id_a: 'EntityID', entity_id_b: 'EntityID') -> None:
         """Enables collision detection between two entities."""
-        pair = tuple(sorted((entity_id_a, entity_id_b)))
-        if pair in self.disabled_collision_pairs:
-            self.disabled_collision_pairs.remove(pair)
-            # print(f"Collision enabled between {entity_id_a} and {entity_id_b}")
+        self.disabled_collision_pairs.discard(self._pair_key(entity_id_a, entity_id_b))
+        # print(f"Collision enabled between {entity_id_a} and {entity_id_b}")
 
     def is_collision_disabled(self, entity_id_a: 'EntityID', entity_id_b: 'EntityID') -> bool:
         """Checks if collision is disabled between two entities."""
-        pair = tuple(sorted((entity_id_a, entity_id_b)))
-        return pair in self.disabled_collision_pairs
+        entity_index = self._entity_index
+        index_a = entity_index.get(entity_id_a)
+        index_b = entity_index.get(entity_id_b)
+        if index_a is None or index_b is None:
+            return False # Never part of a disabled pair
+        key = (index_a << 32) | index_b if index_a < index_b else (index_b << 32) | index_a
+        return key in self.disabled_collision_pairs
 
     def _check_circle_circle_collision(self,
                                        transform_a: TransformComponent, geometry_a: GeometryComponent,
@@ -48,9 +117,10 @@ class CollisionSystem(System):
         pos_b = transform_b.position
         radius_b = geometry_b.parameters.get("radius", 0)
 
-        distance_sq = (pos_a.x - pos_b.x)**2 + (pos_a.y - pos_b.y)**2
-        radii_sum_sq = (radius_a + radius_b)**2
-        return distance_sq < radii_sum_sq
+        dx = pos_a.x - pos_b.x
+        dy = pos_a.y - pos_b.y
+        radii_sum = radius_a + radius_b
+        return dx * dx + dy * dy < radii_sum * radii_sum
 
     def _check_aabb_aabb_collision(self,
                                    trans_a: TransformComponent, geom_a: GeometryComponent,
@@ -79,30 +149,19 @@ class CollisionSystem(System):
         sum_half_heights = half_height_a + half_height_b
 
         # Check for overlap
-        overlap_x = sum_half_widths - abs(dist_x)
-        overlap_y = sum_half_heights - abs(dist_y)
-
-        if overlap_x > 0 and overlap_y > 0:
-            # Collision detected
-            penetration_depth: float
-            normal: Vector2D
-
-            # Determine axis of minimum penetration
-            if overlap_x < overlap_y:
-                penetration_depth = overlap_x
-                if dist_x > 0: # A is to the right of B
-                    normal = Vector2D(1, 0) # Normal points from B to A along X
-                else: # A is to the left of B
-                    normal = Vector2D(-1, 0) # Normal points from B to A along X
-            else:
-                penetration_depth = overlap_y
-                if dist_y > 0: # A is below B (assuming Y down is positive)
-                    normal = Vector2D(0, 1) # Normal points from B to A along Y
-                else: # A is above B
-                    normal = Vector2D(0, -1) # Normal points from B to A along Y
-            return True, normal, penetration_depth
-        
-        return False, None, None
+        overlap_x = sum_half_widths - fabs(dist_x)
+        overlap_y = sum_half_heights - fabs(dist_y)
+        if min(overlap_x, overlap_y) <= 0:
+            return False, None, None
+
+        # Collision detected. Axis of minimum penetration (Y on ties) and its direction, picked arithmetically:
+        # use_x is 1.0 or 0.0, and the signs are +1 when A is right of / below B (Y down is positive), else -1.
+        use_x = float(overlap_x < overlap_y)
+        sign_x = float(dist_x > 0) * 2.0 - 1.0
+        sign_y = float(dist_y > 0) * 2.0 - 1.0
+        penetration_depth = overlap_x * use_x + overlap_y * (1.0 - use_x)
+        normal = Vector2D(sign_x * use_x, sign_y * (1.0 - use_x)) # Normal points from B to A
+        return True, normal, penetration_depth
 
     def _check_circle_aabb_collision(self,
                                      trans_circle: TransformComponent, geom_circle: GeometryComponent,
@@ -130,7 +189,7 @@ class CollisionSystem(System):
         closest_point_on_aabb = Vector2D(closest_x, closest_y)
         
         distance_vector = circle_center - closest_point_on_aabb
-        distance_squared = distance_vector.magnitude_squared()
+        distance_squared = distance_vector.x * distance_vector.x + distance_vector.y * distance_vector.y
 
         if distance_squared < radius * radius:
             # Collision detected
@@ -147,7 +206,7 @@ class CollisionSystem(System):
                 # For simplicity when inside, penetration can be radius.
                 penetration = radius
             else:
-                distance = distance_vector.magnitude()
+                distance = hypot(distance_vector.x, distance_vector.y)
                 normal = distance_vector / distance # Normalize
                 penetration = radius - distance
             
@@ -157,83 +216,168 @@ class CollisionSystem(System):
         return False, None, None
 
     # SAT Helper methods
-    def _get_rotated_vertices(self, entity_id: 'EntityID') -> List[Vector2D]:
+    def _get_local_vertex_array(self, geometry: GeometryComponent) -> Optional[np.ndarray]:
         """
-        Calculates the world-space vertices of an entity with a geometric shape,
-        considering its position and rotation.
+        Returns the shape's local-space vertices as an (N, 2) float array, or None.
         Supports RECTANGLE and POLYGON shapes.
-        Position is assumed to be the center of the shape.
         """
-        transform = self.entity_manager.get_component(entity_id, TransformComponent)
-        geometry = self.entity_manager.get_component(entity_id, GeometryComponent)
-
-        if not transform or not geometry:
-            return []
-
-        pos = transform.position
-        angle = transform.angle # radians
-        local_vertices: List[Vector2D] = []
-
         if geometry.shape_type == ShapeType.RECTANGLE:
             width = geometry.parameters.get("width", 0.0)
             height = geometry.parameters.get("height", 0.0)
             if not isinstance(width, (int, float)) or not isinstance(height, (int, float)):
                 # Log error or handle appropriately if parameters are not floats
-                return [] # Or raise error
-            
+                return None
             half_width = width / 2
             half_height = height / 2
-            local_vertices = [
-                Vector2D(-half_width, -half_height), # Top-left
-                Vector2D( half_width, -half_height), # Top-right
-                Vector2D( half_width,  half_height), # Bottom-right
-                Vector2D(-half_width,  half_height)  # Bottom-left
-            ]
-        elif geometry.shape_type == ShapeType.POLYGON:
+            return np.array([
+                (-half_width, -half_height), # Top-left
+                ( half_width, -half_height), # Top-right
+                ( half_width,  half_height), # Bottom-right
+                (-half_width,  half_height)  # Bottom-left
+            ], dtype=SAT_DTYPE)
+        if geometry.shape_type == ShapeType.POLYGON:
             # Ensure 'vertices' exists and is a list of Vector2D
             raw_vertices = geometry.parameters.get("vertices")
-            if isinstance(raw_vertices, list) and all(isinstance(v, Vector2D) for v in raw_vertices):
-                local_vertices = raw_vertices
-            else:
-                # Log error or handle appropriately
-                return [] # Or raise error
-        else:
-            # Unsupported shape type for vertex calculation
-            return []
+            if isinstance(raw_vertices, list) and raw_vertices and all(isinstance(v, Vector2D) for v in raw_vertices):
+                return np.array([(v.x, v.y) for v in raw_vertices], dtype=SAT_DTYPE)
+        # Unsupported shape type or invalid parameters
+        return None
 
-        if not local_vertices:
-            return []
+    def _get_local_shape(self, entity_id: 'EntityID',
+                         geometry: GeometryComponent) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns (local vertices (N, 2), local SAT axes (M, 2)) for a RECTANGLE/POLYGON shape, or None.
+        The axes are rebuilt only when the local vertices differ from the cached ones.
+        """
+        local_vertices = self._get_local_vertex_array(geometry)
+        if local_vertices is None:
+            return None
+        signature = local_vertices.tobytes()
+        cached = self._local_shape_cache.get(entity_id)
+        if cached is not None and cached[0] == signature:
+            return cached[1], cached[2]
+        local_axes = sat_axes(local_vertices)
+        self._local_shape_cache[entity_id] = (signature, local_vertices, local_axes, is_strictly_convex(local_vertices))
+        return local_vertices, local_axes
+
+    def _is_convex_shape(self, entity_id: 'EntityID') -> bool:
+        """
+        Whether the entity's RECTANGLE/POLYGON shape is strictly convex, from the flag cached with its local shape
+        (current once _get_world_shape has run for the entity this frame). False if unknown.
+        """
+        cached = self._local_shape_cache.get(entity_id)
+        return cached is not None and cached[3]
 
-        # Rotate and translate vertices
-        rotated_vertices = [v.rotate(angle) + pos for v in local_vertices]
-        return rotated_vertices
+    def _get_world_vertex_array(self, entity_id: 'EntityID',
+                                transform: Optional[TransformComponent] = None,
+                                geometry: Optional[GeometryComponent] = None) -> Optional[np.ndarray]:
+        """
+        World-space vertices of a RECTANGLE/POLYGON entity as an (N, 2) float array (one vertex per row),
+        considering its position and rotation. Position is assumed to be the center of the shape.
+        Callers that already hold the entity's components can pass them to skip the lookups.
+        """
+        world_shape = self._get_world_shape(entity_id, transform, geometry)
+        return world_shape[0] if world_shape is not None else None
 
-    def _get_axes(self, vertices: List[Vector2D]) -> List[Vector2D]:
+    def _get_world_shape(self, entity_id: 'EntityID',
+                         transform: Optional[TransformComponent] = None,
+                         geometry: Optional[GeometryComponent] = None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns (world vertices (N, 2), SAT axes (M, 2)) for a RECTANGLE/POLYGON entity, or None.
+        Computed once per pose per frame, so an entity tested against K neighbours is rotated once, not K times;
+        the axes are the cached local axes rotated by the entity's angle.
+        The returned arrays are shared: callers must not modify them.
+        """
+        if transform is None:
+            transform = self.entity_manager.get_component(entity_id, TransformComponent)
+        if not transform:
+            return None
+        pos = transform.position
+        pose = (pos.x, pos.y, transform.angle)
+        cached = self._world_shape_cache.get(entity_id)
+        if cached is not None and cached[0] == pose:
+            return cached[1], cached[2]
+        if geometry is None:
+            geometry = self.entity_manager.get_component(entity_id, GeometryComponent)
+        if not geometry:
+            return None
+        local_shape = self._get_local_shape(entity_id, geometry)
+        if local_shape is None:
+            return None
+        local_vertices, local_axes = local_shape
+        cos_a, sin_a = transform.rotation()
+        vertices = transform_vertices(local_vertices, cos_a, sin_a, pos.x, pos.y)
+        axes = rotate_vectors(local_axes, cos_a, sin_a)
+        self._world_shape_cache[entity_id] = (pose, vertices, axes)
+        return vertices, axes
+
+    def _get_world_edge_normals(self, entity_id: 'EntityID', vertices: np.ndarray) -> np.ndarray:
+        """
+        Outward unit edge normals (N, 2) of the entity's world vertices as returned by _get_world_shape.
+        Kept while that vertex array is current, so every contact pair touching the entity in the same pose
+        reuses them instead of re-normalizing the edges.
+        """
+        cached = self._world_edge_normal_cache.get(entity_id)
+        if cached is not None and cached[0] is vertices:
+            return cached[1]
+        normals = outward_edge_normals(vertices)
+        self._world_edge_normal_cache[entity_id] = (vertices, normals)
+        return normals
+
+    @staticmethod
+    def _get_oriented_box(transform: TransformComponent,
+                          geometry: GeometryComponent) -> Optional[Tuple[float, float, float, float, float, float]]:
+        """
+        Returns (center_x, center_y, cos, sin, half_width, half_height) for a RECTANGLE shape, or None for
+        other shapes. Lets SAT project rectangles in closed form (collision_kernels.rect_project).
+        """
+        if geometry.shape_type != ShapeType.RECTANGLE:
+            return None
+        width = geometry.parameters.get("width", 0.0)
+        height = geometry.parameters.get("height", 0.0)
+        if not isinstance(width, (int, float)) or not isinstance(height, (int, float)):
+            return None
+        cos_a, sin_a = transform.rotation()
+        return transform.position.x, transform.position.y, cos_a, sin_a, width / 2, height / 2
+
+    def _get_rotated_vertices(self, entity_id: 'EntityID') -> List[Vector2D]:
+        """
+        Calculates the world-space vertices of an entity with a geometric shape,
+        considering its position and rotation.
+        Supports RECTANGLE and POLYGON shapes.
+        Position is assumed to be the center of the shape.
+        """
+        world_shape = self._get_world_shape(entity_id)
+        if world_shape is None:
+            return []
+        return [Vector2D(x, y) for x, y in world_shape[0].tolist()]
+
+    def _get_axes(self, vertices: List[Vector2D], is_rectangle: bool = False) -> List[Vector2D]:
         """
         Calculates the perpendicular axes (normals) for the edges of a polygon.
-        For a rectangle, only two unique axes are needed.
+        For a rectangle, only two unique axes are needed: its first two edge normals (no dedup pass).
         Vertices should be ordered (e.g., clockwise or counter-clockwise).
         """
         axes = []
         if not vertices or len(vertices) < 2:
             return []
 
-        for i in range(len(vertices)):
+        num_edges = 2 if is_rectangle and len(vertices) == 4 else len(vertices)
+        seen_keys = set()
+        for i in range(num_edges):
             p1 = vertices[i]
             p2 = vertices[(i + 1) % len(vertices)] # Wrap around for the last edge
             edge = p2 - p1
             # Normal is perpendicular to the edge. Ensure it's normalized.
             normal = edge.perpendicular().normalize()
-            # Avoid adding duplicate axes (e.g. for parallel edges of a rectangle)
-            # This simple check works if normals are consistently calculated (e.g. always pointing "outward")
-            # A more robust way for general polygons might involve checking dot products close to -1.
-            is_duplicate = False
-            for existing_axis in axes:
-                if abs(normal.dot(existing_axis) - 1.0) < 1e-6 or \
-                   abs(normal.dot(existing_axis) + 1.0) < 1e-6: # Check for parallel or anti-parallel
-                    is_duplicate = True
-                    break
-            if not is_duplicate:
+            # Avoid adding duplicate axes (e.g. for parallel edges of a polygon): parallel and anti-parallel
+            # normals share a key once rounded to the AXIS_KEY_SCALE grid and sign-canonicalized.
+            key_x = round(normal.x * AXIS_KEY_SCALE)
+            key_y = round(normal.y * AXIS_KEY_SCALE)
+            if key_x < 0 or (key_x == 0 and key_y < 0):
+                key_x, key_y = -key_x, -key_y
+            if (key_x, key_y) not in seen_keys:
+                seen_keys.add((key_x, key_y))
                 axes.append(normal)
         return axes
 
@@ -281,6 +425,40 @@ class CollisionSystem(System):
         return overlap if overlap > 0 else None
 
 
+    def _sat_test(self,
+                  entity_a_id: 'EntityID', trans_a: TransformComponent, geom_a: GeometryComponent,
+                  entity_b_id: 'EntityID', trans_b: TransformComponent, geom_b: GeometryComponent,
+                  tolerance: float = 0.0
+                  ) -> Optional[Tuple[float, float, float, Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]]:
+        """
+        SAT between two RECTANGLE/POLYGON entities. Returns (normal_x, normal_y, depth, world shape A,
+        world shape B) with the normal from B to A, or None if they are separated or not valid shapes.
+        Two proper rectangles take the closed-form OBB test, and their vertices are only built on a hit.
+        """
+        box_a = self._get_oriented_box(trans_a, geom_a)
+        box_b = self._get_oriented_box(trans_b, geom_b)
+        if box_a is not None and box_b is not None and \
+           box_a[4] > 0 and box_a[5] > 0 and box_b[4] > 0 and box_b[5] > 0:
+            hit, normal_x, normal_y, depth = obb_obb_sat(box_a, box_b, tolerance)
+            if not hit:
+                return None
+            world_shape_a = self._get_world_shape(entity_a_id, trans_a, geom_a)
+            world_shape_b = self._get_world_shape(entity_b_id, trans_b, geom_b)
+            return normal_x, normal_y, depth, world_shape_a, world_shape_b
+
+        world_shape_a = self._get_world_shape(entity_a_id, trans_a, geom_a)
+        world_shape_b = self._get_world_shape(entity_b_id, trans_b, geom_b)
+        if world_shape_a is None or world_shape_b is None:
+            return None
+        hit, normal_x, normal_y, depth = sat_polygon_polygon(
+            world_shape_a[0], world_shape_a[1], world_shape_b[0], world_shape_b[1],
+            trans_a.position.x - trans_b.position.x, trans_a.position.y - trans_b.position.y, tolerance,
+            rect_a=box_a, rect_b=box_b
+        )
+        if not hit:
+            return None
+        return normal_x, normal_y, depth, world_shape_a, world_shape_b
+
     def _check_rectangle_rectangle_collision_sat(self,
                                              entity_a_id: 'EntityID',
                                              entity_b_id: 'EntityID'
@@ -290,61 +468,26 @@ class CollisionSystem(System):
         Returns (is_colliding, contact_manifold).
         Each contact point in the manifold contains point, normal (from B to A), and penetration_depth.
         """
-        vertices_a = self._get_rotated_vertices(entity_a_id)
-        vertices_b = self._get_rotated_vertices(entity_b_id)
-
-        if not vertices_a or not vertices_b:
-            return False, None # Entities might not be rectangles or valid
-
-        axes_a = self._get_axes(vertices_a)
-        axes_b = self._get_axes(vertices_b)
-        
-        all_axes = axes_a + axes_b
-        if not all_axes:
-            return False, None
-
-        min_penetration = float('inf')
-        collision_normal_internal: Optional[Vector2D] = None # Renamed to avoid confusion with ContactPointInfo.normal
-        
-        # The following loop determines the Minimum Translation Vector (MTV)
-        # The MTV's direction is the collision_normal_internal, and its magnitude is min_penetration.
-        for axis in all_axes:
-            min_a, max_a = self._project_shape_onto_axis(vertices_a, axis)
-            min_b, max_b = self._project_shape_onto_axis(vertices_b, axis)
-
-            # Check for separation along this axis
-            if max_a < min_b or max_b < min_a:
-                return False, None # Separating axis found
-
-            # Calculate overlap
-            overlap_val = min(max_a, max_b) - max(min_a, min_b)
-
-            # If this is the smallest overlap so far, store it
-            if overlap_val < min_penetration:
-                min_penetration = overlap_val
-                collision_normal_internal = axis
-                
-                # Ensure the normal points from B to A.
-                # Project the vector from B's center to A's center onto the current axis.
-                # If the projection is in the opposite direction of the axis, flip the axis.
-                trans_a = self.entity_manager.get_component(entity_a_id, TransformComponent)
-                trans_b = self.entity_manager.get_component(entity_b_id, TransformComponent)
-                if trans_a and trans_b: # Should always be true if entities are valid
-                    center_to_center_vec = trans_a.position - trans_b.position
-                    if center_to_center_vec.dot(collision_normal_internal) < 0:
-                        collision_normal_internal = -collision_normal_internal
-        
-        if collision_normal_internal is None or min_penetration == float('inf'):
-            # This case should ideally be caught by the separation check,
-            # but as a safeguard if all_axes was empty or other edge cases.
+        # Components are fetched once per pair and handed down to the shape helpers
+        trans_a = self.entity_manager.get_component(entity_a_id, TransformComponent)
+        trans_b = self.entity_manager.get_component(entity_b_id, TransformComponent)
+        geom_a = self.entity_manager.get_component(entity_a_id, GeometryComponent)
+        geom_b = self.entity_manager.get_component(entity_b_id, GeometryComponent)
+        if not trans_a or not trans_b or not geom_a or not geom_b:
             return False, None
 
-        # collision_normal_internal should already be normalized from _get_axes
-        # min_penetration is the depth of penetration along this normal.
+        # The Minimum Translation Vector (MTV): axis of smallest overlap, oriented from B to A
+        sat_result = self._sat_test(entity_a_id, trans_a, geom_a, entity_b_id, trans_b, geom_b)
+        if sat_result is None:
+            return False, None # Separating axis found, or entities might not be rectangles or valid
+        normal_x, normal_y, min_penetration, (vertices_a, _axes_a), (vertices_b, _axes_b) = sat_result
+        collision_normal_internal = Vector2D(normal_x, normal_y) # Unit length: axes are normalized
 
         # Find contact points (as Vector2D) using the refined logic
         contact_point_vectors = self._find_contact_points_rect_rect(
-            vertices_a, vertices_b, collision_normal_internal, min_penetration
+            [Vector2D(x, y) for x, y in vertices_a.tolist()],
+            [Vector2D(x, y) for x, y in vertices_b.tolist()],
+            collision_normal_internal, min_penetration
         )
 
         if not contact_point_vectors: # Should not happen with the new _find_contact_points_rect_rect
@@ -353,11 +496,11 @@ class CollisionSystem(System):
         # Construct the contact manifold
         contact_manifold: List[ContactPointInfo] = []
         for cp_vec in contact_point_vectors:
-            contact_manifold.append({
-                "point": cp_vec,
-                "normal": collision_normal_internal, # Normal from B to A
-                "penetration_depth": min_penetration
-            })
+            contact_manifold.append(ContactPointInfo(
+                point=cp_vec,
+                normal=collision_normal_internal, # Normal from B to A
+                penetration_depth=min_penetration
+            ))
         
         return True, contact_manifold
     def _check_polygon_polygon_collision_sat(self,
@@ -381,70 +524,18 @@ class CollisionSystem(System):
             # # print(f"DEBUG: _check_polygon_polygon_collision_sat called with invalid shape B: {entity_b_id}, type {geom_b.shape_type if geom_b else 'N/A'}")
             return False, None
 
-        vertices_a = self._get_rotated_vertices(entity_a_id)
-        vertices_b = self._get_rotated_vertices(entity_b_id)
-        # # print(f"DEBUG_SAT: entity_a_id={entity_a_id}, vertices_a={str(vertices_a)[:200]}") # DEBUG LOG - Truncate for brevity - Commented out
-        # # print(f"DEBUG_SAT: entity_b_id={entity_b_id}, vertices_b={str(vertices_b)[:200]}") # DEBUG LOG - Truncate for brevity - Commented out
-
-        if not vertices_a or not vertices_b:
-            # # print(f"DEBUG: Could not get vertices for polygon collision: A empty: {not vertices_a}, B empty: {not vertices_b}")
-            return False, None # Entities might not be valid polygons or error in vertex retrieval
-
-        axes_a = self._get_axes(vertices_a)
-        axes_b = self._get_axes(vertices_b)
-        
-        all_axes = axes_a + axes_b
-        if not all_axes:
-            # # print("DEBUG: No axes found for polygon collision.")
+        # Transforms are fetched once per pair and handed down to the shape helpers
+        trans_a = self.entity_manager.get_component(entity_a_id, TransformComponent)
+        trans_b = self.entity_manager.get_component(entity_b_id, TransformComponent)
+        if not trans_a or not trans_b:
             return False, None
 
-        min_penetration = float('inf')
-        collision_normal_internal: Optional[Vector2D] = None
-        
-        for axis in all_axes:
-            if axis.magnitude_squared() < EPSILON * EPSILON: # Skip zero axes if any
-                continue
-            min_a, max_a = self._project_shape_onto_axis(vertices_a, axis)
-            min_b, max_b = self._project_shape_onto_axis(vertices_b, axis)
-
-            if max_a < min_b - EPSILON or max_b < min_a - EPSILON: # Added EPSILON for robustness
-                return False, None # Separating axis found
-
-            overlap_val = min(max_a, max_b) - max(min_a, min_b)
-
-            if overlap_val < min_penetration:
-                min_penetration = overlap_val
-                collision_normal_internal = axis
-                
-                trans_a = self.entity_manager.get_component(entity_a_id, TransformComponent)
-                trans_b = self.entity_manager.get_component(entity_b_id, TransformComponent)
-                if trans_a and trans_b:
-                    center_to_center_vec = trans_a.position - trans_b.position # Vector from B's center to A's center
-                    
-                    # Log before flipping attempt
-                    # print(f"LOG_SAT_PRE_FLIP: A={str(entity_a_id)[:8]}, B={str(entity_b_id)[:8]}")
-                    # print(f"  center_A={trans_a.position}, center_B={trans_b.position}")
-                    # print(f"  center_B_to_A_vec={center_to_center_vec}")
-                    # print(f"  initial_MTV_axis(collision_normal_internal)={collision_normal_internal}")
-                    dot_product = center_to_center_vec.dot(collision_normal_internal)
-                    # print(f"  dot_product (center_B_to_A_vec . initial_MTV_axis)={dot_product:.4f}")
-
-                    if dot_product < 0: # If MTV axis is opposite to B->A vector, flip MTV axis
-                        collision_normal_internal = -collision_normal_internal
-                        # print(f"  MTV_axis FLIPPED. New collision_normal_internal (B->A)={collision_normal_internal}")
-                    # else:
-                        # print(f"  MTV_axis NOT FLIPPED. collision_normal_internal (B->A) remains={collision_normal_internal}")
-                # else: # Should not happen if trans_a and trans_b are valid
-                #     # print(f"LOG_SAT_PRE_FLIP: Missing transform for A or B. A:{trans_a is not None}, B:{trans_b is not None}")
-
-        if collision_normal_internal is None or min_penetration == float('inf') or min_penetration < 0: # min_penetration should be positive
-            # # print(f"DEBUG: Polygon collision check failed: normal_internal is None or invalid penetration ({min_penetration})")
-            return False, None
-
-        # Ensure collision_normal_internal is normalized (it should be from _get_axes)
-        if abs(collision_normal_internal.magnitude_squared() - 1.0) > EPSILON:
-             collision_normal_internal = collision_normal_internal.normalize()
-        # # print(f"DEBUG_SAT: Pre-contact find: entity_a_id={entity_a_id}, entity_b_id={entity_b_id}, collision_normal_internal={collision_normal_internal}, min_penetration={min_penetration}") # DEBUG LOG - Commented out
+        sat_result = self._sat_test(entity_a_id, trans_a, geom_a, entity_b_id, trans_b, geom_b,
+                                    EPSILON) # Added EPSILON for robustness
+        if sat_result is None:
+            return False, None # Separating axis found, negative penetration, or invalid polygons
+        normal_x, normal_y, min_penetration, (vertices_a, _axes_a), (vertices_b, _axes_b) = sat_result
+        collision_normal_internal = Vector2D(normal_x, normal_y)
 
 
         # Find contact points (as Vector2D)
@@ -455,7 +546,13 @@ class CollisionSystem(System):
         is_fixed_b = phys_b.is_fixed if phys_b else False
         
         contact_points_on_A_surface = self._find_contact_points_polygon_polygon(
-            vertices_a, vertices_b, collision_normal_internal, min_penetration, is_fixed_a, is_fixed_b
+            [Vector2D(x, y) for x, y in vertices_a.tolist()],
+            [Vector2D(x, y) for x, y in vertices_b.tolist()],
+            collision_normal_internal, min_penetration, is_fixed_a, is_fixed_b,
+            vertex_array_a=vertices_a, vertex_array_b=vertices_b,
+            edge_normals_a=self._get_world_edge_normals(entity_a_id, vertices_a),
+            edge_normals_b=self._get_world_edge_normals(entity_b_id, vertices_b),
+            entity_a_id=entity_a_id, entity_b_id=entity_b_id
         )
 
         if not contact_points_on_A_surface:
@@ -476,11 +573,11 @@ class CollisionSystem(System):
         # This point is on the surface of A, as calculated by the clipping logic.
         representative_contact_point_world = contact_points_on_A_surface[0]
 
-        contact_manifold: List[ContactPointInfo] = [{
-            "point": representative_contact_point_world,
-            "normal": collision_normal_internal, # Normal from B to A
-            "penetration_depth": min_penetration
-        }]
+        contact_manifold: List[ContactPointInfo] = [ContactPointInfo(
+            point=representative_contact_point_world,
+            normal=collision_normal_internal, # Normal from B to A
+            penetration_depth=min_penetration
+        )]
         
         # print(f"DEBUG_SAT: Polygon-Polygon Collision. Entity A: {entity_a_id}, Entity B: {entity_b_id}")
         # print(f"DEBUG_SAT:   Normal (B->A): {collision_normal_internal}, Penetration: {min_penetration}")
@@ -517,35 +614,52 @@ class CollisionSystem(System):
 
     def _find_best_matching_edge(self,
                                  vertices: List[Vector2D],
-                                 target_normal_direction: Vector2D
+                                 target_normal_direction: Vector2D,
+                                 edge_normals: Optional[np.ndarray] = None
                                  ) -> Optional[Tuple[Vector2D, Vector2D, Vector2D]]:
         """
-        Finds the edge on the polygon whose outward normal is most aligned with target_normal_direction.
+        Finds the edge on the polygon whose outward normal is most aligned with target_normal_direction
+        (the first one on ties). `edge_normals` may pass precomputed (N, 2) outward normals of `vertices`.
         Returns (edge_v1, edge_v2, edge_outward_normal) or None.
         """
         if not vertices or len(vertices) < 2:
             return None
 
-        best_edge_v1: Optional[Vector2D] = None
-        best_edge_v2: Optional[Vector2D] = None
-        best_edge_normal: Optional[Vector2D] = None
-        max_dot = -float('inf')
+        if edge_normals is None:
+            edge_normals = outward_edge_normals(np.array([(v.x, v.y) for v in vertices], dtype=SAT_DTYPE))
+        best_index = self._find_best_matching_edge_indexed(edge_normals, target_normal_direction.x,
+                                                           target_normal_direction.y)
+        normal_x, normal_y = edge_normals[best_index].tolist()
+        return vertices[best_index], vertices[(best_index + 1) % len(vertices)], Vector2D(normal_x, normal_y)
 
-        edges = self._get_polygon_edges_with_outward_normals(vertices)
-        if not edges:
-            return None
+    @staticmethod
+    def _find_best_matching_edge_indexed(edge_normals: np.ndarray, target_x: float, target_y: float,
+                                         convex: bool = False) -> int:
+        """
+        Index form of _find_best_matching_edge over precomputed (N, 2) outward normals: returns the index i
+        of the edge (vertex i -> vertex i+1) whose normal is most aligned with (target_x, target_y), first on ties.
+        With `convex` set (see _is_convex_shape), large polygons use the O(sqrt(N)) sampled search, since outward
+        normals of a convex polygon are in angular order; anything else takes a plain argmax.
+        """
+        if convex:
+            return convex_support_index(edge_normals, target_x, target_y)
+        return int((edge_normals[:, 0] * target_x + edge_normals[:, 1] * target_y).argmax())
 
-        for v1, v2, edge_out_normal in edges:
-            dot_val = edge_out_normal.dot(target_normal_direction)
-            if dot_val > max_dot:
-                max_dot = dot_val
-                best_edge_v1 = v1
-                best_edge_v2 = v2
-                best_edge_normal = edge_out_normal
-        
-        if best_edge_v1 and best_edge_v2 and best_edge_normal:
-            return best_edge_v1, best_edge_v2, best_edge_normal
-        return None
+    def _find_best_matching_edge_cached(self, entity_id: 'EntityID', edge_normals: np.ndarray,
+                                        target_x: float, target_y: float) -> int:
+        """
+        _find_best_matching_edge_indexed memoized per entity and exact target normal while `edge_normals` (from
+        _get_world_edge_normals) is current. In resting stacks the same body is asked again with the same normal
+        by every neighbour (e.g. the ground against each box), so those lookups skip the scan.
+        """
+        entry = self._best_edge_cache.get(entity_id)
+        if entry is None or entry[0] is not edge_normals:
+            entry = self._best_edge_cache[entity_id] = (edge_normals, {})
+        index = entry[1].get((target_x, target_y))
+        if index is None:
+            index = entry[1][(target_x, target_y)] = self._find_best_matching_edge_indexed(
+                edge_normals, target_x, target_y, self._is_convex_shape(entity_id))
+        return index
 
     def _clip_line_segment_to_line_segment_region(self,
                                               incident_v1: Vector2D, incident_v2: Vector2D,
@@ -555,131 +669,28 @@ class CollisionSystem(System):
         Clips the incident_segment (incident_v1, incident_v2) against the 'support region'
         of the reference_segment (ref_v1, ref_v2). The support region is defined by two
         lines perpendicular to the reference segment, passing through its endpoints.
-        Uses a Cyrus-Beck-like approach by parameterizing the incident segment and finding
-        intersection parameters with the two clipping lines.
+        Uses Liang-Barsky clipping (collision_kernels.clip_segment_to_support_region, scalar float math):
+        the incident segment is parameterized and both clipping lines share one direction term.
         Returns the clipped segment (cp1, cp2) or None if no overlap or segment is outside.
         """
-        # print(f"DEBUG_CLIP: Start clipping incident seg ({incident_v1}, {incident_v2}) against ref seg ({ref_v1}, {ref_v2})")
-        # # print(f"DETAILED_LOG: _clip_line_segment_to_line_segment_region:") # Removed
-        # # print(f"DETAILED_LOG:   incident_v1: {incident_v1}, incident_v2: {incident_v2}") # Removed
-        # # print(f"DETAILED_LOG:   ref_v1: {ref_v1}, ref_v2: {ref_v2}") # Removed
-
-        ref_edge_vec = ref_v2 - ref_v1
-        incident_edge_vec = incident_v2 - incident_v1
-
-        if ref_edge_vec.magnitude_squared() < EPSILON * EPSILON:
-            # print(f"DEBUG_CLIP: Reference edge is a point ({ref_v1}). Cannot form clipping region.")
-            # If incident segment itself is also a point and matches ref_v1, it's a point contact.
-            if incident_edge_vec.magnitude_squared() < EPSILON * EPSILON and \
-               (incident_v1 - ref_v1).magnitude_squared() < EPSILON * EPSILON:
-                return ref_v1, ref_v1
-            return None
-
-        # Normals of the two clipping lines (perpendicular to ref_edge_vec)
-        # These normals point "outside" the valid region if we consider the ref_edge_vec direction.
-        # Let's define normals that point "inward" to the support region of the reference edge.
-        # Clip line 1: Passes through ref_v1, normal is ref_edge_vec.normalize()
-        # Clip line 2: Passes through ref_v2, normal is -ref_edge_vec.normalize()
-
-        clip_line_normal1 = ref_edge_vec.normalize()
-        clip_line_normal2 = -ref_edge_vec.normalize()
-
-        # Parameter t for the incident segment: P(t) = incident_v1 + t * incident_edge_vec, for t in [0, 1]
-        t_enter = 0.0  # Max of t_enters
-        t_leave = 1.0  # Min of t_leaves
-
-        # Clip against Line 1 (at ref_v1, normal along ref_edge_vec)
-        # N = clip_line_normal1, P0 = ref_v1, S = incident_v1, D = incident_edge_vec
-        # We want (P(t) - P0) . N >= 0  =>  (S + tD - P0) . N >= 0
-        # (S - P0) . N + t (D . N) >= 0
-        # t (D . N) >= -(S - P0) . N
-        # t (D . N) >= (P0 - S) . N
-        
-        # Numerator for t: (P0 - S) . N
-        # Denominator for t: D . N
-        
-        # Denominator for line 1
-        denom1 = incident_edge_vec.dot(clip_line_normal1)
-        # Numerator for line 1
-        num1 = (ref_v1 - incident_v1).dot(clip_line_normal1)
-
-        if abs(denom1) < EPSILON: # Incident segment is parallel to clip line 1
-            if num1 < -EPSILON: # Incident segment is outside and parallel (P0-S).N < 0 means S is on the "wrong" side
-                # print(f"DEBUG_CLIP: Parallel to clip line 1 and outside (num1={num1}). No clip.")
-                return None
-            # else: parallel and inside or on the line, no change to t_enter/t_leave from this line
-        else:
-            t = num1 / denom1
-            if denom1 > 0: # Line enters from outside to inside (D.N > 0)
-                t_enter = max(t_enter, t)
-                # print(f"DEBUG_CLIP: ClipLine1 (enter): t={t:.3f}, t_enter={t_enter:.3f} (denom1={denom1:.3f}, num1={num1:.3f})")
-                # # print(f"DETAILED_LOG:   ClipLine1 (enter): t_raw={t}, current t_enter={t_enter}") # Removed
-            else: # Line leaves from inside to outside (D.N < 0)
-                t_leave = min(t_leave, t)
-                # print(f"DEBUG_CLIP: ClipLine1 (leave): t={t:.3f}, t_leave={t_leave:.3f} (denom1={denom1:.3f}, num1={num1:.3f})")
-                # # print(f"DETAILED_LOG:   ClipLine1 (leave): t_raw={t}, current t_leave={t_leave}") # Removed
-
-        if t_enter > t_leave + EPSILON: # +EPSILON for robustness with floating point comparisons
-            # print(f"DEBUG_CLIP: t_enter ({t_enter:.3f}) > t_leave ({t_leave:.3f}) after clip line 1. No clip.")
-            return None
-
-        # Clip against Line 2 (at ref_v2, normal against ref_edge_vec)
-        # N = clip_line_normal2, P0 = ref_v2
-        denom2 = incident_edge_vec.dot(clip_line_normal2)
-        num2 = (ref_v2 - incident_v1).dot(clip_line_normal2)
-
-        if abs(denom2) < EPSILON: # Incident segment is parallel to clip line 2
-            if num2 < -EPSILON: # Incident segment is outside and parallel
-                # print(f"DEBUG_CLIP: Parallel to clip line 2 and outside (num2={num2}). No clip.")
-                return None
-        else:
-            t = num2 / denom2
-            if denom2 > 0: # Line enters from outside to inside
-                t_enter = max(t_enter, t)
-                # print(f"DEBUG_CLIP: ClipLine2 (enter): t={t:.3f}, t_enter={t_enter:.3f} (denom2={denom2:.3f}, num2={num2:.3f})")
-                # # print(f"DETAILED_LOG:   ClipLine2 (enter): t_raw={t}, current t_enter={t_enter}") # Removed
-            else: # Line leaves from inside to outside
-                t_leave = min(t_leave, t)
-                # print(f"DEBUG_CLIP: ClipLine2 (leave): t={t:.3f}, t_leave={t_leave:.3f} (denom2={denom2:.3f}, num2={num2:.3f})")
-                # # print(f"DETAILED_LOG:   ClipLine2 (leave): t_raw={t}, current t_leave={t_leave}") # Removed
-        
-        if t_enter > t_leave + EPSILON:
-            # print(f"DEBUG_CLIP: t_enter ({t_enter:.3f}) > t_leave ({t_leave:.3f}) after clip line 2. No clip.")
-            return None
-
-        # Ensure t_enter and t_leave are within [0,1] range of the original incident segment
-        final_t_start = max(0.0, t_enter)
-        final_t_end = min(1.0, t_leave)
-        
-        # print(f"DEBUG_CLIP: Original t_range: [0,1]. Clipped t_range before [0,1] clamp: [{t_enter:.3f}, {t_leave:.3f}]")
-        # print(f"DEBUG_CLIP: Final t_range after [0,1] clamp: [{final_t_start:.3f}, {final_t_end:.3f}]")
-        # # print(f"DETAILED_LOG:   t_enter_final: {final_t_start}, t_leave_final: {final_t_end}") # Removed
-
-
-        if final_t_start > final_t_end + EPSILON : # Segment is completely outside or reduced to less than a point
-            # print(f"DEBUG_CLIP: Final t_start ({final_t_start:.3f}) > final_t_end ({final_t_end:.3f}). No valid clipped segment.")
+        clipped = clip_segment_to_support_region(incident_v1.x, incident_v1.y, incident_v2.x, incident_v2.y,
+                                                 ref_v1.x, ref_v1.y, ref_v2.x, ref_v2.y, EPSILON)
+        if clipped is None:
             return None
-        
-        # If the segment is extremely short (effectively a point)
-        if abs(final_t_start - final_t_end) < EPSILON:
-             # Check if this point is within the original [0,1] range of the incident segment
-            if 0.0 - EPSILON <= final_t_start <= 1.0 + EPSILON:
-                clipped_point = incident_v1 + incident_edge_vec * final_t_start
-                # print(f"DEBUG_CLIP: Clipped segment is a point: {clipped_point}")
-                # # print(f"DETAILED_LOG:   Clipped result is a point: {clipped_point}") # Removed
-                return clipped_point, clipped_point
-            else: # Point is outside original segment
-                # print(f"DEBUG_CLIP: Clipped point {final_t_start:.3f} is outside original segment [0,1]. No clip.")
-                return None
-
-
-        clipped_v1 = incident_v1 + incident_edge_vec * final_t_start
-        clipped_v2 = incident_v1 + incident_edge_vec * final_t_end
-        
-        # print(f"DEBUG_CLIP: Successfully clipped segment: ({clipped_v1} -> {clipped_v2})")
-        # # print(f"DETAILED_LOG:   Clipped result segment: v1={clipped_v1}, v2={clipped_v2}") # Removed
-        return clipped_v1, clipped_v2
+        return Vector2D(clipped[0], clipped[1]), Vector2D(clipped[2], clipped[3])
 
+    @staticmethod
+    def _centroid(vertices: List[Vector2D]) -> Vector2D:
+        """Vertex average via scalar sums; (0, 0) for an empty list."""
+        if not vertices:
+            return Vector2D(0, 0)
+        sum_x = 0.0
+        sum_y = 0.0
+        for v in vertices:
+            sum_x += v.x
+            sum_y += v.y
+        count = len(vertices)
+        return Vector2D(sum_x / count, sum_y / count)
 
     def _find_contact_points_polygon_polygon(self,
                                            vertices_a: List[Vector2D], # Vertices of polygon A (reference)
@@ -687,7 +698,13 @@ class CollisionSystem(System):
                                            collision_normal: Vector2D, # Collision normal, from B to A
                                            penetration: float,
                                            is_fixed_a: bool, # Added: True if entity A is fixed
-                                           is_fixed_b: bool  # Added: True if entity B is fixed
+                                           is_fixed_b: bool, # Added: True if entity B is fixed
+                                           vertex_array_a: Optional[np.ndarray] = None,
+                                           vertex_array_b: Optional[np.ndarray] = None,
+                                           edge_normals_a: Optional[np.ndarray] = None,
+                                           edge_normals_b: Optional[np.ndarray] = None,
+                                           entity_a_id: Optional['EntityID'] = None,
+                                           entity_b_id: Optional['EntityID'] = None
                                            ) -> List[Vector2D]:
         """
         Finds contact points for a polygon-polygon collision.
@@ -695,215 +712,160 @@ class CollisionSystem(System):
         The collision_normal points from B to A.
         This implementation uses edge clipping to find a contact manifold (line segment)
         and returns its midpoint as the single representative contact point.
+        vertex_array_a/b may pass the same vertices as (N, 2) arrays (e.g. from the SAT cache); the edge
+        selection and vertex searches run on these arrays, Vector2D is only used for the selected features.
+        edge_normals_a/b may likewise pass their outward edge normals (see _get_world_edge_normals); with the
+        entity IDs as well, the edge selections are memoized per frame (_find_best_matching_edge_cached).
         """
-        # print(f"DEBUG_CONTACT_MANIFOLD: ======== Start _find_contact_points_polygon_polygon ========")
-        # # print(f"DETAILED_LOG: _find_contact_points_polygon_polygon called with:") # Removed
-        # # print(f"DETAILED_LOG:   vertices_a (count: {len(vertices_a)}): {vertices_a}") # Removed
-        # # print(f"DETAILED_LOG:   vertices_b (count: {len(vertices_b)}): {vertices_b}") # Removed
-        # # print(f"DETAILED_LOG:   collision_normal (B->A): {collision_normal}") # Removed
-        # # print(f"DETAILED_LOG:   penetration: {penetration}") # Removed
-        # # print(f"DETAILED_LOG:   is_fixed_a: {is_fixed_a}, is_fixed_b: {is_fixed_b}") # Removed
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Poly A Vertices ({len(vertices_a)}): {str(vertices_a)}")
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Poly B Vertices ({len(vertices_b)}): {str(vertices_b)}") # Keeping original for context if needed
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Collision Normal (B->A): {collision_normal}, Penetration: {penetration}") # Keeping original
 
         if not vertices_a or not vertices_b:
-            # print("DEBUG_CONTACT_MANIFOLD:   Error: Empty vertices list provided.")
             return []
+        if vertex_array_a is None:
+            vertex_array_a = np.array([(v.x, v.y) for v in vertices_a], dtype=SAT_DTYPE)
+        if vertex_array_b is None:
+            vertex_array_b = np.array([(v.x, v.y) for v in vertices_b], dtype=SAT_DTYPE)
         
         # --- Enhanced Feature Recognition Logic ---
         # The previous ground contact heuristic has been removed as it caused issues with partial overlaps.
         # The general SAT + feature finding logic below should handle these cases more robustly.
-        # print(f"LOG_CONTACT_GEN:   Skipping specialized ground contact heuristic. Using general polygon-polygon logic.")
-
         # Step a: Find deepest penetrating vertices of B (incident body)
         # Reference edge on A: its outward normal is most anti-parallel to collision_normal (B->A).
         # So, edge_normal_a.dot(collision_normal) is minimized (closest to -1).
         # Or, edge_normal_a.dot(-collision_normal) is maximized (closest to +1).
         # Target normal for A's edge: -collision_normal (points from A towards B, or into A if collision_normal is B->A)
         
-        ref_edge_info_A = self._find_best_matching_edge(vertices_a, -collision_normal)
-        if not ref_edge_info_A:
-            # print("DEBUG_CONTACT_MANIFOLD:   Error: Could not find reference edge on Polygon A.")
+        # Edge selection works on indices into the vertex arrays, and the feature math below on float pairs:
+        # only the returned contact point is built as a Vector2D.
+        if len(vertices_a) < 2:
             # Fallback to a simple point (e.g., center of B pushed back)
-            center_b = sum(vertices_b, Vector2D(0,0)) / len(vertices_b) if vertices_b else Vector2D(0,0)
+            center_b = self._centroid(vertices_b)
             return [center_b - collision_normal * penetration]
-        
-        ref_edge_v1_a, ref_edge_v2_a, ref_edge_normal_a = ref_edge_info_A
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Reference Edge A: ({ref_edge_v1_a} -> {ref_edge_v2_a}), Normal_A_out: {ref_edge_normal_a}")
-        # # print(f"DETAILED_LOG:   Selected Reference Edge A (v1, v2, normal_out): {ref_edge_info_A}") # Removed
+        normal_x, normal_y = collision_normal.x, collision_normal.y
+        if edge_normals_a is None:
+            edge_normals_a = outward_edge_normals(vertex_array_a)
+        if entity_a_id is not None:
+            ref_index_a = self._find_best_matching_edge_cached(entity_a_id, edge_normals_a, -normal_x, -normal_y)
+        else:
+            ref_index_a = self._find_best_matching_edge_indexed(edge_normals_a, -normal_x, -normal_y)
+        ref_v1_x, ref_v1_y = vertex_array_a[ref_index_a].tolist()
+        ref_v2_x, ref_v2_y = vertex_array_a[(ref_index_a + 1) % len(vertices_a)].tolist()
+        ref_normal_x, ref_normal_y = edge_normals_a[ref_index_a].tolist() # Outward normal of A's reference edge
+        # Shared by every clamp-to-reference-edge projection below
+        ref_seg_x = ref_v2_x - ref_v1_x
+        ref_seg_y = ref_v2_y - ref_v1_y
+        ref_edge_len_sq = ref_seg_x ** 2 + ref_seg_y ** 2
+        ref_edge_degenerate = ref_edge_len_sq < EPSILON * EPSILON
 
         # --- PRIORITY: Vertex-Face Contact Check (based on deepest penetrating point of B relative to A's reference face) ---
-        # ref_edge_normal_a is the outward normal of A's reference edge.
+        # (ref_normal_x, ref_normal_y) is the outward normal of A's reference edge.
         # We want to find vertices of B that are "deepest" into A's half-space defined by this reference edge.
-        min_signed_dist_to_A_face = float('inf')
-        deepest_vertices_b_list: List[Vector2D] = []
-        if not vertices_b: # Should be caught earlier
-            # print("DEBUG_CONTACT_MANIFOLD:   Error: vertices_b is empty before primary vertex-face check.")
-            return [(ref_edge_v1_a + ref_edge_v2_a) * 0.5]
-
-        for v_b_candidate in vertices_b:
-            # Calculate signed distance from v_b_candidate to the plane of A's reference edge.
-            # A negative distance indicates penetration into A's material (if ref_edge_normal_a points outward from A).
-            dist_to_ref_plane = (v_b_candidate - ref_edge_v1_a).dot(ref_edge_normal_a)
-            if abs(dist_to_ref_plane - min_signed_dist_to_A_face) < EPSILON: # Allow for multiple vertices at the same depth
-                deepest_vertices_b_list.append(v_b_candidate)
-            elif dist_to_ref_plane < min_signed_dist_to_A_face:
-                min_signed_dist_to_A_face = dist_to_ref_plane
-                deepest_vertices_b_list = [v_b_candidate]
-        
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Primary V-F Check: Min signed dist to A's ref face: {min_signed_dist_to_A_face:.4f}, Num deepest B vertices: {len(deepest_vertices_b_list)}")
-
-        is_point_feature_contact = False
-        incident_feature_point_b: Optional[Vector2D] = None
-
-        if len(deepest_vertices_b_list) == 1:
-            is_point_feature_contact = True
-            incident_feature_point_b = deepest_vertices_b_list[0]
-            # print(f"DEBUG_CONTACT_MANIFOLD:   Primary V-F Check: Single deepest vertex B: {incident_feature_point_b}")
-        elif len(deepest_vertices_b_list) == 2:
-            v1_b, v2_b = deepest_vertices_b_list[0], deepest_vertices_b_list[1]
+        # One fused pass over B's vertices, taken relative to the reference edge start, against both directions at once:
+        # column 0 is the signed distance to the plane of A's reference edge (negative = penetrating A's
+        # material, the reference normal points outward from A), column 1 the projection onto collision_normal
+        # (shifted by a constant, so its argmin is still B's deepest vertex along the normal, used by the fallback).
+        depths_b = ((vertex_array_b[:, 0:1] - ref_v1_x) * np.array((ref_normal_x, normal_x)) +
+                    (vertex_array_b[:, 1:2] - ref_v1_y) * np.array((ref_normal_y, normal_y)))
+        dists_to_ref_plane = depths_b[:, 0]
+        deepest_index = int(dists_to_ref_plane.argmin())
+        # Allow for multiple vertices at the same depth (within EPSILON of the deepest one);
+        # the tie count alone classifies the feature, indices are only gathered when needed.
+        deepest_mask = dists_to_ref_plane - dists_to_ref_plane[deepest_index] < EPSILON
+        deepest_count = int(np.count_nonzero(deepest_mask))
+
+        incident_feature_point_b: Optional[Tuple[float, float]] = None
+
+        if deepest_count == 1:
+            incident_feature_point_b = tuple(vertex_array_b[deepest_index].tolist())
+        elif deepest_count == 2:
+            (v1_b_x, v1_b_y), (v2_b_x, v2_b_y) = vertex_array_b[deepest_mask].tolist()
             # Consider them a "point feature" if they are very close (e.g., a very short edge)
             # This threshold might need tuning.
             vertex_cluster_threshold_sq = (EPSILON * 20)**2 # Increased threshold slightly
-            if (v1_b - v2_b).magnitude_squared() < vertex_cluster_threshold_sq:
-                is_point_feature_contact = True
-                incident_feature_point_b = (v1_b + v2_b) * 0.5
-                # print(f"DEBUG_CONTACT_MANIFOLD:   Primary V-F Check: Two very close deepest B vertices, using midpoint: {incident_feature_point_b}")
-            # else:
-                # print(f"DEBUG_CONTACT_MANIFOLD:   Primary V-F Check: Two deepest B vertices are not close enough to be a single point feature.")
-        # else: # More than 2 deepest vertices, likely a face.
-             # print(f"DEBUG_CONTACT_MANIFOLD:   Primary V-F Check: {len(deepest_vertices_b_list)} deepest B vertices, not a point feature.")
-
-
-        if is_point_feature_contact and incident_feature_point_b:
-            # print(f"DEBUG_CONTACT_MANIFOLD:   Prioritizing Vertex-Face contact based on deepest point(s) of B. Incident Feature B: {incident_feature_point_b}")
-            
-            projected_contact_on_A_line = self._project_point_onto_line(incident_feature_point_b, ref_edge_v1_a, ref_edge_v2_a)
-            
-            ref_edge_segment_vec = ref_edge_v2_a - ref_edge_v1_a
-            if ref_edge_segment_vec.magnitude_squared() < EPSILON * EPSILON:
-                final_contact_point_on_A = ref_edge_v1_a
-            else:
-                t = (projected_contact_on_A_line - ref_edge_v1_a).dot(ref_edge_segment_vec) / ref_edge_segment_vec.magnitude_squared()
-                clamped_t = max(0.0, min(1.0, t))
-                final_contact_point_on_A = ref_edge_v1_a + ref_edge_segment_vec * clamped_t
-            
-            # print(f"DEBUG_CONTACT_MANIFOLD:   Vertex-Face contact point (on A's surface): {final_contact_point_on_A}")
-            # print(f"DEBUG_CONTACT_MANIFOLD: ======== End _find_contact_points_polygon_polygon (Priority Vertex-Face) ========")
-            return [final_contact_point_on_A]
+            if (v1_b_x - v2_b_x) ** 2 + (v1_b_y - v2_b_y) ** 2 < vertex_cluster_threshold_sq:
+                incident_feature_point_b = ((v1_b_x + v2_b_x) * 0.5, (v1_b_y + v2_b_y) * 0.5)
+        # More than 2 deepest vertices: likely a face, handled by clipping below
+
+        if incident_feature_point_b is not None:
+            # Clamped projection onto A's reference edge; t comes straight from the feature point
+            # (projecting it onto the line first would give the same t)
+            if ref_edge_degenerate:
+                return [Vector2D(ref_v1_x, ref_v1_y)]
+            feature_x, feature_y = incident_feature_point_b
+            t = ((feature_x - ref_v1_x) * ref_seg_x + (feature_y - ref_v1_y) * ref_seg_y) / ref_edge_len_sq
+            clamped_t = max(0.0, min(1.0, t))
+            return [Vector2D(ref_v1_x + ref_seg_x * clamped_t, ref_v1_y + ref_seg_y * clamped_t)]
 
         # --- If not a clear Vertex-Face, proceed to find incident edge and then clip ---
-        # print(f"DEBUG_CONTACT_MANIFOLD:   No clear single-point V-F contact. Proceeding to find incident edge for B.")
         # 1b. Determine Incident Edge on Polygon B
         # Incident edge on B: its outward normal is most parallel to collision_normal (B->A).
         # So, edge_normal_b.dot(collision_normal) is maximized (closest to +1).
-        inc_edge_info_B = self._find_best_matching_edge(vertices_b, collision_normal)
-        if not inc_edge_info_B:
-            # print("DEBUG_CONTACT_MANIFOLD:   Error: Could not find incident edge on Polygon B (after V-F check).")
+        if len(vertices_b) < 2:
             # Fallback, though primary V-F should have caught pure vertex contacts.
             # This might happen if V-F was borderline and then no good edge found.
-            if deepest_vertices_b_list: # Use average of deepest if available
-                 center_b = sum(deepest_vertices_b_list, Vector2D(0,0)) / len(deepest_vertices_b_list)
-                 return [center_b - collision_normal * penetration] # Push back along normal
-            center_b_fallback = sum(vertices_b, Vector2D(0,0)) / len(vertices_b) if vertices_b else Vector2D(0,0)
-            return [center_b_fallback - collision_normal * penetration]
+            # Use the average of the deepest vertices if available (NaN distances leave none)
+            if deepest_count:
+                center_b = self._centroid([vertices_b[i] for i in np.flatnonzero(deepest_mask).tolist()])
+            else:
+                center_b = self._centroid(vertices_b)
+            return [center_b - collision_normal * penetration] # Push back along normal
 
+        if edge_normals_b is None:
+            edge_normals_b = outward_edge_normals(vertex_array_b)
+        if entity_b_id is not None:
+            inc_index_b = self._find_best_matching_edge_cached(entity_b_id, edge_normals_b, normal_x, normal_y)
+        else:
+            inc_index_b = self._find_best_matching_edge_indexed(edge_normals_b, normal_x, normal_y)
+        inc_v1_x, inc_v1_y = vertex_array_b[inc_index_b].tolist()
+        inc_v2_x, inc_v2_y = vertex_array_b[(inc_index_b + 1) % len(vertices_b)].tolist()
 
-        inc_edge_v1_b, inc_edge_v2_b, inc_edge_normal_b = inc_edge_info_B # inc_edge_normal_b is outward normal of B's edge
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Selected Incident Edge B for clipping: ({inc_edge_v1_b} -> {inc_edge_v2_b}), Normal_B_out: {inc_edge_normal_b}")
-        
-        # --- Edge-Edge Contact (Clipping) Logic --- (This was the previous V-F check location, now it's just edge-edge)
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Proceeding with Edge-Edge (clipping) logic using selected incident edge B.")
-        
-        clipped_incident_segment = self._clip_line_segment_to_line_segment_region(
-            inc_edge_v1_b, inc_edge_v2_b,
-            ref_edge_v1_a, ref_edge_v2_a
-        )
+        # --- Edge-Edge Contact (Clipping) Logic ---
+        clipped_incident_segment = clip_segment_to_support_region(inc_v1_x, inc_v1_y, inc_v2_x, inc_v2_y,
+                                                                  ref_v1_x, ref_v1_y, ref_v2_x, ref_v2_y, EPSILON)
 
-        if not clipped_incident_segment:
-            # print("DEBUG_CONTACT_MANIFOLD:   Clipping failed or resulted in no segment. Attempting vertex-based fallback.")
+        if clipped_incident_segment is None:
             # Fallback: project the most penetrating vertex of B onto reference edge A.
             # Find vertex of B "deepest" along collision_normal (B->A).
-            # This means its projection on collision_normal is minimal.
-            min_proj_val_b = float('inf')
-            deepest_vertex_b: Optional[Vector2D] = None
-            if not vertices_b:
-                 # print("DEBUG_CONTACT_MANIFOLD:   Error: vertices_b is empty in fallback.")
-                 return [(ref_edge_v1_a + ref_edge_v2_a) * 0.5] # Last resort
-
-            for v_b_candidate in vertices_b:
-                proj = v_b_candidate.dot(collision_normal)
-                if proj < min_proj_val_b:
-                    min_proj_val_b = proj
-                    deepest_vertex_b = v_b_candidate
-            
-            if deepest_vertex_b:
-                # Project this deepest vertex of B onto the reference edge A's line segment
-                projected_contact = self._project_point_onto_line(deepest_vertex_b, ref_edge_v1_a, ref_edge_v2_a)
-                # Clamp to the reference edge segment
-                ref_edge_segment_vec = ref_edge_v2_a - ref_edge_v1_a
-                if ref_edge_segment_vec.magnitude_squared() < EPSILON * EPSILON: # Ref edge is a point
-                    final_contact_point_on_A = ref_edge_v1_a
-                else:
-                    t = (projected_contact - ref_edge_v1_a).dot(ref_edge_segment_vec) / ref_edge_segment_vec.magnitude_squared()
-                    clamped_t = max(0.0, min(1.0, t))
-                    final_contact_point_on_A = ref_edge_v1_a + ref_edge_segment_vec * clamped_t
-                
-                # print(f"DEBUG_CONTACT_MANIFOLD:   Fallback: Deepest B vertex {deepest_vertex_b} projected to Ref Edge A as {final_contact_point_on_A}")
-                # # print(f"DETAILED_LOG:   Fallback contact point: {final_contact_point_on_A}") # Removed
-                # print(f"DEBUG_CONTACT_MANIFOLD: ======== End _find_contact_points_polygon_polygon (Fallback) ========")
-                return [final_contact_point_on_A]
-            # else:
-                # print("DEBUG_CONTACT_MANIFOLD:   Fallback failed: no deepest vertex found on B. Using midpoint of reference edge A.")
-                fallback_point = (ref_edge_v1_a + ref_edge_v2_a) * 0.5
-                # # print(f"DETAILED_LOG:   Fallback (no deepest B vertex) contact point: {fallback_point}") # Removed
-                return [fallback_point]
-
-        clip_p1, clip_p2 = clipped_incident_segment # These are on incident body B
-        
-        # Helper to project a point onto a line segment and clamp it
-        def project_and_clamp_to_segment(point_to_project: Vector2D, seg_v1: Vector2D, seg_v2: Vector2D) -> Vector2D:
-            projected_on_line = self._project_point_onto_line(point_to_project, seg_v1, seg_v2)
-            seg_vec = seg_v2 - seg_v1
-            
-            # Check if segment is a point
-            seg_len_sq = seg_vec.magnitude_squared()
-            if seg_len_sq < EPSILON * EPSILON:
-                return seg_v1
-
-            t = (projected_on_line - seg_v1).dot(seg_vec) / seg_len_sq
+            # This means its projection on collision_normal is minimal (already computed in the fused pass).
+            if ref_edge_degenerate: # Ref edge is a point
+                return [Vector2D(ref_v1_x, ref_v1_y)]
+            deepest_x, deepest_y = vertex_array_b[int(depths_b[:, 1].argmin())].tolist()
+            # Project this deepest vertex of B onto the reference edge A's line segment, clamped
+            t = ((deepest_x - ref_v1_x) * ref_seg_x + (deepest_y - ref_v1_y) * ref_seg_y) / ref_edge_len_sq
             clamped_t = max(0.0, min(1.0, t))
-            return seg_v1 + seg_vec * clamped_t
+            return [Vector2D(ref_v1_x + ref_seg_x * clamped_t, ref_v1_y + ref_seg_y * clamped_t)]
+
+        clip_p1_x, clip_p1_y, clip_p2_x, clip_p2_y = clipped_incident_segment # These are on incident body B
 
         # Project both endpoints of the (potentially point-like) clipped incident segment
         # onto the reference edge A's segment (projection + clamping)
-        final_proj_clip_p1_on_A = project_and_clamp_to_segment(clip_p1, ref_edge_v1_a, ref_edge_v2_a)
-        final_proj_clip_p2_on_A = project_and_clamp_to_segment(clip_p2, ref_edge_v1_a, ref_edge_v2_a)
-        
+        if ref_edge_degenerate: # Ref edge is a point
+            return [Vector2D(ref_v1_x, ref_v1_y)]
+        t1 = max(0.0, min(1.0, ((clip_p1_x - ref_v1_x) * ref_seg_x + (clip_p1_y - ref_v1_y) * ref_seg_y) / ref_edge_len_sq))
+        t2 = max(0.0, min(1.0, ((clip_p2_x - ref_v1_x) * ref_seg_x + (clip_p2_y - ref_v1_y) * ref_seg_y) / ref_edge_len_sq))
+
         # The final contact point is the midpoint of this segment on A's surface
-        final_contact_point_on_A = (final_proj_clip_p1_on_A + final_proj_clip_p2_on_A) * 0.5
-        
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Clipped incident segment on B: ({clip_p1} -> {clip_p2})")
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Clipped P1 on B projected-clamped to A: {final_proj_clip_p1_on_A}")
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Clipped P2 on B projected-clamped to A: {final_proj_clip_p2_on_A}")
-        # print(f"DEBUG_CONTACT_MANIFOLD:   Final Contact Point (Midpoint on A's surface): {final_contact_point_on_A}")
-        # # print(f"DETAILED_LOG:   Clipped incident segment (on B): p1={clip_p1}, p2={clip_p2}") # Removed
-        # # print(f"DETAILED_LOG:   Projected clipped segment on A: p1_proj={final_proj_clip_p1_on_A}, p2_proj={final_proj_clip_p2_on_A}") # Removed
-        # # print(f"DETAILED_LOG:   Final representative contact_point_world: {final_contact_point_on_A}") # Removed
-        # print(f"DEBUG_CONTACT_MANIFOLD: ======== End _find_contact_points_polygon_polygon (Success) ========")
-        return [final_contact_point_on_A]
+        return [Vector2D((ref_v1_x + ref_seg_x * t1 + (ref_v1_x + ref_seg_x * t2)) * 0.5,
+                         (ref_v1_y + ref_seg_y * t1 + (ref_v1_y + ref_seg_y * t2)) * 0.5)]
+
     def _find_contact_points_polygon_circle(self,
                                             polygon_vertices: List[Vector2D],
                                             polygon_center: Vector2D, # For reference, might not be needed if vertices are world
                                             circle_center: Vector2D,
                                             circle_radius: float,
                                             normal: Vector2D, # Normal from Polygon to Circle
-                                            penetration: float) -> List[Vector2D]:
+                                            penetration: float,
+                                            vertex_array: Optional[np.ndarray] = None,
+                                            feature_edge_index: Optional[int] = None,
+                                            feature_vertex_index: Optional[int] = None) -> List[Vector2D]:
         """
         Finds contact point(s) for a polygon-circle collision. (Placeholder)
         Normal points from the Polygon towards the Circle.
         Returns a list containing one contact point.
+        vertex_array may pass the polygon vertices as an (N, 2) array; the closest-edge search runs on it.
+        feature_edge_index / feature_vertex_index may pass the feature SAT's minimum-overlap axis came from
+        (edge i -> i+1, or the vertex nearest the circle): when the circle center lies in that feature's region,
+        the closest point is taken from it directly and the all-edges search is skipped. Both shortcuts assume a
+        convex polygon, so callers pass the hints only for strictly convex shapes (_is_convex_shape).
         """
         # Placeholder: Contact point on circle surface along the normal from polygon.
         # contact_on_circle = circle_center - normal * circle_radius
@@ -912,37 +874,55 @@ class CollisionSystem(System):
         # contact_on_polygon = circle_center - normal * (circle_radius - penetration)
         
         # More robust: Find the point on the polygon's perimeter closest to the circle's center.
-        min_dist_sq_to_edge = float('inf')
-        contact_point_on_polygon_edge = polygon_vertices[0] if polygon_vertices else circle_center # Fallback
-
         if not polygon_vertices: # Should not happen if polygon is valid
             # Fallback: if no polygon vertices, use a point on circle based on normal
             return [circle_center - normal * (circle_radius - penetration)]
-
-        for i in range(len(polygon_vertices)):
-            p1 = polygon_vertices[i]
-            p2 = polygon_vertices[(i + 1) % len(polygon_vertices)]
-            edge_vec = p2 - p1
-            len_sq = edge_vec.magnitude_squared()
-
-            if len_sq == 0: # Edge is a point
-                # Distance from circle_center to p1
-                closest_point_on_segment = p1
-            else:
-                # Project circle_center onto the line defined by p1 and edge_vec
-                t = (circle_center - p1).dot(edge_vec) / len_sq
-                t = max(0, min(1, t)) # Clamp t to be between 0 and 1 for segment
-                closest_point_on_segment = p1 + edge_vec * t
-            
-            dist_sq = (circle_center - closest_point_on_segment).magnitude_squared()
-
-            if dist_sq < min_dist_sq_to_edge:
-                min_dist_sq_to_edge = dist_sq
-                contact_point_on_polygon_edge = closest_point_on_segment
-        
-        # This contact_point_on_polygon_edge is the feature on the polygon (vertex or edge point)
-        # that is closest to the circle's center. This is our contact point on the polygon.
-        return [contact_point_on_polygon_edge]
+        if vertex_array is None:
+            vertex_array = np.array([(v.x, v.y) for v in polygon_vertices], dtype=SAT_DTYPE)
+
+        center_x, center_y = circle_center.x, circle_center.y
+        count = len(vertex_array)
+        if feature_edge_index is not None and count >= 3:
+            (p1_x, p1_y), (p2_x, p2_y), (p3_x, p3_y) = vertex_array[
+                [feature_edge_index, (feature_edge_index + 1) % count, (feature_edge_index + 2) % count]].tolist()
+            edge_x = p2_x - p1_x
+            edge_y = p2_y - p1_y
+            len_sq = edge_x * edge_x + edge_y * edge_y # Products, as the array search squares (not pow)
+            if len_sq > 0:
+                t = ((center_x - p1_x) * edge_x + (center_y - p1_y) * edge_y) / len_sq
+                # Strictly within the edge's span and on the other side of its line than the rest of the polygon:
+                # for a convex polygon the projection onto this edge is then the closest perimeter point.
+                side_center = edge_x * (center_y - p1_y) - edge_y * (center_x - p1_x)
+                side_polygon = edge_x * (p3_y - p1_y) - edge_y * (p3_x - p1_x)
+                if EPSILON < t < 1 - EPSILON and side_center * side_polygon < 0:
+                    return [Vector2D(p1_x + edge_x * t, p1_y + edge_y * t)]
+        elif feature_vertex_index is not None and count >= 3:
+            (prev_x, prev_y), (v_x, v_y), (next_x, next_y) = vertex_array[
+                [(feature_vertex_index - 1) % count, feature_vertex_index, (feature_vertex_index + 1) % count]].tolist()
+            to_center_x = center_x - v_x
+            to_center_y = center_y - v_y
+            # Strictly inside the vertex's normal cone: both adjacent edges clamp to the vertex
+            if to_center_x * (next_x - v_x) + to_center_y * (next_y - v_y) < 0 and \
+               to_center_x * (v_x - prev_x) + to_center_y * (v_y - prev_y) > 0:
+                return [Vector2D(v_x, v_y)]
+
+        # All edges at once: project circle_center onto each edge p1 -> p2, clamp t to the segment
+        # (zero-length edges keep t = 0, i.e. p1), then take the first closest of the clamped points.
+        p1_x, p1_y = vertex_array[:, 0], vertex_array[:, 1]
+        edges = np.roll(vertex_array, -1, axis=0) - vertex_array
+        edge_x, edge_y = edges[:, 0], edges[:, 1]
+        len_sq = edge_x ** 2 + edge_y ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(len_sq == 0, 0.0, ((center_x - p1_x) * edge_x + (center_y - p1_y) * edge_y) / len_sq)
+        t = np.clip(t, 0.0, 1.0)
+        closest_x = p1_x + edge_x * t
+        closest_y = p1_y + edge_y * t
+        dist_sq = (center_x - closest_x) ** 2 + (center_y - closest_y) ** 2
+        best = int(dist_sq.argmin())
+
+        # This is the feature on the polygon (vertex or edge point) that is closest to the circle's center.
+        # This is our contact point on the polygon.
+        return [Vector2D(float(closest_x[best]), float(closest_y[best]))]
 
     def _check_polygon_circle_collision(self,
                                         entity_polygon_id: 'EntityID',
@@ -963,10 +943,11 @@ class CollisionSystem(System):
             # # print(f"DEBUG PC: Invalid shapes. Poly: {polygon_geometry.shape_type if polygon_geometry else 'N/A'}, Circle: {circle_geometry.shape_type if circle_geometry else 'N/A'}")
             return False, None
 
-        polygon_vertices = self._get_rotated_vertices(entity_polygon_id)
-        if not polygon_vertices:
+        polygon_vertex_array = self._get_world_vertex_array(entity_polygon_id, polygon_transform, polygon_geometry)
+        if polygon_vertex_array is None or not len(polygon_vertex_array):
             # # print(f"DEBUG PC: No polygon vertices for {entity_polygon_id}")
             return False, None
+        polygon_vertices = [Vector2D(x, y) for x, y in polygon_vertex_array.tolist()]
 
         circle_center = circle_transform.position
         circle_radius = circle_geometry.parameters.get("radius", 0)
@@ -979,25 +960,29 @@ class CollisionSystem(System):
         collision_normal_internal: Optional[Vector2D] = None
 
         # 1. Axes from polygon edges
-        polygon_axes = self._get_axes(polygon_vertices)
+        polygon_axes = self._get_axes(polygon_vertices, polygon_geometry.shape_type == ShapeType.RECTANGLE)
         all_axes = list(polygon_axes)
 
         # 2. Axis from circle center to closest polygon vertex
         closest_vertex_to_circle: Optional[Vector2D] = None
+        closest_vertex_index = -1
         min_dist_sq_vertex_circle = float('inf')
 
         if not polygon_vertices: # Should be caught earlier, but as a safeguard
              return False, None
 
-        for vertex in polygon_vertices:
+        for vertex_index, vertex in enumerate(polygon_vertices):
             dist_sq = (vertex - circle_center).magnitude_squared()
             if dist_sq < min_dist_sq_vertex_circle:
                 min_dist_sq_vertex_circle = dist_sq
                 closest_vertex_to_circle = vertex
+                closest_vertex_index = vertex_index
         
+        vertex_axis_index = -1 # Position of the circle-to-vertex axis in all_axes, if added
         if closest_vertex_to_circle: # Should always be true if polygon_vertices is not empty
             axis_from_circle_to_vertex = closest_vertex_to_circle - circle_center
             if axis_from_circle_to_vertex.magnitude_squared() > EPSILON * EPSILON:
+                 vertex_axis_index = len(all_axes)
                  all_axes.append(axis_from_circle_to_vertex.normalize())
             # else: circle center is on a vertex. Polygon axes should handle this.
 
@@ -1005,7 +990,8 @@ class CollisionSystem(System):
             # # print(f"DEBUG PC: No axes generated for polygon {entity_polygon_id} and circle {entity_circle_id}")
             return False, None
 
-        for axis in all_axes:
+        best_axis_index = -1
+        for axis_index, axis in enumerate(all_axes):
             if axis.magnitude_squared() < EPSILON * EPSILON:
                 continue
 
@@ -1026,6 +1012,7 @@ class CollisionSystem(System):
             if overlap_val < min_penetration:
                 min_penetration = overlap_val
                 collision_normal_internal = axis
+                best_axis_index = axis_index
                 
                 # Ensure normal points from polygon to circle
                 # Vector from polygon center (approx) to circle center
@@ -1043,9 +1030,23 @@ class CollisionSystem(System):
         
         min_penetration = max(0, min_penetration) # Ensure penetration is not negative
 
+        # Feature the minimum-overlap axis came from: the circle-to-vertex axis names the nearest vertex;
+        # a polygon edge axis names the edge whose outward normal faces the circle along the collision normal.
+        # Concave polygons get no hint and always take the all-edges search.
+        feature_edge_index: Optional[int] = None
+        feature_vertex_index: Optional[int] = None
+        if self._is_convex_shape(entity_polygon_id):
+            if best_axis_index == vertex_axis_index:
+                feature_vertex_index = closest_vertex_index
+            else:
+                feature_edge_index = self._find_best_matching_edge_cached(
+                    entity_polygon_id, self._get_world_edge_normals(entity_polygon_id, polygon_vertex_array),
+                    collision_normal_internal.x, collision_normal_internal.y)
+
         contact_point_vectors = self._find_contact_points_polygon_circle(
             polygon_vertices, polygon_transform.position, circle_center, circle_radius,
-            collision_normal_internal, min_penetration
+            collision_normal_internal, min_penetration, vertex_array=polygon_vertex_array,
+            feature_edge_index=feature_edge_index, feature_vertex_index=feature_vertex_index
         )
 
         if not contact_point_vectors:
@@ -1054,11 +1055,11 @@ class CollisionSystem(System):
 
         contact_manifold: List[ContactPointInfo] = []
         for cp_vec in contact_point_vectors:
-            contact_manifold.append({
-                "point": cp_vec, # This point is on the polygon surface
-                "normal": collision_normal_internal, # Normal from polygon to circle
-                "penetration_depth": min_penetration
-            })
+            contact_manifold.append(ContactPointInfo(
+                point=cp_vec, # This point is on the polygon surface
+                normal=collision_normal_internal, # Normal from polygon to circle
+                penetration_depth=min_penetration
+            ))
         
         # # print(f"DEBUG: Polygon-Circle Collision DETECTED between poly {entity_polygon_id} and circle {entity_circle_id}. Normal: {collision_normal_internal}, Depth: {min_penetration}, Points: {len(contact_point_vectors)}")
         return True, contact_manifold
@@ -1334,7 +1335,7 @@ class CollisionSystem(System):
         min_penetration = float('inf')
         collision_normal_internal: Optional[Vector2D] = None # Renamed
 
-        rect_axes = self._get_axes(rect_vertices)
+        rect_axes = self._get_axes(rect_vertices, is_rectangle=True)
         all_axes = list(rect_axes) # Start with rectangle's axes
 
         # Add axis from circle center to closest rectangle vertex
@@ -1406,11 +1407,11 @@ class CollisionSystem(System):
         # Construct the contact manifold
         contact_manifold: List[ContactPointInfo] = []
         for cp_vec in contact_point_vectors:
-            contact_manifold.append({
-                "point": cp_vec,
-                "normal": collision_normal_internal, # Normal from rect to circle
-                "penetration_depth": min_penetration
-            })
+            contact_manifold.append(ContactPointInfo(
+                point=cp_vec,
+                normal=collision_normal_internal, # Normal from rect to circle
+                penetration_depth=min_penetration
+            ))
         
         return True, contact_manifold
     def _handle_collision_response(self,
@@ -1426,9 +1427,9 @@ class CollisionSystem(System):
         """
         # # print(f"DEBUG_HCR: _handle_collision_response for A: {eid_a}, B: {eid_b}") # DEBUG LOG
         # # print(f"DEBUG_HCR:   trans_a.position: {trans_a.position}, trans_b.position: {trans_b.position}") # DEBUG LOG - ADDED
-        contact_point_world = contact_info["point"]
-        collision_normal_b_to_a = contact_info["normal"] # Expected: From B to A
-        penetration = contact_info["penetration_depth"]
+        contact_point_world = contact_info.point
+        collision_normal_b_to_a = contact_info.normal # Expected: From B to A
+        penetration = contact_info.penetration_depth
         # print(f"LOG_HCR_ENTRY: Entities A={eid_a}, B={eid_b}. CPWorld={contact_point_world}, Normal(B->A)={collision_normal_b_to_a}, Pen={penetration:.4f}")
         # # print(f"DEBUG_HCR:   r_a: {r_a}, r_b: {r_b}") # DEBUG LOG - Commented out
 
@@ -1558,8 +1559,8 @@ class CollisionSystem(System):
 
                 if support_condition_met_A_on_B:
                     # # print(f"DEBUG_HCR: Support Condition Met for A on B.")
-                    offset_world_a = contact_point_world - trans_a.position
-                    contact_point_local_a = offset_world_a.rotate(-trans_a.angle)
+                    # Cached cos/sin of the body angle instead of two trig calls in Vector2D.rotate(-angle)
+                    contact_point_local_a = Vector2D(*trans_a.local_of(contact_point_world.x, contact_point_world.y))
                     # angle_deg_a = math.degrees(trans_a.angle)
                     # # print(f"DETAILED_LOG: HCR_A_on_B: CP_world={contact_point_world}, trans_a_pos={trans_a.position}, trans_a_angle_rad={trans_a.angle:.4f}, trans_a_angle_deg={angle_deg_a:.2f}, offset_world_a={offset_world_a}, contact_point_local_a={contact_point_local_a}")
                     # print(f"DEBUG_FC_CALL: Calling ForceCalculator for support: A={eid_a} (receiver) on B={eid_b} (surface-like)") # LOG
@@ -1604,8 +1605,8 @@ class CollisionSystem(System):
                 
                 if support_condition_met_B_on_A:
                     # # print(f"DEBUG_HCR: Support Condition Met for B on A.")
-                    offset_world_b = contact_point_world - trans_b.position
-                    contact_point_local_b = offset_world_b.rotate(-trans_b.angle)
+                    # Cached cos/sin of the body angle instead of two trig calls in Vector2D.rotate(-angle)
+                    contact_point_local_b = Vector2D(*trans_b.local_of(contact_point_world.x, contact_point_world.y))
                     # angle_deg_b = math.degrees(trans_b.angle)
                     # # print(f"DETAILED_LOG: HCR_B_on_A: CP_world={contact_point_world}, trans_b_pos={trans_b.position}, trans_b_angle_rad={trans_b.angle:.4f}, trans_b_angle_deg={angle_deg_b:.2f}, offset_world_b={offset_world_b}, contact_point_local_b={contact_point_local_b}")
                     
@@ -1626,7 +1627,108 @@ class CollisionSystem(System):
                             eid_b, eid_a, normal_for_fc_BonA, applied_support, contact_point_local_b, self.entity_manager, dt
                         )
 
+    def _sweep_and_prune(self,
+                         colliders: List[Tuple['EntityID', TransformComponent, GeometryComponent, PhysicsBodyComponent, float]]
+                         ) -> List[Tuple[int, int]]:
+        """
+        Sweep-and-prune broad phase over bounding-circle AABBs (center +/- bounding radius).
+        Returns sorted (i, j) index pairs (i < j) into `colliders` whose boxes overlap on both axes.
+        Pairs are collected under their packed pair key (see _pair_key), so each pair is emitted once and
+        disabled pairs are removed with a single set difference.
+        The sweep order is kept between frames: bodies move little per step, so re-sorting the
+        previous order is close to linear (Timsort exploits the existing runs).
+        """
+        boxes = {}
+        dense_indices: List[int] = []
+        for index, (eid, transform, _geometry, _physics, radius) in enumerate(colliders):
+            pos = transform.position
+            boxes[eid] = (pos.x - radius, pos.x + radius, pos.y - radius, pos.y + radius, index)
+            dense_indices.append(self._dense_index(eid))
+
+        # Previous frame's order (minus removed entities), then any new entities
+        order = [eid for eid in self._sap_order if eid in boxes]
+        if len(order) != len(boxes):
+            known = set(order)
+            order.extend(eid for eid in boxes if eid not in known)
+        order.sort(key=lambda eid: boxes[eid][0])
+        self._sap_order = order
+
+        pairs: Dict[int, Tuple[int, int]] = {} # Packed pair key -> (i, j)
+        active: List[Tuple[float, float, float, float, int]] = []
+        for eid in order:
+            box = boxes[eid]
+            min_x, _max_x, min_y, max_y, index = box
+            dense_index = dense_indices[index]
+            # Drop boxes that end before this one starts on X; they cannot overlap anything later either
+            active = [other for other in active if other[1] >= min_x]
+            for other in active:
+                if other[2] <= max_y and min_y <= other[3]:
+                    other_index = other[4]
+                    other_dense = dense_indices[other_index]
+                    key = (other_dense << 32) | dense_index if other_dense < dense_index else (dense_index << 32) | other_dense
+                    if key not in pairs:
+                        pairs[key] = (other_index, index) if other_index < index else (index, other_index)
+            active.append(box)
+        return sorted(pairs[key] for key in pairs.keys() - self.disabled_collision_pairs)
+
+    def _batch_sat_separated(self,
+                             colliders: List[Tuple['EntityID', TransformComponent, GeometryComponent, PhysicsBodyComponent, float]],
+                             pairs: List[Tuple[int, int]]
+                             ) -> Tuple[Set[Tuple[int, int]], Dict['EntityID', Tuple[float, float, float]]]:
+        """
+        Runs SAT for every polygon/rectangle candidate pair in one batched kernel call, at frame-start poses.
+        Returns (pairs found separated, pose of each batched entity). The per-pair routine is still used for
+        hits (it builds the manifold) and for pairs whose bodies have moved since, e.g. by positional correction.
+        """
+        sat_shapes = (ShapeType.POLYGON, ShapeType.RECTANGLE)
+        table_rows: Dict[int, Optional[int]] = {} # Collider index -> row in the entity tables (None: not batchable)
+        shapes: List[Tuple[np.ndarray, np.ndarray]] = []
+        batched_pairs: List[Tuple[int, int]] = []
+        pair_rows: List[Tuple[int, int]] = []
+        for i, j in pairs:
+            if colliders[i][2].shape_type not in sat_shapes or colliders[j][2].shape_type not in sat_shapes:
+                continue
+            for index in (i, j):
+                if index not in table_rows:
+                    shape = self._get_world_shape(colliders[index][0], colliders[index][1], colliders[index][2])
+                    if shape is not None and len(shape[1]):
+                        table_rows[index] = len(shapes)
+                        shapes.append(shape)
+                    else:
+                        table_rows[index] = None
+            row_i, row_j = table_rows[i], table_rows[j]
+            if row_i is not None and row_j is not None:
+                batched_pairs.append((i, j))
+                pair_rows.append((row_i, row_j))
+        if not batched_pairs:
+            return set(), {}
+
+        # Each entity is padded into the tables once; pairs only carry row indices into them
+        max_vertices = max(len(vertices) for vertices, _axes in shapes)
+        max_axes = max(len(axes) for _vertices, axes in shapes)
+        vertex_table = np.stack([pad_rows(vertices, max_vertices) for vertices, _axes in shapes])
+        axes_table = np.stack([pad_rows(axes, max_axes) for _vertices, axes in shapes])
+        centers = np.empty((len(shapes), 2), dtype=SAT_DTYPE)
+        poses = {}
+        for index, row in table_rows.items():
+            if row is None:
+                continue
+            transform = colliders[index][1]
+            pos = transform.position
+            centers[row] = (pos.x, pos.y)
+            poses[colliders[index][0]] = (pos.x, pos.y, transform.angle)
+
+        # Only pairs whose minimum overlap is below minus twice the per-pair tolerance count as separated. The
+        # kernel's hit flag also rejects any negative depth, and exactly touching bodies can come out a few ulps
+        # negative here (rectangles are projected through their vertices, not in closed form as per pair).
+        tolerance = 2 * EPSILON
+        _hits, _normals, depths = sat_polygon_polygon_pairs(vertex_table, axes_table, centers,
+                                                            np.array(pair_rows, dtype=np.intp), tolerance)
+        separated = {pair for pair, depth in zip(batched_pairs, depths.tolist()) if depth < -tolerance}
+        return separated, poses
+
     def update(self, dt: float) -> None:
+        self.begin_frame()
         # Get all relevant entities
         entities_with_physics = self.entity_manager.get_entities_with_components(
             TransformComponent, GeometryComponent, PhysicsBodyComponent
@@ -1641,144 +1743,167 @@ class CollisionSystem(System):
         # we can convert the set of entity IDs to a list.
         entity_ids: List[EntityID] = list(entities_with_physics) # Ensure EntityID is defined or imported
 
-        potential_colliders: List[Tuple[EntityID, TransformComponent, GeometryComponent, PhysicsBodyComponent]] = []
+        potential_colliders: List[Tuple[EntityID, TransformComponent, GeometryComponent, PhysicsBodyComponent, float]] = []
         for eid in entity_ids:
             transform = self.entity_manager.get_component(eid, TransformComponent)
             geometry = self.entity_manager.get_component(eid, GeometryComponent)
             physics = self.entity_manager.get_component(eid, PhysicsBodyComponent)
             if transform and geometry and physics: # and not physics.is_fixed (optional for now)
-                potential_colliders.append((eid, transform, geometry, physics))
-
-        num_colliders = len(potential_colliders)
-        for i in range(num_colliders):
-            eid_a, trans_a, geom_a, phys_a = potential_colliders[i]
-
-            for j in range(i + 1, num_colliders):
-                eid_b, trans_b, geom_b, phys_b = potential_colliders[j]
+                # Bounding radius is computed once per frame; the EPSILON margin keeps touching contacts
+                # (which the SAT tests accept within EPSILON) from being rejected early.
+                bounding_radius = geometry.get_bounding_radius() + EPSILON
+                potential_colliders.append((eid, transform, geometry, physics, bounding_radius))
+        if len(self._local_shape_cache) > len(potential_colliders):
+            # Drop local shapes of entities that are gone
+            live_ids = {collider[0] for collider in potential_colliders}
+            self._local_shape_cache = {eid: entry for eid, entry in self._local_shape_cache.items() if eid in live_ids}
+        if not self._entity_index.keys() <= self.entity_manager.entities:
+            # Some indexed entities are gone (deleted, scene cleared or reloaded). Checked against the live set,
+            # not by count: non-physics entities and delete-then-create would hide stale entries from a count.
+            self._prune_entity_index()
+
+        # Broad phase: only pairs whose bounding boxes overlap and whose collision is not disabled reach
+        # the per-pair tests below, visited in the same (i, j) order as a full pairwise scan.
+        candidate_pairs = self._sweep_and_prune(potential_colliders)
+        batch_separated, batch_poses = self._batch_sat_separated(potential_colliders, candidate_pairs)
+        for i, j in candidate_pairs:
+            eid_a, trans_a, geom_a, phys_a, radius_a = potential_colliders[i]
+            eid_b, trans_b, geom_b, phys_b, radius_b = potential_colliders[j]
+
+            # Separated at frame start per the batched SAT, and neither body has moved since
+            if (i, j) in batch_separated and \
+               batch_poses[eid_a] == (trans_a.position.x, trans_a.position.y, trans_a.angle) and \
+               batch_poses[eid_b] == (trans_b.position.x, trans_b.position.y, trans_b.angle):
+                continue
 
-                # Skip if collision is disabled for this pair
-                if self.is_collision_disabled(eid_a, eid_b):
-                    continue
+            # Bounding-circle reject: far-apart pairs skip vertex rotation, axis building and projection.
+            # Positions are read here (not cached) since earlier pairs may have applied positional correction.
+            pos_a, pos_b = trans_a.position, trans_b.position
+            dx = pos_a.x - pos_b.x
+            dy = pos_a.y - pos_b.y
+            radii_sum = radius_a + radius_b
+            if dx * dx + dy * dy > radii_sum * radii_sum:
+                continue
 
-                # Skip if both are fixed (or one is fixed, depending on desired interaction)
-                # if phys_a.is_fixed and phys_b.is_fixed:
-                # continue
+            # Skip if both are fixed (or one is fixed, depending on desired interaction)
+            # if phys_a.is_fixed and phys_b.is_fixed:
+            # continue
 
-                collided = False
-                # Simple dispatch based on shape types
-                type_a = geom_a.shape_type
-                type_b = geom_b.shape_type
+            collided = False
+            # Simple dispatch based on shape types
+            type_a = geom_a.shape_type
+            type_b = geom_b.shape_type
 
-                collided_result: Optional[Tuple[bool, Optional[List[ContactPointInfo]]]] = None
-                # The normal in ContactPointInfo should consistently be from object B to object A
-                # for the generic response handler below.
+            collided_result: Optional[Tuple[bool, Optional[List[ContactPointInfo]]]] = None
+            # The normal in ContactPointInfo should consistently be from object B to object A
+            # for the generic response handler below.
 
-                # Order entities for consistent normal direction if needed (e.g., polygon always first if mixed with circle)
-                # For Polygon vs Circle, _check_polygon_circle_collision expects (polygon_id, circle_id)
-                # and its normal is defined from Polygon to Circle.
+            # Order entities for consistent normal direction if needed (e.g., polygon always first if mixed with circle)
+            # For Polygon vs Circle, _check_polygon_circle_collision expects (polygon_id, circle_id)
+            # and its normal is defined from Polygon to Circle.
 
-                if (type_a == ShapeType.POLYGON or type_a == ShapeType.RECTANGLE) and \
-                   (type_b == ShapeType.POLYGON or type_b == ShapeType.RECTANGLE):
-                    # Handles Poly-Poly, Poly-Rect, Rect-Poly, Rect-Rect
-                    # _check_polygon_polygon_collision_sat normal is from B to A.
-                    collided_result = self._check_polygon_polygon_collision_sat(eid_a, eid_b)
-                
-                elif type_a == ShapeType.CIRCLE and type_b == ShapeType.CIRCLE:
-                    # Specific handling for Circle-Circle to generate ContactPointInfo
-                    if self._check_circle_circle_collision(trans_a, geom_a, trans_b, geom_b):
-                        center_a = trans_a.position
-                        center_b = trans_b.position
-                        radius_a = geom_a.parameters.get("radius", 0)
-                        radius_b = geom_b.parameters.get("radius", 0)
-                        
-                        # Normal from B to A for response consistency
-                        n_b_to_a = center_a - center_b
-                        dist_sq = n_b_to_a.magnitude_squared()
-                        
-                        if dist_sq < EPSILON * EPSILON :
-                            n_b_to_a = Vector2D(0, -1) # Default if centers coincide
-                            dist = 0.0
-                        else:
-                            dist = math.sqrt(dist_sq)
-                            n_b_to_a = n_b_to_a / dist # Normalize
+            if (type_a == ShapeType.POLYGON or type_a == ShapeType.RECTANGLE) and \
+               (type_b == ShapeType.POLYGON or type_b == ShapeType.RECTANGLE):
+                # Handles Poly-Poly, Poly-Rect, Rect-Poly, Rect-Rect
+                # _check_polygon_polygon_collision_sat normal is from B to A.
+                collided_result = self._check_polygon_polygon_collision_sat(eid_a, eid_b)
+            
+            elif type_a == ShapeType.CIRCLE and type_b == ShapeType.CIRCLE:
+                # Specific handling for Circle-Circle to generate ContactPointInfo
+                if self._check_circle_circle_collision(trans_a, geom_a, trans_b, geom_b):
+                    center_a = trans_a.position
+                    center_b = trans_b.position
+                    radius_a = geom_a.parameters.get("radius", 0)
+                    radius_b = geom_b.parameters.get("radius", 0)
+                    
+                    # Normal from B to A for response consistency
+                    n_b_to_a = center_a - center_b
+                    dist_sq = n_b_to_a.magnitude_squared()
+                    
+                    if dist_sq < EPSILON * EPSILON :
+                        n_b_to_a = Vector2D(0, -1) # Default if centers coincide
+                        dist = 0.0
+                    else:
+                        dist = math.sqrt(dist_sq)
+                        n_b_to_a = n_b_to_a / dist # Normalize
+                    
+                    penetration = (radius_a + radius_b) - dist
+                    if penetration > -EPSILON: # Collision or touching
+                        penetration = max(0, penetration)
+                        # Contact point on A's surface, along the normal from B's center towards A's center
+                        contact_pt_on_a = center_a - n_b_to_a * radius_a
                         
-                        penetration = (radius_a + radius_b) - dist
-                        if penetration > -EPSILON: # Collision or touching
-                            penetration = max(0, penetration)
-                            # Contact point on A's surface, along the normal from B's center towards A's center
-                            contact_pt_on_a = center_a - n_b_to_a * radius_a
-                            
-                            cc_contact_manifold: List[ContactPointInfo] = [{
-                                "point": contact_pt_on_a, # Point on A
-                                "normal": n_b_to_a,       # Normal from B to A
-                                "penetration_depth": penetration
-                            }]
-                            collided_result = (True, cc_contact_manifold)
-                        else:
-                            collided_result = (False, None) # No collision
+                        cc_contact_manifold: List[ContactPointInfo] = [ContactPointInfo(
+                            point=contact_pt_on_a, # Point on A
+                            normal=n_b_to_a,       # Normal from B to A
+                            penetration_depth=penetration
+                        )]
+                        collided_result = (True, cc_contact_manifold)
                     else:
                         collided_result = (False, None) # No collision
-
-                elif type_a == ShapeType.CIRCLE and (type_b == ShapeType.POLYGON or type_b == ShapeType.RECTANGLE):
-                    # A is Circle, B is Polygon/Rectangle.
-                    # _check_polygon_circle_collision(poly_id, circle_id) normal is from Poly to Circle.
-                    # Here, B is Poly, A is Circle. So call with (eid_b, eid_a).
-                    # Normal will be from B(Poly) to A(Circle). This is the desired B->A.
-                    collided_result = self._check_polygon_circle_collision(eid_b, eid_a)
-
-                elif (type_a == ShapeType.POLYGON or type_a == ShapeType.RECTANGLE) and type_b == ShapeType.CIRCLE:
-                    # A is Polygon/Rectangle, B is Circle.
-                    # _check_polygon_circle_collision(poly_id, circle_id) normal is from Poly to Circle.
-                    # Here, A is Poly, B is Circle. So call with (eid_a, eid_b).
-                    # Normal will be from A(Poly) to B(Circle).
-                    # We need to flip it for the generic handler (B->A).
-                    temp_collided_result = self._check_polygon_circle_collision(eid_a, eid_b)
-                    if temp_collided_result and temp_collided_result[0] and temp_collided_result[1]:
-                        flipped_manifold: List[ContactPointInfo] = []
-                        for info in temp_collided_result[1]:
-                            flipped_manifold.append({
-                                "point": info["point"], # Contact point is on polygon A's surface
-                                "normal": -info["normal"], # Flip normal to be B(Circle) -> A(Poly)
-                                "penetration_depth": info["penetration_depth"]
-                            })
-                        collided_result = (True, flipped_manifold)
-                    else:
-                        collided_result = temp_collided_result
+                else:
+                    collided_result = (False, None) # No collision
+
+            elif type_a == ShapeType.CIRCLE and (type_b == ShapeType.POLYGON or type_b == ShapeType.RECTANGLE):
+                # A is Circle, B is Polygon/Rectangle.
+                # _check_polygon_circle_collision(poly_id, circle_id) normal is from Poly to Circle.
+                # Here, B is Poly, A is Circle. So call with (eid_b, eid_a).
+                # Normal will be from B(Poly) to A(Circle). This is the desired B->A.
+                collided_result = self._check_polygon_circle_collision(eid_b, eid_a)
+
+            elif (type_a == ShapeType.POLYGON or type_a == ShapeType.RECTANGLE) and type_b == ShapeType.CIRCLE:
+                # A is Polygon/Rectangle, B is Circle.
+                # _check_polygon_circle_collision(poly_id, circle_id) normal is from Poly to Circle.
+                # Here, A is Poly, B is Circle. So call with (eid_a, eid_b).
+                # Normal will be from A(Poly) to B(Circle).
+                # We need to flip it for the generic handler (B->A).
+                temp_collided_result = self._check_polygon_circle_collision(eid_a, eid_b)
+                if temp_collided_result and temp_collided_result[0] and temp_collided_result[1]:
+                    flipped_manifold: List[ContactPointInfo] = []
+                    for info in temp_collided_result[1]:
+                        flipped_manifold.append(ContactPointInfo(
+                            point=info.point, # Contact point is on polygon A's surface
+                            normal=-info.normal, # Flip normal to be B(Circle) -> A(Poly)
+                            penetration_depth=info.penetration_depth
+                        ))
+                    collided_result = (True, flipped_manifold)
+                else:
+                    collided_result = temp_collided_result
+            
+            # --- Generic Collision Response Section ---
+            if collided_result and collided_result[0] and collided_result[1]:
+                # print(f"DEBUG_COLLISION: Collision detected between {eid_a} and {eid_b}") # LOG
+                contact_manifold_to_use = collided_result[1]
                 
-                # --- Generic Collision Response Section ---
-                if collided_result and collided_result[0] and collided_result[1]:
-                    # print(f"DEBUG_COLLISION: Collision detected between {eid_a} and {eid_b}") # LOG
-                    contact_manifold_to_use = collided_result[1]
-                    
-                    # DEBUG LOG START: Collision detected and contact info (REMOVED)
-                    # print(f"[DEBUG CollisionSystem.update] Collision detected between {eid_a} ({type_a}) and {eid_b} ({type_b}).")
-                    # if contact_manifold_to_use:
-                    #     for c_info_idx, c_info in enumerate(contact_manifold_to_use):
-                    #         print(f"  Contact {c_info_idx + 1}: Point={c_info['point']}, Normal(B->A)={c_info['normal']}, Depth={c_info['penetration_depth']:.4f}")
-                    # DEBUG LOG END
-
-                    if phys_a.is_fixed and phys_b.is_fixed:
-                        continue # Skip response if both are fixed
-                    
-                    if not contact_manifold_to_use:
-                        continue
-
-                    # For now, we assume SAT methods provide one primary contact point.
-                    # If multiple contact points were generated (e.g. for edge-edge),
-                    # this loop would process them, but _handle_collision_response needs to be adapted
-                    # or called per contact point, or average/select one.
-                    # Current SAT contact finders for poly/rect return one point.
-                    for contact_info in contact_manifold_to_use: # Typically one iteration for now
-                        # print(f"LOG_CS_UPDATE: Calling _handle_collision_response for A={eid_a}, B={eid_b} with contact_info: Normal(B->A)={contact_info['normal']}, Pen={contact_info['penetration_depth']:.4f}") # Detailed log before HCR
-                        self._handle_collision_response(
-                            eid_a, eid_b,
-                            trans_a, trans_b,
-                            phys_a, phys_b,
-                            contact_info, # Contains point, normal (B->A), penetration
-                            dt
-                        )
-                        # If handling multiple contact points, might need to average impulses or apply sequentially.
-                        # For now, break after the first contact point is processed for simplicity,
-                        # matching previous behavior where only one contact was handled.
-                        break
-                # --- End of Generic Collision Response ---
\ No newline at end of file
+                # DEBUG LOG START: Collision detected and contact info (REMOVED)
+                # print(f"[DEBUG CollisionSystem.update] Collision detected between {eid_a} ({type_a}) and {eid_b} ({type_b}).")
+                # if contact_manifold_to_use:
+                #     for c_info_idx, c_info in enumerate(contact_manifold_to_use):
+                #         print(f"  Contact {c_info_idx + 1}: Point={c_info.point}, Normal(B->A)={c_info.normal}, Depth={c_info.penetration_depth:.4f}")
+                # DEBUG LOG END
+
+                if phys_a.is_fixed and phys_b.is_fixed:
+                    continue # Skip response if both are fixed
+                
+                if not contact_manifold_to_use:
+                    continue
+
+                # For now, we assume SAT methods provide one primary contact point.
+                # If multiple contact points were generated (e.g. for edge-edge),
+                # this loop would process them, but _handle_collision_response needs to be adapted
+                # or called per contact point, or average/select one.
+                # Current SAT contact finders for poly/rect return one point.
+                for contact_info in contact_manifold_to_use: # Typically one iteration for now
+                    # print(f"LOG_CS_UPDATE: Calling _handle_collision_response for A={eid_a}, B={eid_b} with contact_info: Normal(B->A)={contact_info.normal}, Pen={contact_info.penetration_depth:.4f}") # Detailed log before HCR
+                    self._handle_collision_response(
+                        eid_a, eid_b,
+                        trans_a, trans_b,
+                        phys_a, phys_b,
+                        contact_info, # Contains point, normal (B->A), penetration
+                        dt
+                    )
+                    # If handling multiple contact points, might need to average impulses or apply sequentially.
+                    # For now, break after the first contact point is processed for simplicity,
+                    # matching previous behavior where only one contact was handled.
+                    break
+            # --- End of Generic Collision Response ---
\ No newline at end of file
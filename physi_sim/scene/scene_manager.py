@@ -368,6 +368,7 @@ class SceneManager:
                         elif not is_spring_type and isinstance(conn_instance, ConnectionComponent):
                             conn_instance.source_entity_id = global_entity_one_id
                             conn_instance.target_entity_id = global_entity_two_id
+                            self.entity_manager.invalidate_connection_index()
                         else:
                             logger.warning(f"Created connection instance type mismatch or invalid. Expected {original_comp_type_name}, got {type(conn_instance).__name__}")
                             continue # Skip adding if type is wrong
@@ -0,0 +1,38 @@
+import math
+import random
+
+from physi_sim.core.component import GeometryComponent, PhysicsBodyComponent, ShapeType, TransformComponent
+from physi_sim.core.entity_manager import EntityManager
+from physi_sim.core.vector import Vector2D
+from physi_sim.physics.collision_system import CollisionSystem
+
+
+def _stacked_rectangles(angle: float, width: float, half_height_bottom: float, half_height_top: float):
+    """Two rectangles rotated by `angle`, the top one resting on the bottom one in exact contact."""
+    entity_manager = EntityManager()
+    colliders = []
+    for half_height, offset in ((half_height_bottom, 0.0), (half_height_top, half_height_bottom + half_height_top)):
+        entity_id = entity_manager.create_entity()
+        transform = TransformComponent(position=Vector2D(-math.sin(angle) * offset, math.cos(angle) * offset),
+                                       angle=angle)
+        geometry = GeometryComponent(ShapeType.RECTANGLE, {"width": width, "height": 2 * half_height})
+        physics = PhysicsBodyComponent(mass=1.0)
+        for component in (transform, geometry, physics):
+            entity_manager.add_component(entity_id, component)
+        colliders.append((entity_id, transform, geometry, physics, geometry.get_bounding_radius()))
+    return CollisionSystem(entity_manager), colliders
+
+
+def test_batch_prefilter_keeps_touching_rotated_stacks():
+    rng = random.Random(7)
+    touching = 0
+    for _ in range(2000):
+        collision_system, colliders = _stacked_rectangles(rng.uniform(-math.pi, math.pi), rng.uniform(0.5, 3.0),
+                                                          rng.uniform(0.2, 1.0), rng.uniform(0.2, 1.0))
+        hit, _manifold = collision_system._check_rectangle_rectangle_collision_sat(colliders[1][0], colliders[0][0])
+        if not hit:
+            continue
+        touching += 1
+        separated, _poses = collision_system._batch_sat_separated(colliders, [(0, 1)])
+        assert (0, 1) not in separated
+    assert touching > 0